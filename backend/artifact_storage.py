@@ -0,0 +1,58 @@
+"""Content-addressed storage for generated binary artifacts (DOCX).
+
+Files live under ARTIFACTS_DATA_DIR named by their SHA-256, so run records only
+carry a small reference and identical outputs are stored once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from .config import ARTIFACTS_DATA_DIR
+from . import metrics
+
+
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+def ensure_artifacts_dir() -> None:
+    Path(ARTIFACTS_DATA_DIR).mkdir(parents=True, exist_ok=True)
+
+
+def get_artifact_path(sha256: str, extension: str = "docx") -> str:
+    return os.path.join(ARTIFACTS_DATA_DIR, f"{sha256}.{extension}")
+
+
+@metrics.storage_seconds.labels("artifacts", "write").time()
+def save_artifact(data: bytes, extension: str = "docx") -> Dict[str, object]:
+    """Write bytes under their content hash (no-op if already stored)."""
+    ensure_artifacts_dir()
+    sha256 = hashlib.sha256(data).hexdigest()
+    path = get_artifact_path(sha256, extension)
+    if not os.path.exists(path):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    return {"sha256": sha256, "size": len(data)}
+
+
+def artifact_exists(sha256: str, extension: str = "docx") -> bool:
+    return _is_hash(sha256) and os.path.exists(get_artifact_path(sha256, extension))
+
+
+@metrics.storage_seconds.labels("artifacts", "read").time()
+def read_artifact(sha256: str, extension: str = "docx") -> Optional[bytes]:
+    if not artifact_exists(sha256, extension):
+        return None
+    with open(get_artifact_path(sha256, extension), "rb") as f:
+        return f.read()
+
+
+def _is_hash(value: str) -> bool:
+    # Guard against path traversal via crafted references.
+    return isinstance(value, str) and len(value) == 64 and all(c in "0123456789abcdef" for c in value)
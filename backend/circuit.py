@@ -0,0 +1,174 @@
+"""Per-model circuit breakers for OpenRouter calls.
+
+Each model's breaker watches its recent calls. When too many fail (or are too
+slow) it opens and council stages skip the model up front instead of waiting
+out its timeout. After a cool-down it goes half-open and lets a single probe
+call through; the probe's outcome closes or re-opens it. Probes are tracked by
+id: admitting one leaves it pending in the run's context, the first call to
+that model claims it and reports with it, so while half-open only the probe's
+own result counts. Later calls in the same run and calls that were already in
+flight are ignored.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import itertools
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import httpx
+
+from .config import (
+    CIRCUIT_BREAKER_ENABLED,
+    CIRCUIT_FAILURE_RATE,
+    CIRCUIT_MIN_CALLS,
+    CIRCUIT_OPEN_SECONDS,
+    CIRCUIT_SLOW_CALL_RATE,
+    CIRCUIT_SLOW_CALL_SECONDS,
+    CIRCUIT_WINDOW,
+)
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_probe_ids = itertools.count(1)
+# model -> probe id admitted for this run and not yet claimed by a call. The dict is shared
+# with the call tasks started afterwards, so exactly one of them takes each probe.
+_pending_probes: contextvars.ContextVar[Optional[Dict[str, int]]] = contextvars.ContextVar(
+    "circuit_pending_probes", default=None
+)
+
+
+def is_provider_failure(error: BaseException) -> bool:
+    """Failures that say something about the provider's health (not our own bad requests)."""
+    if isinstance(error, httpx.HTTPStatusError):
+        code = error.response.status_code
+        return code >= 500 or code in (408, 429)
+    return isinstance(error, (httpx.TimeoutException, httpx.TransportError, asyncio.TimeoutError))
+
+
+class CircuitBreaker:
+    def __init__(self) -> None:
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probe_started_at = 0.0
+        self.probe_id: Optional[int] = None
+        # (ok, latency_seconds) for the most recent calls
+        self.calls: Deque[Tuple[bool, float]] = deque(maxlen=CIRCUIT_WINDOW)
+
+    def _should_trip(self) -> bool:
+        if len(self.calls) < CIRCUIT_MIN_CALLS:
+            return False
+        failures = sum(1 for ok, _ in self.calls if not ok)
+        slow = sum(1 for ok, latency in self.calls if ok and latency >= CIRCUIT_SLOW_CALL_SECONDS)
+        total = len(self.calls)
+        return failures / total >= CIRCUIT_FAILURE_RATE or slow / total >= CIRCUIT_SLOW_CALL_RATE
+
+    def _open(self, now: float) -> None:
+        self.state = OPEN
+        self.opened_at = now
+        self.probe_started_at = 0.0
+        self.probe_id = None
+
+    def allow(self, now: float) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if now - self.opened_at < CIRCUIT_OPEN_SECONDS:
+                return False
+            self.state = HALF_OPEN
+        # Half-open: one probe at a time; a probe that never reported back (e.g. cancelled) expires.
+        if self.probe_started_at and now - self.probe_started_at < CIRCUIT_OPEN_SECONDS:
+            return False
+        self.probe_started_at = now
+        self.probe_id = next(_probe_ids)
+        return True
+
+    def record(self, ok: bool, latency: float, now: float, probe_id: Optional[int] = None) -> None:
+        slow = latency >= CIRCUIT_SLOW_CALL_SECONDS
+        if self.state == HALF_OPEN:
+            if probe_id is None or probe_id != self.probe_id:
+                # Not the probe (e.g. a call started before the breaker opened): it decides nothing.
+                return
+            if ok and not slow:
+                self.state = CLOSED
+                self.calls.clear()
+            else:
+                self._open(now)
+            self.probe_started_at = 0.0
+            self.probe_id = None
+            return
+        self.calls.append((ok, latency))
+        if self.state == CLOSED and self._should_trip():
+            self._open(now)
+
+
+class BreakerRegistry:
+    def __init__(self) -> None:
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def _get(self, model: str) -> CircuitBreaker:
+        breaker = self._breakers.get(model)
+        if breaker is None:
+            breaker = self._breakers[model] = CircuitBreaker()
+        return breaker
+
+    def record_success(self, model: str, latency: float, probe_id: Optional[int] = None) -> None:
+        if CIRCUIT_BREAKER_ENABLED:
+            self._get(model).record(True, latency, time.monotonic(), probe_id)
+
+    def record_failure(self, model: str, latency: float = 0.0, probe_id: Optional[int] = None) -> None:
+        if CIRCUIT_BREAKER_ENABLED:
+            self._get(model).record(False, latency, time.monotonic(), probe_id)
+
+    def claim_probe(self, model: str) -> Optional[int]:
+        """Take the probe admitted for `model` in this run, if any; the caller reports with it."""
+        pending = _pending_probes.get()
+        return None if pending is None else pending.pop(model, None)
+
+    def allow(self, model: str) -> bool:
+        """
+        Whether a call to `model` should go ahead now.
+
+        When this admits a half-open probe, it is left pending in the current
+        context; the next call to `model` from here (or from a task started
+        afterwards) claims it, and only that call reports as the probe.
+        """
+        if not CIRCUIT_BREAKER_ENABLED:
+            return True
+        breaker = self._get(model)
+        if not breaker.allow(time.monotonic()):
+            return False
+        if breaker.state == HALF_OPEN:
+            pending = _pending_probes.get()
+            if pending is None:
+                pending = {}
+                _pending_probes.set(pending)
+            pending[model] = breaker.probe_id
+        return True
+
+    def filter_models(self, models: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Split models into (usable, skipped) based on breaker state.
+
+        Open breakers are skipped; a half-open breaker admits one probe. If
+        every model would be skipped, all are returned so the stage still runs.
+        """
+        if not CIRCUIT_BREAKER_ENABLED:
+            return list(models), []
+        usable = [m for m in models if self.allow(m)]
+        skipped = [m for m in models if m not in usable]
+        if not usable:
+            return list(models), []
+        return usable, skipped
+
+    def snapshot(self) -> Dict[str, str]:
+        return {model: breaker.state for model, breaker in self._breakers.items()}
+
+
+breakers = BreakerRegistry()
@@ -19,8 +19,8 @@ COUNCIL_MODELS = [
 # Chairman model - synthesizes final response
 CHAIRMAN_MODEL = "google/gemini-3-pro-preview"
 
-# OpenRouter API endpoint
-OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
+# OpenRouter API endpoint (override to point at a local stand-in, e.g. benchmarks.fake_openrouter)
+OPENROUTER_API_URL = os.getenv("OPENROUTER_API_URL", "https://openrouter.ai/api/v1/chat/completions")
 
 # Data directory for resume run storage
 RESUME_DATA_DIR = "data/resumes"
@@ -65,6 +65,11 @@ RESUME_PROFILE_PACK_MAX_CHARS = int(os.getenv("RESUME_PROFILE_PACK_MAX_CHARS", "
 # If true, do not truncate the master profile at all for resume runs.
 RESUME_SEND_FULL_PROFILE = _env_bool("RESUME_SEND_FULL_PROFILE", "false")
 
+# Profile pack strategy: "truncate" (whole profile up to the char budget above) or "bm25"
+# (only the chunks most relevant to the JD keywords, under a token budget; required sections pinned).
+RESUME_PROFILE_PACK_STRATEGY = os.getenv("RESUME_PROFILE_PACK_STRATEGY", "truncate").strip().lower()
+RESUME_PROFILE_PACK_TOKEN_BUDGET = int(os.getenv("RESUME_PROFILE_PACK_TOKEN_BUDGET", "6000"))
+
 # Optional premium polish model (only used when gating triggers)
 RESUME_POLISH_MODEL = os.getenv("RESUME_POLISH_MODEL", "google/gemini-3-pro-preview")
 
@@ -81,3 +86,112 @@ RESUME_POLISH_MAX_TOKENS = int(os.getenv("RESUME_POLISH_MAX_TOKENS", "900"))
 # - Set RESUME_STYLE_GUIDE_PATH to a text/markdown file containing your full strategy doc.
 RESUME_STYLE_GUIDE = os.getenv("RESUME_STYLE_GUIDE", "")
 RESUME_STYLE_GUIDE_PATH = os.getenv("RESUME_STYLE_GUIDE_PATH", "")
+
+# Shared OpenRouter HTTP client (connection pooling, reused across all model calls)
+OPENROUTER_MAX_CONNECTIONS = int(os.getenv("OPENROUTER_MAX_CONNECTIONS", "50"))
+OPENROUTER_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENROUTER_MAX_KEEPALIVE_CONNECTIONS", "20"))
+OPENROUTER_KEEPALIVE_EXPIRY = float(os.getenv("OPENROUTER_KEEPALIVE_EXPIRY", "60"))
+OPENROUTER_CONNECT_TIMEOUT = float(os.getenv("OPENROUTER_CONNECT_TIMEOUT", "10"))
+
+# HTTP/2 requires the optional `h2` package (pip install "httpx[http2]"); falls back to HTTP/1.1.
+OPENROUTER_HTTP2 = _env_bool("OPENROUTER_HTTP2", "false")
+
+# Opt-in LLM response cache (in-memory LRU + on-disk tier), keyed by model + messages + params.
+RESPONSE_CACHE_ENABLED = _env_bool("RESPONSE_CACHE_ENABLED", "false")
+RESPONSE_CACHE_DIR = os.getenv("RESPONSE_CACHE_DIR", "data/llm_cache")
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+RESPONSE_CACHE_MEMORY_ITEMS = int(os.getenv("RESPONSE_CACHE_MEMORY_ITEMS", "256"))
+RESPONSE_CACHE_DISK_MAX_MB = float(os.getenv("RESPONSE_CACHE_DISK_MAX_MB", "200"))
+
+# Share one upstream request between identical concurrent model calls (e.g. double-clicked runs).
+OPENROUTER_COALESCE_REQUESTS = _env_bool("OPENROUTER_COALESCE_REQUESTS", "true")
+
+# Stage 1 quorum: proceed once this many drafts have returned (0 = wait for every draft model).
+RESUME_DRAFT_QUORUM = int(os.getenv("RESUME_DRAFT_QUORUM", "0"))
+# Extra seconds the remaining draft models get after the quorum is reached.
+RESUME_DRAFT_GRACE_SECONDS = float(os.getenv("RESUME_DRAFT_GRACE_SECONDS", "10"))
+# If true, cut-off drafts keep running in the background (warming the response cache) instead of being cancelled.
+RESUME_DRAFT_DETACH_STRAGGLERS = _env_bool("RESUME_DRAFT_DETACH_STRAGGLERS", "false")
+
+# Background resume jobs (POST /api/resume/jobs): persisted under JOBS_DATA_DIR, run by a bounded worker pool.
+JOBS_DATA_DIR = os.getenv("JOBS_DATA_DIR", "data/jobs")
+RESUME_JOB_WORKERS = int(os.getenv("RESUME_JOB_WORKERS", "2"))
+RESUME_JOB_MAX_PENDING = int(os.getenv("RESUME_JOB_MAX_PENDING", "100"))
+# Finished (succeeded/failed) job records are deleted after this many days; runs themselves live in resume storage.
+RESUME_JOB_RETENTION_DAYS = float(os.getenv("RESUME_JOB_RETENTION_DAYS", "7"))
+
+# Content-addressed store for generated DOCX files (referenced by hash from run records)
+ARTIFACTS_DATA_DIR = os.getenv("ARTIFACTS_DATA_DIR", "data/artifacts")
+# DOCX rendering runs off the event loop: "thread" or "process" pool, and how many workers.
+DOCX_RENDER_EXECUTOR = os.getenv("DOCX_RENDER_EXECUTOR", "thread").strip().lower()
+DOCX_RENDER_WORKERS = int(os.getenv("DOCX_RENDER_WORKERS", "2"))
+# Recent markdown -> artifact mappings kept in memory (older ones are found on disk).
+DOCX_RENDER_CACHE_ITEMS = int(os.getenv("DOCX_RENDER_CACHE_ITEMS", "256"))
+
+# Upstream concurrency / rate limits. Callers over the limit queue (FIFO) instead of failing.
+OPENROUTER_GLOBAL_CONCURRENCY = int(os.getenv("OPENROUTER_GLOBAL_CONCURRENCY", "16"))
+OPENROUTER_MODEL_CONCURRENCY = int(os.getenv("OPENROUTER_MODEL_CONCURRENCY", "4"))
+# Requests/second token buckets (0 = unlimited) and their burst size.
+OPENROUTER_GLOBAL_RPS = float(os.getenv("OPENROUTER_GLOBAL_RPS", "0"))
+OPENROUTER_MODEL_RPS = float(os.getenv("OPENROUTER_MODEL_RPS", "0"))
+OPENROUTER_RATE_BURST = float(os.getenv("OPENROUTER_RATE_BURST", "4"))
+# Per-model overrides: "x-ai/grok-4=2/0.5,openai/gpt-5.1=8" (concurrency[/rps]).
+OPENROUTER_MODEL_LIMITS = os.getenv("OPENROUTER_MODEL_LIMITS", "")
+
+# Usage accounting: ask OpenRouter to report each call's cost alongside its token counts.
+OPENROUTER_USAGE_ACCOUNTING = _env_bool("OPENROUTER_USAGE_ACCOUNTING", "true")
+# Fallback prices when a response carries no cost: "openai/gpt-5.1=1.25/10,..." (USD per 1M prompt/completion tokens).
+OPENROUTER_MODEL_PRICES = os.getenv("OPENROUTER_MODEL_PRICES", "")
+
+# Retry policy for upstream calls (exponential backoff with full jitter; Retry-After is honoured).
+OPENROUTER_RETRY_MAX_ATTEMPTS = int(os.getenv("OPENROUTER_RETRY_MAX_ATTEMPTS", "3"))
+OPENROUTER_RETRY_BASE_DELAY = float(os.getenv("OPENROUTER_RETRY_BASE_DELAY", "1.0"))
+OPENROUTER_RETRY_MAX_DELAY = float(os.getenv("OPENROUTER_RETRY_MAX_DELAY", "10.0"))
+# Longest server-requested Retry-After we will sleep for; a longer wait gives up instead.
+OPENROUTER_RETRY_MAX_RETRY_AFTER = float(os.getenv("OPENROUTER_RETRY_MAX_RETRY_AFTER", "30.0"))
+OPENROUTER_RETRY_STATUSES = [
+    int(s) for s in os.getenv("OPENROUTER_RETRY_STATUSES", "408,429,500,502,503,504").split(",") if s.strip()
+]
+
+# Per-stage retry budgets: attempts and overall deadline (seconds, including backoff).
+RESUME_DRAFT_RETRY_ATTEMPTS = int(os.getenv("RESUME_DRAFT_RETRY_ATTEMPTS", "2"))
+RESUME_DRAFT_RETRY_DEADLINE = float(os.getenv("RESUME_DRAFT_RETRY_DEADLINE", "90"))
+RESUME_JUDGE_RETRY_ATTEMPTS = int(os.getenv("RESUME_JUDGE_RETRY_ATTEMPTS", "3"))
+RESUME_JUDGE_RETRY_DEADLINE = float(os.getenv("RESUME_JUDGE_RETRY_DEADLINE", "120"))
+RESUME_POLISH_RETRY_ATTEMPTS = int(os.getenv("RESUME_POLISH_RETRY_ATTEMPTS", "3"))
+RESUME_POLISH_RETRY_DEADLINE = float(os.getenv("RESUME_POLISH_RETRY_DEADLINE", "150"))
+
+# Hedged requests for the single-model Stage 2 judge and Stage 3 polish calls: if the primary
+# has not answered by its latency percentile, fire a backup and keep whichever finishes first.
+RESUME_HEDGE_ENABLED = _env_bool("RESUME_HEDGE_ENABLED", "false")
+RESUME_HEDGE_PERCENTILE = float(os.getenv("RESUME_HEDGE_PERCENTILE", "90"))
+RESUME_HEDGE_MIN_SAMPLES = int(os.getenv("RESUME_HEDGE_MIN_SAMPLES", "5"))
+# Hedge delay used until enough latency samples exist for the primary model.
+RESUME_HEDGE_DEFAULT_DELAY = float(os.getenv("RESUME_HEDGE_DEFAULT_DELAY", "30"))
+# Backup models (empty = re-issue to the same model).
+RESUME_JUDGE_HEDGE_MODEL = os.getenv("RESUME_JUDGE_HEDGE_MODEL", "")
+RESUME_POLISH_HEDGE_MODEL = os.getenv("RESUME_POLISH_HEDGE_MODEL", "")
+
+# Per-model circuit breaker: skip models whose recent calls mostly fail or are very slow.
+CIRCUIT_BREAKER_ENABLED = _env_bool("CIRCUIT_BREAKER_ENABLED", "true")
+CIRCUIT_WINDOW = int(os.getenv("CIRCUIT_WINDOW", "20"))
+CIRCUIT_MIN_CALLS = int(os.getenv("CIRCUIT_MIN_CALLS", "5"))
+CIRCUIT_FAILURE_RATE = float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5"))
+CIRCUIT_SLOW_CALL_SECONDS = float(os.getenv("CIRCUIT_SLOW_CALL_SECONDS", "75"))
+CIRCUIT_SLOW_CALL_RATE = float(os.getenv("CIRCUIT_SLOW_CALL_RATE", "0.8"))
+# Cool-down before an open breaker lets a probe call through.
+CIRCUIT_OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", "60"))
+
+# Metrics collection; GET /metrics (Prometheus text format) is served only once METRICS_AUTH_TOKEN is set,
+# and scrapers must send "Authorization: Bearer <token>".
+METRICS_ENABLED = _env_bool("METRICS_ENABLED", "true")
+METRICS_AUTH_TOKEN = os.getenv("METRICS_AUTH_TOKEN", "")
+
+# Span tracing of resume runs (run -> stage -> model call -> attempt), exported as JSONL.
+TRACING_ENABLED = _env_bool("TRACING_ENABLED", "true")
+TRACES_DATA_DIR = os.getenv("TRACES_DATA_DIR", "data/traces")
+# Finished traces kept in memory for GET /api/traces (older ones are read back from the JSONL files).
+TRACE_MEMORY_ITEMS = int(os.getenv("TRACE_MEMORY_ITEMS", "50"))
+# Daily JSONL files older than this many days are deleted, oldest first beyond TRACES_MAX_MB in total.
+TRACE_RETENTION_DAYS = int(os.getenv("TRACE_RETENTION_DAYS", "7"))
+TRACES_MAX_MB = float(os.getenv("TRACES_MAX_MB", "200"))
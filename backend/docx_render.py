@@ -0,0 +1,208 @@
+"""DOCX rendering for final resumes, off the event loop and cached.
+
+python-docx is pure Python and CPU-bound, so renders run in an executor
+(thread or process pool). The styled base document is built once per process
+and cloned for each render. Results are cached by a hash of the final markdown,
+so identical finals reuse the stored artifact instead of rendering again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Optional
+
+from docx import Document
+from docx.shared import Pt
+
+from . import artifact_storage
+from . import metrics
+from .config import ARTIFACTS_DATA_DIR, DOCX_RENDER_CACHE_ITEMS, DOCX_RENDER_EXECUTOR, DOCX_RENDER_WORKERS
+from .singleflight import SingleFlight
+
+
+# Bump when the rendering below changes so cached markdown -> artifact mappings are not reused.
+RENDER_VERSION = "1"
+
+_HEADINGS = {"Summary", "Education", "Technical Skills", "Professional Experience", "Projects", "Certifications"}
+
+# Serialized base document with fonts/styles applied; built once per process.
+_template_bytes: Optional[bytes] = None
+
+
+def _build_template() -> bytes:
+    doc = Document()
+
+    # Set base font to Times New Roman 10
+    font = doc.styles["Normal"].font
+    font.name = "Times New Roman"
+    font.size = Pt(10)
+
+    heading_font = doc.styles["Heading 2"].font
+    heading_font.name = "Times New Roman"
+    heading_font.size = Pt(10)
+    heading_font.bold = True
+
+    buf = BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def _new_document():
+    global _template_bytes
+    if _template_bytes is None:
+        _template_bytes = _build_template()
+    return Document(BytesIO(_template_bytes))
+
+
+def render_docx(markdown_text: str) -> bytes:
+    """Render resume markdown to DOCX bytes (blocking; call via render_and_store)."""
+    doc = _new_document()
+    heading_style = doc.styles["Heading 2"]
+    bullet_style = doc.styles["List Bullet"]
+
+    for line in markdown_text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            doc.add_paragraph("")
+            continue
+
+        # Heading detection (e.g., "Summary" or "Summary:")
+        if stripped.endswith(":") or stripped in _HEADINGS:
+            doc.add_paragraph(stripped.rstrip(":"), style=heading_style)
+            continue
+
+        # Bullet lines
+        if stripped.startswith("- "):
+            content = stripped[2:]
+            para = doc.add_paragraph(style=bullet_style)
+            # If bolded project name pattern **Name** rest
+            if content.startswith("**") and "**" in content[2:]:
+                closing = content.find("**", 2)
+                name = content[2:closing]
+                rest = content[closing+2:].lstrip()
+                run_name = para.add_run(name)
+                run_name.bold = True
+                if rest:
+                    para.add_run(f" - {rest}")
+            else:
+                para.add_run(content)
+            continue
+
+        # Default paragraph
+        doc.add_paragraph(stripped)
+
+    buf = BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def render_key(markdown_text: str) -> str:
+    material = f"{RENDER_VERSION}\n{markdown_text}".encode("utf-8")
+    return hashlib.sha256(material).hexdigest()
+
+
+def _index_path(key: str) -> str:
+    return os.path.join(ARTIFACTS_DATA_DIR, "renders", f"{key}.json")
+
+
+def _lookup_rendered(key: str) -> Optional[Dict[str, object]]:
+    """Stored artifact for a previous render of the same markdown, if it still exists."""
+    path = _index_path(key)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r") as f:
+            stored = json.load(f)
+    except Exception:
+        return None
+    if not artifact_storage.artifact_exists(str(stored.get("sha256")), "docx"):
+        return None
+    return stored
+
+
+def _store_rendered(key: str, data: bytes) -> Dict[str, object]:
+    stored = artifact_storage.save_artifact(data, "docx")
+    stored = {"sha256": stored["sha256"], "size": stored["size"]}
+    path = _index_path(key)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(stored, f)
+    os.replace(tmp_path, path)
+    return stored
+
+
+_executor: Optional[Executor] = None
+_memory: "OrderedDict[str, Dict[str, object]]" = OrderedDict()
+_inflight = SingleFlight()
+stats = {"renders": 0, "memory_hits": 0, "disk_hits": 0}
+
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        workers = max(1, DOCX_RENDER_WORKERS)
+        if DOCX_RENDER_EXECUTOR == "process":
+            _executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="docx-render")
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _remember(key: str, stored: Dict[str, object]) -> None:
+    _memory[key] = stored
+    _memory.move_to_end(key)
+    while len(_memory) > max(1, DOCX_RENDER_CACHE_ITEMS):
+        _memory.popitem(last=False)
+
+
+async def _render_and_store(key: str, markdown_text: str) -> Dict[str, object]:
+    stored = await asyncio.to_thread(_lookup_rendered, key)
+    if stored is not None:
+        stats["disk_hits"] += 1
+        metrics.docx_renders.labels("disk_hit").inc()
+        cached = True
+    else:
+        loop = asyncio.get_running_loop()
+        with metrics.docx_render_seconds.time():
+            data = await loop.run_in_executor(_get_executor(), render_docx, markdown_text)
+        stored = await asyncio.to_thread(_store_rendered, key, data)
+        stats["renders"] += 1
+        metrics.docx_renders.labels("rendered").inc()
+        cached = False
+    _remember(key, stored)
+    return dict(stored, cached=cached)
+
+
+async def render_and_store(markdown_text: str) -> Dict[str, object]:
+    """
+    Render markdown to DOCX and store it as a content-addressed artifact.
+
+    Returns:
+        {"sha256", "size", "cached"}; cached is True when no render was needed.
+    """
+    key = render_key(markdown_text)
+    stored = _memory.get(key)
+    if stored is not None and artifact_storage.artifact_exists(str(stored.get("sha256")), "docx"):
+        _memory.move_to_end(key)
+        stats["memory_hits"] += 1
+        metrics.docx_renders.labels("memory_hit").inc()
+        return dict(stored, cached=True)
+
+    result, shared = await _inflight.do(key, lambda: _render_and_store(key, markdown_text))
+    return dict(result, cached=result["cached"] or shared)
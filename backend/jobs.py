@@ -0,0 +1,311 @@
+"""Background job queue for resume council runs.
+
+Submitting a run returns a job id immediately; a bounded pool of asyncio
+workers executes the council and clients poll the job record or subscribe to
+its progress events. Jobs are persisted as JSON so a restart can re-queue
+pending work and mark interrupted runs as failed.
+
+Active (queued/running) jobs live directly in JOBS_DATA_DIR, so startup only
+reads those. Finished jobs move to JOBS_DATA_DIR/finished without their
+stored inputs and are deleted after RESUME_JOB_RETENTION_DAYS.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .config import JOBS_DATA_DIR, RESUME_JOB_RETENTION_DAYS
+
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# Events worth persisting to the job record; token deltas are only fanned out live.
+_PROGRESS_EVENTS = {"stage_started", "draft_done", "stage1_done", "ranking_done", "final_done"}
+# Progress is written to disk at most this often per job (seconds); memory always has the latest.
+_PROGRESS_SAVE_INTERVAL = 1.0
+# Finished job records are pruned at most this often (seconds).
+_PRUNE_INTERVAL = 3600.0
+
+JobRunner = Callable[[Dict[str, Any], Callable[[str, Dict[str, Any]], Awaitable[None]]], Awaitable[Dict[str, Any]]]
+
+
+class QueueFullError(Exception):
+    """Raised when the job backlog is at capacity."""
+
+
+def _finished_dir() -> str:
+    return os.path.join(JOBS_DATA_DIR, "finished")
+
+
+def ensure_jobs_dir() -> None:
+    Path(_finished_dir()).mkdir(parents=True, exist_ok=True)
+
+
+def get_job_path(job_id: str, finished: bool = False) -> str:
+    return os.path.join(_finished_dir() if finished else JOBS_DATA_DIR, f"{job_id}.json")
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+
+def _is_finished(job: Dict[str, Any]) -> bool:
+    return job.get("status") in (SUCCEEDED, FAILED)
+
+
+def _write_job_file(job_id: str, encoded: str, finished: bool) -> None:
+    ensure_jobs_dir()
+    path = get_job_path(job_id, finished)
+    # Unique per process and thread: job writes run concurrently in worker threads.
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(encoded)
+    os.replace(tmp_path, path)
+    if finished:
+        # Written to finished/ first, so readers always find one of the two files.
+        try:
+            os.remove(get_job_path(job_id))
+        except FileNotFoundError:
+            pass
+
+
+def _encode(job: Dict[str, Any]) -> str:
+    if _is_finished(job):
+        # The resolved inputs (full master profile) are only needed to run the job.
+        job.pop("request", None)
+    return json.dumps(job, indent=2)
+
+
+def save_job(job: Dict[str, Any]) -> None:
+    _write_job_file(job["id"], _encode(job), _is_finished(job))
+
+
+async def asave_job(job: Dict[str, Any]) -> None:
+    # Serialize on the loop (the dict keeps changing), write in a worker thread.
+    await asyncio.to_thread(_write_job_file, job["id"], _encode(job), _is_finished(job))
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    for finished in (False, True):
+        try:
+            with open(get_job_path(job_id, finished), "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            continue
+    return None
+
+
+def list_jobs() -> List[Dict[str, Any]]:
+    """Active (queued or running) job records, oldest first; finished ones are not read."""
+    ensure_jobs_dir()
+    items: List[Dict[str, Any]] = []
+    for filename in os.listdir(JOBS_DATA_DIR):
+        if not filename.endswith(".json"):
+            continue
+        with open(os.path.join(JOBS_DATA_DIR, filename), "r") as f:
+            items.append(json.load(f))
+    items.sort(key=lambda x: x.get("created_at", ""))
+    return items
+
+
+def prune_finished_jobs(max_age_seconds: float) -> int:
+    """Delete finished job records older than max_age_seconds (by mtime); returns how many."""
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    try:
+        entries = list(os.scandir(_finished_dir()))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        if not entry.name.endswith(".json"):
+            continue
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def public_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Job view for API responses (drops the stored inputs)."""
+    return {k: v for k, v in job.items() if k != "request"}
+
+
+class JobQueue:
+    """Bounded asyncio worker pool that executes persisted jobs."""
+
+    def __init__(self, runner: JobRunner, workers: int = 2, max_pending: int = 100) -> None:
+        self._runner = runner
+        self._worker_count = max(1, workers)
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_pending))
+        self._workers: List[asyncio.Task] = []
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
+        self._last_prune = 0.0
+
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def running(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.get("status") == RUNNING)
+
+    async def start(self) -> None:
+        """Recover persisted jobs and start the workers."""
+        for job in await asyncio.to_thread(list_jobs):
+            status = job.get("status")
+            if _is_finished(job):
+                # Left in the active directory by an older version: move it aside.
+                save_job(job)
+            elif status == RUNNING:
+                # The process died mid-run; the partial run cannot be resumed.
+                job["status"] = FAILED
+                job["error"] = "Interrupted by server restart"
+                job["finished_at"] = _now()
+                save_job(job)
+            elif status == QUEUED:
+                self._jobs[job["id"]] = job
+                try:
+                    self._queue.put_nowait(job["id"])
+                except asyncio.QueueFull:
+                    job["status"] = FAILED
+                    job["error"] = "Job backlog full after restart"
+                    job["finished_at"] = _now()
+                    save_job(job)
+
+        await self._prune()
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self._worker_count)]
+
+    async def _prune(self) -> None:
+        self._last_prune = time.monotonic()
+        try:
+            await asyncio.to_thread(prune_finished_jobs, RESUME_JOB_RETENTION_DAYS * 86400)
+        except Exception as e:
+            print(f"Error pruning finished jobs: {e}")
+
+    async def stop(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(self, job_id: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        if self._queue.full():
+            raise QueueFullError("Job queue is full")
+        job = {
+            "id": job_id,
+            "status": QUEUED,
+            "created_at": _now(),
+            "started_at": None,
+            "finished_at": None,
+            "progress": {"stage": None, "last_event": None, "drafts_done": 0},
+            "resume_id": None,
+            "error": None,
+            "request": request,
+        }
+        # Persist before enqueueing, so a worker's "running" record can never be overwritten by this one.
+        await asave_job(job)
+        try:
+            self._queue.put_nowait(job_id)
+        except asyncio.QueueFull:
+            # Filled up while we were saving.
+            await asyncio.to_thread(os.remove, get_job_path(job_id))
+            raise QueueFullError("Job queue is full")
+        self._jobs[job_id] = job
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._jobs.get(job_id) or await asyncio.to_thread(get_job, job_id)
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        q: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, []).append(q)
+        return q
+
+    def unsubscribe(self, job_id: str, q: asyncio.Queue) -> None:
+        subs = self._subscribers.get(job_id) or []
+        if q in subs:
+            subs.remove(q)
+        if not subs:
+            self._subscribers.pop(job_id, None)
+
+    def _publish(self, job_id: str, event: str, data: Dict[str, Any]) -> None:
+        for q in self._subscribers.get(job_id, []):
+            q.put_nowait((event, data))
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        # Draft events arrive from concurrent tasks; serialize writes so the file never regresses.
+        save_lock = asyncio.Lock()
+
+        last_saved = 0.0
+
+        async def persist(force: bool = True) -> None:
+            nonlocal last_saved
+            if not force and time.monotonic() - last_saved < _PROGRESS_SAVE_INTERVAL:
+                return
+            async with save_lock:
+                last_saved = time.monotonic()
+                await asave_job(job)
+
+        job["status"] = RUNNING
+        job["started_at"] = _now()
+        await persist()
+        self._publish(job_id, "status", public_job(job))
+
+        async def on_event(event: str, data: Dict[str, Any]) -> None:
+            self._publish(job_id, event, data)
+            if event not in _PROGRESS_EVENTS:
+                return
+            progress = job["progress"]
+            progress["last_event"] = event
+            progress["updated_at"] = _now()
+            if event == "stage_started":
+                progress["stage"] = data.get("stage")
+            elif event == "draft_done" and data.get("ok"):
+                progress["drafts_done"] = progress.get("drafts_done", 0) + 1
+            # Throttled: the final status write below always lands with the latest progress.
+            await persist(force=False)
+
+        try:
+            record = await self._runner(job["request"], on_event)
+        except asyncio.CancelledError:
+            # Shutdown: put the job back so the next start picks it up again.
+            job["status"] = QUEUED
+            job["started_at"] = None
+            save_job(job)
+            raise
+        except Exception as e:
+            print(f"Error running job {job_id}: {e}")
+            job["status"] = FAILED
+            job["error"] = str(e)
+        else:
+            job["status"] = SUCCEEDED
+            job["resume_id"] = record.get("id")
+        job["finished_at"] = _now()
+        await persist()
+        self._publish(job_id, "status", public_job(job))
+        self._jobs.pop(job_id, None)
+        if time.monotonic() - self._last_prune >= _PRUNE_INTERVAL:
+            await self._prune()
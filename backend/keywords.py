@@ -0,0 +1,99 @@
+"""Compiled keyword matching for JD keyword scoring.
+
+A matcher compiles a keyword list once into a single whole-word regex whose
+alternation is factored into a trie (shared prefixes are tried once), so every
+draft scored against the same JD reuses it and each text is scanned in one
+C-level pass whose cost barely grows with the number of keywords.
+Matches respect word boundaries ("ai" does not hit "maintain") and the scan
+yields per-keyword counts and positions as well as the hit list.
+
+A multi-pattern automaton written in Python was measured slower than this for
+the <=40 keywords build_jd_pack produces, so none is kept.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Pattern, Sequence, Tuple
+
+
+def _trie_pattern(words: Sequence[str]) -> str:
+    """Regex matching any of words, as nested alternations over shared prefixes (longest match first)."""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [(ch if ch.isalnum() else re.escape(ch)) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 and "" not in node else "(?:" + "|".join(branches) + ")"
+        # A word ending here makes the longer continuations optional (greedy, so longest wins).
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Case-insensitive whole-word matcher over a fixed keyword list."""
+
+    def __init__(self, keywords: Sequence[str]) -> None:
+        self.keywords: Tuple[str, ...] = tuple(keywords)
+        # Distinct lowercased keywords (case variants share one pattern).
+        patterns = list(dict.fromkeys(p for p in (kw.lower().strip() for kw in self.keywords) if p))
+        self._regex: Optional[Pattern[str]] = None
+        if patterns:
+            # At any position the longest keyword wins (e.g. "ci/cd" over "ci").
+            self._regex = re.compile(rf"(?<!\w)(?:{_trie_pattern(patterns)})(?!\w)")
+
+    def scan(self, text: str) -> Dict[str, List[int]]:
+        """Start offsets (into text.lower()) of every whole-word occurrence, per lowercased keyword."""
+        positions: Dict[str, List[int]] = {}
+        if self._regex is None:
+            return positions
+        for m in self._regex.finditer((text or "").lower()):
+            positions.setdefault(m.group(), []).append(m.start())
+        return positions
+
+    def match(self, text: str) -> Dict[str, object]:
+        """
+        Score one text against the keywords (whole-word, case-insensitive).
+
+        Returns:
+            hits: keywords occurring at least once (keyword order)
+            counts: keyword -> occurrences
+            positions: keyword -> start offsets
+        """
+        found = self.scan(text)
+        hits: List[str] = []
+        counts: Dict[str, int] = {}
+        positions: Dict[str, List[int]] = {}
+        for kw in self.keywords:
+            starts = found.get(kw.lower().strip(), [])
+            if starts:
+                hits.append(kw)
+            counts[kw] = len(starts)
+            positions[kw] = starts
+        return {"hits": hits, "counts": counts, "positions": positions}
+
+    def hits(self, text: str) -> List[str]:
+        """Keywords occurring as whole words in text (keyword order)."""
+        if self._regex is None:
+            return []
+        # findall + set stay in C; positions are only built by scan()/match().
+        found = set(self._regex.findall((text or "").lower()))
+        return [kw for kw in self.keywords if kw.lower().strip() in found]
+
+
+@lru_cache(maxsize=32)
+def _compiled(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
+
+
+def keyword_matcher(keywords: Sequence[str]) -> KeywordMatcher:
+    """Matcher for a keyword list, compiled once and reused (e.g. across all drafts of a JD)."""
+    return _compiled(tuple(keywords))
@@ -0,0 +1,253 @@
+"""Content-addressed cache for LLM responses.
+
+Identical prompts (same model, messages and sampling params) are answered from
+an in-memory LRU first, then from JSON files under data/, before going to
+OpenRouter. Opt-in via RESPONSE_CACHE_ENABLED.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import (
+    RESPONSE_CACHE_DIR,
+    RESPONSE_CACHE_DISK_MAX_MB,
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_MEMORY_ITEMS,
+    RESPONSE_CACHE_TTL_SECONDS,
+)
+
+
+# Per-run counters; run_resume_council installs a fresh dict so stats land in run metadata.
+_run_stats: contextvars.ContextVar[Optional[Dict[str, int]]] = contextvars.ContextVar(
+    "llm_cache_run_stats", default=None
+)
+
+
+def _empty_stats() -> Dict[str, int]:
+    return {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+
+
+def cache_key(
+    model: str,
+    messages: List[Dict[str, str]],
+    max_tokens: Optional[int] = None,
+    temperature: Optional[float] = None,
+    extra: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Stable hash of everything that determines the model's answer."""
+    material = {
+        "model": model,
+        "messages": messages,
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        "extra": extra or {},
+    }
+    encoded = json.dumps(material, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier (memory LRU + disk) cache with TTL and size-based eviction."""
+
+    def __init__(
+        self,
+        directory: str,
+        ttl_seconds: float,
+        memory_items: int,
+        disk_max_bytes: int,
+    ) -> None:
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.memory_items = memory_items
+        self.disk_max_bytes = disk_max_bytes
+        self.stats = _empty_stats()
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._disk_bytes: Optional[int] = None
+        self._disk_lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _expired(self, entry: Dict[str, Any]) -> bool:
+        if self.ttl_seconds <= 0:
+            return False
+        return time.time() - float(entry.get("stored_at", 0)) > self.ttl_seconds
+
+    def _count(self, name: str) -> None:
+        self.stats[name] += 1
+        run_stats = _run_stats.get()
+        if run_stats is not None:
+            run_stats[name] = run_stats.get(name, 0) + 1
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            if not self._expired(entry):
+                self._memory.move_to_end(key)
+                self._count("memory_hits")
+                return entry["response"]
+            self._memory.pop(key, None)
+
+        entry = self._read_disk(key)
+        if entry is not None:
+            self._remember(key, entry)
+            self._count("disk_hits")
+            return entry["response"]
+
+        self._count("misses")
+        return None
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        entry = {"stored_at": time.time(), "response": response}
+        self._remember(key, entry)
+        self._write_disk(key, entry)
+        self._count("stores")
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        """Like get(), but the disk tier is read in a worker thread."""
+        entry = self._memory.get(key)
+        if entry is not None and not self._expired(entry):
+            return self.get(key)
+        entry = await asyncio.to_thread(self._read_disk, key)
+        if entry is not None:
+            self._remember(key, entry)
+            self._count("disk_hits")
+            return entry["response"]
+        self._memory.pop(key, None)
+        self._count("misses")
+        return None
+
+    async def aput(self, key: str, response: Dict[str, Any]) -> None:
+        """Like put(), but the disk write happens in a worker thread; disk errors never reach the caller."""
+        entry = {"stored_at": time.time(), "response": response}
+        self._remember(key, entry)
+        self._count("stores")
+        try:
+            await asyncio.to_thread(self._write_disk, key, entry)
+        except Exception as e:
+            print(f"Error writing response cache entry {key}: {e}")
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except Exception:
+            return None
+        if not isinstance(entry, dict) or self._expired(entry):
+            self._remove_file(path)
+            return None
+        return entry
+
+    def _write_disk(self, key: str, entry: Dict[str, Any]) -> None:
+        path = self._path(key)
+        # Unique temp name: writes may now run concurrently in worker threads.
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            # Replace and account under one lock so concurrent writers and eviction see a consistent total.
+            with self._disk_lock:
+                try:
+                    previous = os.path.getsize(path)
+                except OSError:
+                    previous = 0
+                os.replace(tmp_path, path)
+                if self._disk_bytes is None:
+                    self._disk_bytes = self._scan_disk_bytes()
+                else:
+                    self._disk_bytes += os.path.getsize(path) - previous
+                if self._disk_bytes > self.disk_max_bytes:
+                    self._evict_disk()
+        except Exception as e:
+            print(f"Error writing response cache entry {key}: {e}")
+            self._remove_file(tmp_path)
+
+    def _cache_files(self) -> List[os.DirEntry]:
+        files: List[os.DirEntry] = []
+        if not os.path.isdir(self.directory):
+            return files
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            files.extend(e for e in os.scandir(shard.path) if e.name.endswith(".json"))
+        return files
+
+    def _file_stats(self) -> List[Tuple[str, int, float]]:
+        """(path, size, mtime) of every cache file, skipping files removed mid-scan."""
+        stats: List[Tuple[str, int, float]] = []
+        for entry in self._cache_files():
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            stats.append((entry.path, st.st_size, st.st_mtime))
+        return stats
+
+    def _scan_disk_bytes(self) -> int:
+        return sum(size for _, size, _ in self._file_stats())
+
+    def _evict_disk(self) -> None:
+        """Drop expired entries, then oldest entries until under 90% of the budget (caller holds _disk_lock)."""
+        files = sorted(self._file_stats(), key=lambda f: f[2])
+        total = sum(size for _, size, _ in files)
+        target = int(self.disk_max_bytes * 0.9)
+        now = time.time()
+        for path, size, mtime in files:
+            expired = self.ttl_seconds > 0 and now - mtime > self.ttl_seconds
+            if total <= target and not expired:
+                continue
+            total -= size
+            self._remove_file(path)
+        self._disk_bytes = total
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_cache() -> Optional[ResponseCache]:
+    """Return the process-wide cache, or None when caching is disabled."""
+    global _cache
+    if not RESPONSE_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = ResponseCache(
+            RESPONSE_CACHE_DIR,
+            ttl_seconds=RESPONSE_CACHE_TTL_SECONDS,
+            memory_items=RESPONSE_CACHE_MEMORY_ITEMS,
+            disk_max_bytes=int(RESPONSE_CACHE_DISK_MAX_MB * 1024 * 1024),
+        )
+    return _cache
+
+
+def begin_run_stats() -> Dict[str, int]:
+    """Start collecting cache counters for the current run (and its child tasks)."""
+    stats = _empty_stats()
+    _run_stats.set(stats)
+    return stats
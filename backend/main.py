@@ -1,5 +1,6 @@
 """FastAPI backend for Resume Council."""
 
+import asyncio
 import base64
 import hashlib
 import hmac
@@ -8,17 +9,25 @@ import os
 import secrets
 import time
 import uuid
+from contextlib import asynccontextmanager
 
 from fastapi import APIRouter, Depends, FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi import Request
+from fastapi.responses import FileResponse, StreamingResponse
+from fastapi import Request, Response
 from pydantic import BaseModel
 import pyotp
 
 from . import resume_storage
 from . import profile_storage
-from .packs import build_profile_pack
-from .resume import run_resume_council
+from . import openrouter
+from . import jobs
+from . import artifact_storage
+from . import docx_render
+from . import metrics
+from . import tracing
+from .config import RESUME_JOB_WORKERS, RESUME_JOB_MAX_PENDING, METRICS_ENABLED, METRICS_AUTH_TOKEN
+from .resume import profile_pack_budget, run_resume_council
 
 def _auth_config() -> dict[str, str]:
     return {
@@ -82,7 +91,40 @@ def _require_auth(request: Request) -> None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
 
 
-app = FastAPI(title="Resume Council API")
+async def _run_resume_job(job_request: dict, on_event) -> dict:
+    request = ResumeRequest(**job_request)
+    master_profile_text = request.master_profile or ""
+    council_result = await run_resume_council(
+        master_profile_text,
+        request.job_description,
+        request.company_details or "",
+        use_peer_ranking=request.use_peer_ranking,
+        on_event=on_event,
+        profile_pack_entry=await _resolve_profile_pack(request),
+    )
+    return await _save_resume_run(request, master_profile_text, council_result)
+
+
+job_queue = jobs.JobQueue(_run_resume_job, workers=RESUME_JOB_WORKERS, max_pending=RESUME_JOB_MAX_PENDING)
+metrics.jobs_queued.set_function(job_queue.depth)
+metrics.jobs_running.set_function(job_queue.running)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled OpenRouter client per process, so model calls reuse TCP/TLS connections.
+    await openrouter.start_client()
+    await job_queue.start()
+    try:
+        yield
+    finally:
+        await job_queue.stop()
+        await openrouter.close_client()
+        docx_render.shutdown_executor()
+        await asyncio.to_thread(tracing.store.flush)
+
+
+app = FastAPI(title="Resume Council API", lifespan=lifespan)
 router = APIRouter(dependencies=[Depends(_require_auth)])
 
 
@@ -100,6 +142,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
 
 class ResumeRequest(BaseModel):
     """Request body for resume tailoring."""
@@ -141,21 +185,30 @@ async def login(request: LoginRequest):
     return {"token": token, "expires_in": 60 * 60 * 12}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics(request: Request):
+    """Prometheus scrape endpoint (outside the login-token auth; closed until METRICS_AUTH_TOKEN is set)."""
+    if not METRICS_ENABLED or not METRICS_AUTH_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    provided = request.headers.get("Authorization", "").replace("Bearer ", "", 1).strip()
+    if not secrets.compare_digest(provided, METRICS_AUTH_TOKEN):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @router.get("/")
 async def root():
     """Health check endpoint."""
     return {"status": "ok", "service": "Resume Council API"}
 
 
-@router.post("/api/resume/run")
-async def run_resume(request: ResumeRequest):
-    """Run resume-tailoring council flow and persist results."""
+async def _resolve_master_profile(request: ResumeRequest) -> str:
     if not request.job_description.strip():
         raise HTTPException(status_code=400, detail="job_description is required")
 
     master_profile_text = (request.master_profile or "").strip()
     if request.profile_id:
-        prof = profile_storage.get_profile(request.profile_id)
+        prof = await profile_storage.aget_profile(request.profile_id)
         if prof is None:
             raise HTTPException(status_code=404, detail="profile_id not found")
         # For resume generation quality, prefer the full raw text as truth source.
@@ -163,14 +216,18 @@ async def run_resume(request: ResumeRequest):
 
     if not master_profile_text:
         raise HTTPException(status_code=400, detail="master_profile or profile_id is required")
+    return master_profile_text
+
+
+async def _resolve_profile_pack(request: ResumeRequest) -> dict | None:
+    """Stored profile pack for the current pack config, so runs skip rebuilding it."""
+    if not request.profile_id:
+        return None
+    return await profile_storage.aget_profile_pack(request.profile_id, profile_pack_budget())
 
-    stage1_results, stage2_results, stage3_result, metadata, docx_info = await run_resume_council(
-        master_profile_text,
-        request.job_description,
-        request.company_details or "",
-        use_peer_ranking=request.use_peer_ranking,
-    )
 
+async def _save_resume_run(request: ResumeRequest, master_profile_text: str, council_result: tuple) -> dict:
+    stage1_results, stage2_results, stage3_result, metadata, docx_info = council_result
     payload = {
         "stage1": stage1_results,
         "stage2": stage2_results,
@@ -180,7 +237,7 @@ async def run_resume(request: ResumeRequest):
     }
 
     resume_id = str(uuid.uuid4())
-    record = resume_storage.create_resume_run(
+    return await resume_storage.acreate_resume_run(
         resume_id=resume_id,
         job_description=request.job_description,
         master_profile=master_profile_text,
@@ -189,21 +246,146 @@ async def run_resume(request: ResumeRequest):
         result_payload=payload,
     )
 
-    return record
+
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/api/resume/run")
+async def run_resume(request: ResumeRequest):
+    """Run resume-tailoring council flow and persist results."""
+    master_profile_text = await _resolve_master_profile(request)
+
+    council_result = await run_resume_council(
+        master_profile_text,
+        request.job_description,
+        request.company_details or "",
+        use_peer_ranking=request.use_peer_ranking,
+        profile_pack_entry=await _resolve_profile_pack(request),
+    )
+    return await _save_resume_run(request, master_profile_text, council_result)
+
+
+@router.post("/api/resume/run/stream")
+async def run_resume_stream(request: ResumeRequest):
+    """
+    Run the resume council and stream progress as Server-Sent Events.
+
+    Emits draft_started / token / draft_done / ranking_done / final_done events
+    as they happen, then a final "complete" event with the persisted record.
+    """
+    master_profile_text = await _resolve_master_profile(request)
+    profile_pack_entry = await _resolve_profile_pack(request)
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    async def on_event(event: str, data: dict) -> None:
+        await queue.put((event, data))
+
+    async def run() -> None:
+        try:
+            council_result = await run_resume_council(
+                master_profile_text,
+                request.job_description,
+                request.company_details or "",
+                use_peer_ranking=request.use_peer_ranking,
+                on_event=on_event,
+                profile_pack_entry=profile_pack_entry,
+            )
+            record = await _save_resume_run(request, master_profile_text, council_result)
+            await queue.put(("complete", record))
+        except Exception as e:
+            print(f"Error in streaming resume run: {e}")
+            await queue.put(("error", {"detail": str(e)}))
+        finally:
+            await queue.put(done)
+
+    async def event_stream():
+        task = asyncio.create_task(run())
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                event, data = item
+                yield _sse_event(event, data)
+        finally:
+            # Client disconnected early: stop spending tokens on the run.
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/api/resume/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_resume_job(request: ResumeRequest):
+    """Queue a resume council run and return its job id immediately."""
+    master_profile_text = await _resolve_master_profile(request)
+    job_request = request.model_dump()
+    # Persist the resolved truth source so the job is self-contained across restarts.
+    # profile_id is kept only to reuse the profile's stored pack (checked against this text).
+    job_request["master_profile"] = master_profile_text
+    try:
+        job = await job_queue.submit(str(uuid.uuid4()), job_request)
+    except jobs.QueueFullError:
+        raise HTTPException(status_code=503, detail="Job queue is full, try again later")
+    return jobs.public_job(job)
+
+
+@router.get("/api/resume/jobs/{job_id}")
+async def get_resume_job(job_id: str):
+    """Poll a resume job's status and progress."""
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return jobs.public_job(job)
+
+
+@router.get("/api/resume/jobs/{job_id}/events")
+async def stream_resume_job(job_id: str):
+    """Subscribe to a resume job's progress as Server-Sent Events."""
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def event_stream():
+        q = job_queue.subscribe(job_id)
+        try:
+            current = await job_queue.get(job_id) or job
+            yield _sse_event("status", jobs.public_job(current))
+            if current.get("status") in {jobs.SUCCEEDED, jobs.FAILED}:
+                return
+            while True:
+                event, data = await q.get()
+                yield _sse_event(event, data)
+                if event == "status" and data.get("status") in {jobs.SUCCEEDED, jobs.FAILED}:
+                    return
+        finally:
+            job_queue.unsubscribe(job_id, q)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/api/profiles")
 async def list_profiles():
     """List saved master profiles (metadata only)."""
-    return profile_storage.list_profiles()
+    return await profile_storage.alist_profiles()
 
 
 @router.get("/api/profiles/{profile_id}")
 async def get_profile(profile_id: str):
-    prof = profile_storage.get_profile(profile_id)
+    prof = await profile_storage.aget_profile(profile_id)
     if prof is None:
         raise HTTPException(status_code=404, detail="Profile not found")
-    return prof
+    return profile_storage.public_profile(prof)
 
 
 @router.post("/api/profiles")
@@ -211,26 +393,74 @@ async def create_profile(request: CreateProfileRequest):
     if not request.raw_text.strip():
         raise HTTPException(status_code=400, detail="raw_text is required")
     profile_id = str(uuid.uuid4())
-    compact = build_profile_pack(request.raw_text)
-    prof = profile_storage.create_profile(profile_id, request.name or "Master Profile", request.raw_text, compact)
+    # Packs (including the compact text) are built once, in the storage worker thread.
+    prof = await profile_storage.acreate_profile(profile_id, request.name or "Master Profile", request.raw_text)
     return {"id": prof["id"], "name": prof["name"], "created_at": prof["created_at"]}
 
 
 @router.get("/api/resumes")
-async def list_resumes():
-    """List resume runs (metadata only)."""
-    return resume_storage.list_resume_runs()
+async def list_resumes(response: Response, limit: int | None = None, offset: int = 0):
+    """List resume runs (metadata only), newest first."""
+    if limit is not None and limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be positive")
+    response.headers["X-Total-Count"] = str(await resume_storage.acount_resume_runs())
+    return await resume_storage.alist_resume_runs(limit=limit, offset=offset)
+
+
+@router.get("/api/resumes/{resume_id}/docx")
+async def download_resume_docx(resume_id: str, request: Request):
+    """Download the generated DOCX for a run (supports If-None-Match)."""
+    record = await resume_storage.aget_resume_run(resume_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Resume run not found")
+    docx_info = (record.get("result") or {}).get("docx") or {}
+    filename = docx_info.get("filename") or "tailored_resume.docx"
+    disposition = {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+    sha256 = docx_info.get("sha256")
+    if sha256 and artifact_storage.artifact_exists(sha256, "docx"):
+        etag = f'"{sha256}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        return FileResponse(
+            artifact_storage.get_artifact_path(sha256, "docx"),
+            media_type=artifact_storage.DOCX_CONTENT_TYPE,
+            headers={**disposition, "ETag": etag, "Cache-Control": "private, max-age=31536000, immutable"},
+        )
+
+    # Records written before DOCX blobs existed carry the file inline as base64.
+    if docx_info.get("base64"):
+        data = await asyncio.to_thread(base64.b64decode, docx_info["base64"])
+        return Response(content=data, media_type=artifact_storage.DOCX_CONTENT_TYPE, headers=disposition)
+
+    raise HTTPException(status_code=404, detail="DOCX not available for this run")
 
 
 @router.get("/api/resumes/{resume_id}")
 async def get_resume(resume_id: str):
     """Get a saved resume run with inputs + results."""
-    record = resume_storage.get_resume_run(resume_id)
+    record = await resume_storage.aget_resume_run(resume_id)
     if record is None:
         raise HTTPException(status_code=404, detail="Resume run not found")
     return record
 
 
+@router.get("/api/traces")
+async def list_traces():
+    """Recent resume-run traces kept in memory, newest first."""
+    return {"traces": tracing.store.recent()}
+
+
+@router.get("/api/traces/{trace_id}")
+async def get_trace(trace_id: str):
+    """All spans of a trace plus its critical path (the chain of spans the run waited on last)."""
+    spans = await asyncio.to_thread(tracing.store.get, trace_id)
+    if not spans:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    spans = sorted(spans, key=lambda s: s.get("start") or 0.0)
+    return {"trace_id": trace_id, "spans": spans, "critical_path": tracing.critical_path(spans)}
+
+
 app.include_router(router)
 
 
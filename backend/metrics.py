@@ -0,0 +1,400 @@
+"""Prometheus-compatible metrics for the Resume Council API.
+
+A small in-process registry (counters, gauges, histograms with labels) rendered
+in the Prometheus text exposition format at GET /metrics. Kept dependency-free;
+the metric and label names follow the usual Prometheus conventions so they can
+be swapped for prometheus_client without changing dashboards.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Buckets (seconds) for fast local work, HTTP handlers and upstream LLM calls.
+STORAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+UPSTREAM_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 45.0, 60.0, 90.0, 120.0, 180.0)
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{_escape(extra[1])}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Timer:
+    """Observes elapsed seconds into a histogram; usable as a context manager or a (sync/async) decorator."""
+
+    def __init__(self, observe: Callable[[float], None]) -> None:
+        self._observe = observe
+        self._started = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._observe(time.perf_counter() - self._started)
+
+    def __call__(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with _Timer(self._observe):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with _Timer(self._observe):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+
+class _InProgress:
+    """Gauge +1 while inside; usable as a context manager or an async decorator."""
+
+    def __init__(self, inc: Callable[[float], None]) -> None:
+        self._inc = inc
+
+    def __enter__(self) -> "_InProgress":
+        self._inc(1)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._inc(-1)
+
+    def __call__(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with _InProgress(self._inc):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labelvalues: Sequence[Any], labelkw: Dict[str, Any]) -> Tuple[str, ...]:
+        if labelkw:
+            labelvalues = [labelkw[n] for n in self.labelnames]
+        if len(labelvalues) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        return tuple(str(v) for v in labelvalues)
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class _CounterChild:
+    def __init__(self, metric: "Counter", key: Tuple[str, ...]) -> None:
+        self._metric = metric
+        self._key = key
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._metric._inc(self._key, amount)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        # Unlabelled metrics report 0 before their first update.
+        self._values: Dict[Tuple[str, ...], float] = {} if self.labelnames else {(): 0.0}
+
+    def labels(self, *labelvalues: Any, **labelkw: Any) -> _CounterChild:
+        return _CounterChild(self, self._key(labelvalues, labelkw))
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._inc((), amount)
+
+    def _inc(self, key: Tuple[str, ...], amount: float) -> None:
+        if amount < 0:
+            raise ValueError("counters can only increase")
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_label_text(self.labelnames, key)} {_format_value(value)}"
+
+
+class _GaugeChild:
+    def __init__(self, metric: "Gauge", key: Tuple[str, ...]) -> None:
+        self._metric = metric
+        self._key = key
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._metric._inc(self._key, amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._metric._inc(self._key, -amount)
+
+    def set(self, value: float) -> None:
+        self._metric._set(self._key, value)
+
+    def track_inprogress(self) -> _InProgress:
+        return _InProgress(lambda amount: self._metric._inc(self._key, amount))
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        # Unlabelled metrics report 0 before their first update.
+        self._values: Dict[Tuple[str, ...], float] = {} if self.labelnames else {(): 0.0}
+        self._function: Optional[Callable[[], float]] = None
+
+    def labels(self, *labelvalues: Any, **labelkw: Any) -> _GaugeChild:
+        return _GaugeChild(self, self._key(labelvalues, labelkw))
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._inc((), amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._inc((), -amount)
+
+    def set(self, value: float) -> None:
+        self._set((), value)
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        """Read the (unlabelled) value from fn at scrape time."""
+        self._function = fn
+
+    def track_inprogress(self) -> _InProgress:
+        return _InProgress(lambda amount: self._inc((), amount))
+
+    def _inc(self, key: Tuple[str, ...], amount: float) -> None:
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _set(self, key: Tuple[str, ...], value: float) -> None:
+        with self._lock:
+            self._values[key] = float(value)
+
+    def _samples(self) -> Iterable[str]:
+        if self._function is not None:
+            try:
+                value = float(self._function())
+            except Exception:
+                value = float("nan")
+            yield f"{self.name} {_format_value(value)}"
+            return
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_label_text(self.labelnames, key)} {_format_value(value)}"
+
+
+class _HistogramChild:
+    def __init__(self, metric: "Histogram", key: Tuple[str, ...]) -> None:
+        self._metric = metric
+        self._key = key
+
+    def observe(self, value: float) -> None:
+        self._metric._observe(self._key, value)
+
+    def time(self) -> _Timer:
+        return _Timer(self.observe)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = HTTP_BUCKETS
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        # key -> (per-bucket counts (non-cumulative, last = +Inf), sum)
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], float]] = {}
+        if not self.labelnames:
+            self._values[()] = ([0] * (len(self.buckets) + 1), 0.0)
+
+    def labels(self, *labelvalues: Any, **labelkw: Any) -> _HistogramChild:
+        return _HistogramChild(self, self._key(labelvalues, labelkw))
+
+    def observe(self, value: float) -> None:
+        self._observe((), value)
+
+    def time(self) -> _Timer:
+        return _Timer(self.observe)
+
+    def _observe(self, key: Tuple[str, ...], value: float) -> None:
+        idx = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                idx = i
+                break
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[idx] += 1
+            self._values[key] = (counts, total + value)
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted((k, (list(c), s)) for k, (c, s) in self._values.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                labels = _label_text(self.labelnames, key, ("le", _format_value(bound)))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _label_text(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(m.render() for m in self._metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def _counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))  # type: ignore[return-value]
+
+
+def _gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, documentation, labelnames))  # type: ignore[return-value]
+
+
+def _histogram(name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = HTTP_BUCKETS) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))  # type: ignore[return-value]
+
+
+http_requests = _counter("http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status"))
+http_request_seconds = _histogram(
+    "http_request_duration_seconds",
+    "Time until the response starts (SSE streams keep running after this).",
+    ("method", "route"),
+)
+http_requests_in_flight = _gauge("http_requests_in_flight", "HTTP requests currently being handled.")
+
+upstream_requests = _counter(
+    "openrouter_requests_total", "Upstream OpenRouter request attempts by model and outcome.", ("model", "outcome")
+)
+upstream_request_seconds = _histogram(
+    "openrouter_request_duration_seconds",
+    "Upstream request attempt duration (excluding rate-limit queueing).",
+    ("model", "outcome"),
+    UPSTREAM_BUCKETS,
+)
+upstream_errors = _counter(
+    "openrouter_errors_total", "Failed upstream attempts by model and reason (HTTP status or exception type).", ("model", "reason")
+)
+upstream_tokens = _counter("openrouter_tokens_total", "Tokens reported by OpenRouter.", ("model", "kind"))
+upstream_cost = _counter("openrouter_cost_usd_total", "Cost reported by OpenRouter (USD).", ("model",))
+
+council_runs_in_flight = _gauge("resume_council_runs_in_flight", "Resume council runs currently executing.")
+council_run_seconds = _histogram(
+    "resume_council_run_duration_seconds", "End-to-end resume council run time.", (), UPSTREAM_BUCKETS
+)
+
+jobs_queued = _gauge("resume_jobs_queued", "Resume jobs waiting for a worker.")
+jobs_running = _gauge("resume_jobs_running", "Resume jobs currently running.")
+
+storage_seconds = _histogram(
+    "storage_operation_duration_seconds", "Local storage operation time.", ("store", "operation"), STORAGE_BUCKETS
+)
+docx_render_seconds = _histogram(
+    "docx_render_duration_seconds", "DOCX render time (executor round trip).", (), STORAGE_BUCKETS + (2.5, 5.0)
+)
+docx_renders = _counter("docx_renders_total", "DOCX render requests by result.", ("result",))
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts, latency and in-flight requests.
+
+    Requests are labelled by route template (e.g. /api/resumes/{resume_id}) so
+    ids do not explode label cardinality; unmatched paths share one label.
+    Latency is measured until the response starts, so long SSE streams do not
+    skew the histogram.
+    """
+
+    def __init__(self, app: Callable[..., Any]) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable[..., Any], send: Callable[..., Any]) -> None:
+        if scope.get("type") != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = {"code": 500, "observed": False}
+
+        def _observe() -> None:
+            if status["observed"]:
+                return
+            status["observed"] = True
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope.get("method", "GET")
+            http_requests.labels(method, route, str(status["code"])).inc()
+            http_request_seconds.labels(method, route).observe(time.perf_counter() - started)
+
+        async def _send(message: Dict[str, Any]) -> None:
+            if message.get("type") == "http.response.start":
+                status["code"] = message.get("status", 500)
+                _observe()
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            http_requests_in_flight.dec()
+            _observe()
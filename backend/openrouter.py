@@ -1,8 +1,90 @@
 """OpenRouter API client for making LLM requests."""
 
+import asyncio
+import json
+import time
+
 import httpx
-from typing import List, Dict, Any, Optional
-from .config import OPENROUTER_API_KEY, OPENROUTER_API_URL
+from typing import List, Dict, Any, Optional, Callable, Awaitable, Tuple
+from .config import (
+    OPENROUTER_API_KEY,
+    OPENROUTER_API_URL,
+    OPENROUTER_MAX_CONNECTIONS,
+    OPENROUTER_MAX_KEEPALIVE_CONNECTIONS,
+    OPENROUTER_KEEPALIVE_EXPIRY,
+    OPENROUTER_CONNECT_TIMEOUT,
+    OPENROUTER_HTTP2,
+    OPENROUTER_COALESCE_REQUESTS,
+    OPENROUTER_USAGE_ACCOUNTING,
+)
+from .llm_cache import cache_key, get_cache
+from .singleflight import SingleFlight
+from .ratelimit import limiter
+from .retry import DEFAULT_RETRY, RetryPolicy, StreamError, retry_delay
+from .latency import latencies
+from .circuit import breakers, is_provider_failure
+from .usage import current_run, current_stage
+from . import metrics
+from . import tracing
+
+
+_client: Optional[httpx.AsyncClient] = None
+
+# Identical concurrent calls (same model/messages/params) share one upstream request.
+_inflight = SingleFlight()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _build_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=OPENROUTER_MAX_CONNECTIONS,
+        max_keepalive_connections=OPENROUTER_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=OPENROUTER_KEEPALIVE_EXPIRY,
+    )
+    http2 = OPENROUTER_HTTP2 and _http2_available()
+    if OPENROUTER_HTTP2 and not http2:
+        print("OPENROUTER_HTTP2 is set but the 'h2' package is missing; using HTTP/1.1")
+    return httpx.AsyncClient(
+        limits=limits,
+        http2=http2,
+        timeout=httpx.Timeout(120.0, connect=OPENROUTER_CONNECT_TIMEOUT),
+    )
+
+
+async def start_client() -> httpx.AsyncClient:
+    """Create the shared pooled client (called on app startup)."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared pooled client (called on app shutdown)."""
+    global _client
+    client, _client = _client, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide pooled client.
+
+    Created lazily when used outside the FastAPI lifespan (e.g. scripts), so
+    keep-alive connections are reused across every Stage 1/2/3 call.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
 
 
 async def query_model(
@@ -12,6 +94,11 @@ async def query_model(
     max_tokens: Optional[int] = None,
     temperature: Optional[float] = None,
     extra: Optional[Dict[str, Any]] = None,
+    stream: bool = False,
+    on_token: Optional[Callable[[str], Awaitable[None]]] = None,
+    use_cache: bool = True,
+    retry: Optional[RetryPolicy] = None,
+    coalesce: bool = True,
 ) -> Optional[Dict[str, Any]]:
     """
     Query a single model via OpenRouter API.
@@ -20,10 +107,108 @@ async def query_model(
         model: OpenRouter model identifier (e.g., "openai/gpt-4o")
         messages: List of message dicts with 'role' and 'content'
         timeout: Request timeout in seconds
+        stream: Request SSE streaming; the full content is still returned at the end
+        on_token: Awaited with each content delta while streaming
+        use_cache: Consult/populate the response cache (when RESPONSE_CACHE_ENABLED)
+        retry: Retry policy for transient failures (defaults to DEFAULT_RETRY)
+        coalesce: Share in-flight identical calls (disabled for hedge backups)
 
     Returns:
-        Response dict with 'content' and optional 'reasoning_details', or None if failed
+        Response dict with 'content', optional 'reasoning_details' and the upstream
+        'usage' (token counts, cost), or None if failed. Timing and usage are also
+        recorded into the current run's usage collector (see usage.begin_run_usage).
     """
+    run = current_run()
+    started = time.perf_counter()
+    call: Dict[str, Any] = {"attempts": 0, "first_token_at": None}
+    status = "error"
+    result: Optional[Dict[str, Any]] = None
+    with tracing.span("model_call", model=model, stage=current_stage(), stream=stream) as span:
+        try:
+            result = await _query_model_cached(
+                model, messages, timeout, max_tokens, temperature, extra, stream, on_token, use_cache, retry, coalesce, call
+            )
+            status = "ok" if result is not None else "error"
+            return result
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        finally:
+            if run is not None:
+                run.record(model, started, status, result, call["attempts"], call["first_token_at"])
+            usage = (result or {}).get("usage") or {}
+            span.set_status(status)
+            span.set(
+                attempts=call["attempts"],
+                cached=bool((result or {}).get("cached")),
+                coalesced=bool((result or {}).get("coalesced")),
+                ttft_seconds=None if call["first_token_at"] is None else round(call["first_token_at"] - started, 4),
+                prompt_tokens=usage.get("prompt_tokens"),
+                completion_tokens=usage.get("completion_tokens"),
+                cost_usd=usage.get("cost"),
+            )
+
+
+async def _query_model_cached(
+    model: str,
+    messages: List[Dict[str, str]],
+    timeout: float,
+    max_tokens: Optional[int],
+    temperature: Optional[float],
+    extra: Optional[Dict[str, Any]],
+    stream: bool,
+    on_token: Optional[Callable[[str], Awaitable[None]]],
+    use_cache: bool,
+    retry: Optional[RetryPolicy],
+    coalesce: bool,
+    call: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    cache = get_cache() if use_cache else None
+    key = None
+    coalesce = coalesce and OPENROUTER_COALESCE_REQUESTS
+    if cache is not None or coalesce:
+        key = cache_key(model, messages, max_tokens=max_tokens, temperature=temperature, extra=extra)
+
+    if cache is not None:
+        cached = await cache.aget(key)
+        if cached is not None:
+            if stream and on_token is not None and cached.get("content"):
+                await on_token(cached["content"])
+            return dict(cached, cached=True)
+
+    async def _fetch() -> Optional[Dict[str, Any]]:
+        result = await _query_model_uncached(
+            model, messages, timeout, max_tokens, temperature, extra, stream, on_token, retry or DEFAULT_RETRY, call
+        )
+        if cache is not None and result is not None and (result.get("content") or "").strip():
+            await cache.aput(key, result)
+        return result
+
+    if not coalesce:
+        return await _fetch()
+
+    result, shared = await _inflight.do(key, _fetch)
+    if shared and result is not None:
+        # Only the leading caller saw token deltas; hand followers the whole text at once.
+        if stream and on_token is not None and result.get("content"):
+            await on_token(result["content"])
+        return dict(result, coalesced=True)
+    return result
+
+
+async def _query_model_uncached(
+    model: str,
+    messages: List[Dict[str, str]],
+    timeout: float,
+    max_tokens: Optional[int],
+    temperature: Optional[float],
+    extra: Optional[Dict[str, Any]],
+    stream: bool,
+    on_token: Optional[Callable[[str], Awaitable[None]]],
+    retry: RetryPolicy,
+    call: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    """Send with retries; fills call["attempts"] and call["first_token_at"] (perf_counter)."""
     headers = {
         "Authorization": f"Bearer {OPENROUTER_API_KEY}",
         "Content-Type": "application/json",
@@ -38,29 +223,291 @@ async def query_model(
         payload["max_tokens"] = max_tokens
     if temperature is not None:
         payload["temperature"] = temperature
+    if OPENROUTER_USAGE_ACCOUNTING:
+        # Ask OpenRouter to include the call's cost in `usage`.
+        payload["usage"] = {"include": True}
     if extra:
         payload.update(extra)
 
+    if stream:
+        payload["stream"] = True
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + retry.budget(timeout)
+    # Set only when this call is the half-open probe admitted for the model in this run.
+    probe_id = breakers.claim_probe(model)
+    tokens_sent = False
+
+    async def _track_tokens(delta: str) -> None:
+        nonlocal tokens_sent
+        if call["first_token_at"] is None:
+            call["first_token_at"] = time.perf_counter()
+        if on_token is not None:
+            tokens_sent = True
+            await on_token(delta)
+
+    attempt = 0
+    while True:
+        attempt += 1
+        call["attempts"] = attempt
+        call["first_token_at"] = None
+        attempt_timeout = min(timeout, deadline - loop.time())
+        started = None
+        try:
+            if attempt_timeout <= 0:
+                raise asyncio.TimeoutError("retry budget exhausted")
+            with tracing.span("upstream_attempt", model=model, attempt=attempt) as span:
+                queued = loop.time()
+                # Queue behind the per-model/global limits rather than bursting into 429s.
+                async with limiter.slot(model):
+                    started = loop.time()
+                    span.set(queue_seconds=round(started - queued, 4))
+                    result = await _send_request(headers, payload, attempt_timeout, stream, _track_tokens)
+                    latencies.record(model, loop.time() - started)
+                    breakers.record_success(model, loop.time() - started, probe_id)
+                    _observe_attempt(model, "ok", loop.time() - started, result.get("usage"))
+                    return result
+
+        except Exception as e:
+            if started is not None:
+                _observe_attempt(model, "error", loop.time() - started, None)
+                metrics.upstream_errors.labels(model, _error_reason(e)).inc()
+                if is_provider_failure(e):
+                    breakers.record_failure(model, loop.time() - started, probe_id)
+            # Tokens already streamed to the client cannot be taken back, so never retry then.
+            retryable = retry.should_retry(e) and not tokens_sent and attempt < retry.max_attempts
+            delay = None
+            if retryable:
+                delay = retry_delay(retry, attempt, e, deadline - loop.time())
+                retryable = delay is not None
+            if not retryable:
+                print(f"Error querying model {model} (attempt {attempt}): {e}")
+                return None
+            print(f"Retrying model {model} in {delay:.1f}s after attempt {attempt} failed: {e}")
+            with tracing.span("retry_backoff", model=model, attempt=attempt, delay_seconds=round(delay, 3)):
+                await asyncio.sleep(delay)
+
+
+def _error_reason(error: BaseException) -> str:
+    status = getattr(error, "status_code", None)
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+    if isinstance(status, int):
+        return str(status)
+    if isinstance(error, (httpx.TimeoutException, asyncio.TimeoutError)):
+        return "timeout"
+    return type(error).__name__
+
+
+def _observe_attempt(model: str, outcome: str, seconds: float, usage: Optional[Dict[str, Any]]) -> None:
+    metrics.upstream_requests.labels(model, outcome).inc()
+    metrics.upstream_request_seconds.labels(model, outcome).observe(seconds)
+    for kind in ("prompt_tokens", "completion_tokens"):
+        if isinstance((usage or {}).get(kind), int):
+            metrics.upstream_tokens.labels(model, kind[: -len("_tokens")]).inc(usage[kind])
+    if isinstance((usage or {}).get("cost"), (int, float)) and usage["cost"] >= 0:
+        metrics.upstream_cost.labels(model).inc(usage["cost"])
+
+
+async def _send_request(
+    headers: Dict[str, str],
+    payload: Dict[str, Any],
+    timeout: float,
+    stream: bool,
+    on_token: Optional[Callable[[str], Awaitable[None]]],
+) -> Dict[str, Any]:
+    client = get_client()
+    if stream:
+        return await asyncio.wait_for(
+            _stream_completion(client, headers, payload, timeout, on_token),
+            timeout=timeout,
+        )
+
+    response = await client.post(
+        OPENROUTER_API_URL,
+        headers=headers,
+        json=payload,
+        timeout=httpx.Timeout(timeout, connect=OPENROUTER_CONNECT_TIMEOUT),
+    )
+    response.raise_for_status()
+
+    data = response.json()
+    message = data['choices'][0]['message']
+
+    return {
+        'content': message.get('content'),
+        'reasoning_details': message.get('reasoning_details'),
+        'usage': data.get('usage'),
+    }
+
+
+def _parse_sse_line(line: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse one SSE line from OpenRouter.
+
+    Returns the decoded JSON chunk, or None for blank lines, comments
+    (e.g. ": OPENROUTER PROCESSING" keep-alives) and the [DONE] sentinel.
+    """
+    line = (line or "").strip()
+    if not line or line.startswith(":") or not line.startswith("data:"):
+        return None
+    data = line[len("data:"):].strip()
+    if not data or data == "[DONE]":
+        return None
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(
-                OPENROUTER_API_URL,
-                headers=headers,
-                json=payload
-            )
-            response.raise_for_status()
+        chunk = json.loads(data)
+    except json.JSONDecodeError:
+        return None
+    return chunk if isinstance(chunk, dict) else None
+
 
-            data = response.json()
-            message = data['choices'][0]['message']
+async def _stream_completion(
+    client: httpx.AsyncClient,
+    headers: Dict[str, str],
+    payload: Dict[str, Any],
+    timeout: float,
+    on_token: Optional[Callable[[str], Awaitable[None]]],
+) -> Dict[str, Any]:
+    content_parts: List[str] = []
+    reasoning_details: List[Any] = []
+    usage: Optional[Dict[str, Any]] = None
 
-            return {
-                'content': message.get('content'),
-                'reasoning_details': message.get('reasoning_details')
-            }
+    async with client.stream(
+        "POST",
+        OPENROUTER_API_URL,
+        headers=headers,
+        json=payload,
+        timeout=httpx.Timeout(timeout, connect=OPENROUTER_CONNECT_TIMEOUT),
+    ) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            chunk = _parse_sse_line(line)
+            if chunk is None:
+                continue
+            if chunk.get("error"):
+                # Mid-stream provider errors arrive as a data chunk, not an HTTP status.
+                raise StreamError(chunk["error"])
+            if chunk.get("usage"):
+                # Sent once, on the final chunk (which may carry no choices).
+                usage = chunk["usage"]
+            choices = chunk.get("choices") or []
+            if not choices:
+                continue
+            delta = choices[0].get("delta") or {}
+            if delta.get("reasoning_details"):
+                reasoning_details.extend(delta["reasoning_details"])
+            text = delta.get("content")
+            if text:
+                content_parts.append(text)
+                if on_token is not None:
+                    await on_token(text)
 
-    except Exception as e:
-        print(f"Error querying model {model}: {e}")
+    return {
+        'content': "".join(content_parts),
+        'reasoning_details': reasoning_details or None,
+        'usage': usage,
+    }
+
+
+async def query_model_hedged(
+    model: str,
+    messages: List[Dict[str, str]],
+    hedge_model: Optional[str] = None,
+    percentile: float = 90.0,
+    min_samples: int = 5,
+    default_delay: float = 30.0,
+    timeout: float = 120.0,
+    max_tokens: Optional[int] = None,
+    temperature: Optional[float] = None,
+    extra: Optional[Dict[str, Any]] = None,
+    retry: Optional[RetryPolicy] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Query a model, firing a backup request if the primary is slow.
+
+    The hedge delay is the primary model's recent latency at `percentile`
+    (or `default_delay` until `min_samples` calls have been observed). If the
+    primary has not answered by then, or fails, a backup goes to `hedge_model`
+    (default: the same model); the first successful answer wins and the other
+    call is cancelled.
+
+    Returns:
+        Response dict (with 'model' set to the winner and 'hedged' flag), or None if both failed
+    """
+    backup_model = hedge_model or model
+    delay = default_delay
+    if latencies.count(model) >= min_samples:
+        delay = latencies.percentile(model, percentile) or default_delay
+
+    def _call(target: str, coalesce: bool) -> asyncio.Task:
+        return asyncio.ensure_future(query_model(
+            target, messages, timeout=timeout, max_tokens=max_tokens, temperature=temperature,
+            extra=extra, retry=retry, coalesce=coalesce,
+        ))
+
+    primary = _call(model, True)
+    tasks = {primary: model}
+    try:
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done and primary.result() is not None:
+            return dict(primary.result(), model=model, hedged=False)
+
+        # Backup must not coalesce onto the (slow) primary's identical in-flight call.
+        backup = _call(backup_model, False)
+        tasks[backup] = backup_model
+        pending = {t for t in tasks if not t.done()}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.result() is not None:
+                    return dict(task.result(), model=tasks[task], hedged=True)
         return None
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+ModelHook = Callable[[str], Awaitable[None]]
+TokenHook = Callable[[str, str], Awaitable[None]]
+CompleteHook = Callable[[str, Optional[Dict[str, Any]]], Awaitable[None]]
+
+# Detached straggler tasks; referenced here so they are not garbage-collected mid-flight.
+_background_tasks: set = set()
+
+
+async def _query_with_hooks(
+    model: str,
+    messages: List[Dict[str, str]],
+    timeout: float,
+    max_tokens: Optional[int],
+    temperature: Optional[float],
+    extra: Optional[Dict[str, Any]],
+    on_start: Optional[ModelHook],
+    on_token: Optional[TokenHook],
+    on_complete: Optional[CompleteHook],
+    retry: Optional[RetryPolicy] = None,
+) -> Optional[Dict[str, Any]]:
+    if on_start is not None:
+        await on_start(model)
+
+    async def _on_model_token(delta: str) -> None:
+        await on_token(model, delta)
+
+    response = await query_model(
+        model,
+        messages,
+        timeout=timeout,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        extra=extra,
+        stream=on_token is not None,
+        on_token=_on_model_token if on_token is not None else None,
+        retry=retry,
+    )
+    if on_complete is not None:
+        await on_complete(model, response)
+    return response
 
 
 async def query_models_parallel(
@@ -70,6 +517,10 @@ async def query_models_parallel(
     max_tokens: Optional[int] = None,
     temperature: Optional[float] = None,
     extra: Optional[Dict[str, Any]] = None,
+    on_start: Optional[ModelHook] = None,
+    on_token: Optional[TokenHook] = None,
+    on_complete: Optional[CompleteHook] = None,
+    retry: Optional[RetryPolicy] = None,
 ) -> Dict[str, Optional[Dict[str, Any]]]:
     """
     Query multiple models in parallel.
@@ -77,21 +528,18 @@ async def query_models_parallel(
     Args:
         models: List of OpenRouter model identifiers
         messages: List of message dicts to send to each model
+        on_start: Awaited with the model id before its request is sent
+        on_token: Awaited with (model, delta); enables streaming when set
+        on_complete: Awaited with (model, response) as each model finishes
+        retry: Retry policy applied to each model call
 
     Returns:
         Dict mapping model identifier to response dict (or None if failed)
     """
-    import asyncio
-
     # Create tasks for all models
     tasks = [
-        query_model(
-            model,
-            messages,
-            timeout=timeout,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            extra=extra,
+        _query_with_hooks(
+            model, messages, timeout, max_tokens, temperature, extra, on_start, on_token, on_complete, retry
         )
         for model in models
     ]
@@ -101,3 +549,97 @@ async def query_models_parallel(
 
     # Map models to their responses
     return {model: response for model, response in zip(models, responses)}
+
+
+def _has_content(response: Optional[Dict[str, Any]]) -> bool:
+    return bool(((response or {}).get("content") or "").strip())
+
+
+async def query_models_quorum(
+    models: List[str],
+    messages: List[Dict[str, str]],
+    quorum: int,
+    grace_seconds: float = 0.0,
+    detach_stragglers: bool = False,
+    timeout: float = 120.0,
+    max_tokens: Optional[int] = None,
+    temperature: Optional[float] = None,
+    extra: Optional[Dict[str, Any]] = None,
+    on_start: Optional[ModelHook] = None,
+    on_token: Optional[TokenHook] = None,
+    on_complete: Optional[CompleteHook] = None,
+    retry: Optional[RetryPolicy] = None,
+) -> Tuple[Dict[str, Optional[Dict[str, Any]]], List[str]]:
+    """
+    Query models in parallel but stop waiting once a quorum has answered.
+
+    After `quorum` models return non-empty content, the remaining models get
+    `grace_seconds` more to finish. Whatever is still running is then cut off:
+    cancelled, or (detach_stragglers=True) left to finish in the background so
+    their answers still warm the response cache. Hooks never fire for cut-off
+    models once this returns.
+
+    Args:
+        models: List of OpenRouter model identifiers
+        messages: List of message dicts to send to each model
+        quorum: Successful responses needed before the grace window starts;
+            values <= 0 or >= len(models) wait for every model
+
+    Returns:
+        Tuple of (dict mapping model to response or None, list of cut-off models)
+    """
+    if quorum <= 0 or quorum >= len(models):
+        return await query_models_parallel(
+            models, messages, timeout=timeout, max_tokens=max_tokens, temperature=temperature,
+            extra=extra, on_start=on_start, on_token=on_token, on_complete=on_complete, retry=retry,
+        ), []
+
+    loop = asyncio.get_running_loop()
+    # Once the quorum returns, detached stragglers only warm the cache: their hooks go quiet.
+    closed = False
+
+    def _gate(hook: Optional[Callable[..., Awaitable[None]]]) -> Optional[Callable[..., Awaitable[None]]]:
+        if hook is None:
+            return None
+
+        async def gated(*args: Any) -> None:
+            if not closed:
+                await hook(*args)
+
+        return gated
+
+    tasks = {
+        asyncio.ensure_future(
+            _query_with_hooks(
+                model, messages, timeout, max_tokens, temperature, extra,
+                _gate(on_start), _gate(on_token), _gate(on_complete), retry,
+            )
+        ): model
+        for model in models
+    }
+    responses: Dict[str, Optional[Dict[str, Any]]] = {}
+    pending = set(tasks)
+    deadline: Optional[float] = None
+
+    try:
+        while pending:
+            wait_for = None if deadline is None else max(0.0, deadline - loop.time())
+            done, pending = await asyncio.wait(pending, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break  # grace window elapsed
+            for task in done:
+                responses[tasks[task]] = task.result()
+            succeeded = sum(1 for r in responses.values() if _has_content(r))
+            if deadline is None and succeeded >= quorum:
+                deadline = loop.time() + grace_seconds
+    finally:
+        closed = True
+        for task in pending:
+            if detach_stragglers:
+                _background_tasks.add(task)
+                task.add_done_callback(_background_tasks.discard)
+            else:
+                task.cancel()
+
+    cut_off = [tasks[task] for task in pending]
+    return {model: responses.get(model) for model in models}, cut_off
@@ -2,9 +2,15 @@
 
 from __future__ import annotations
 
+import hashlib
+import math
 import re
 from collections import Counter
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .keywords import keyword_matcher
+from .sections import PROFILE_HEADINGS, RESUME_HEADINGS, index_resume, index_sections
 
 
 _STOPWORDS = {
@@ -35,47 +41,9 @@ def normalize_text(text: str) -> str:
 
 def _extract_section(text: str, section_name: str) -> str:
     """Extract a section by heading name (best-effort, markdown/plaintext)."""
-    lines = (text or "").splitlines()
-
-    def _normalize_heading(line: str) -> str:
-        s = (line or "").strip()
-        # Strip markdown heading markers.
-        if s.startswith("#"):
-            s = s.lstrip("#").strip()
-        # Strip common trailing punctuation.
-        s = s.rstrip(":").rstrip("-").rstrip("–").rstrip("—").strip()
-        return s.lower()
-
-    target = section_name.strip().lower()
-    known_headings = {
-        "summary",
-        "education",
-        "technical skills",
-        "skills",
-        "professional experience",
-        "experience",
-        "projects",
-        "certifications",
-    }
-
-    start = None
-    for i, line in enumerate(lines):
-        if _normalize_heading(line) == target:
-            start = i
-            break
-    if start is None:
-        return ""
-
-    out = [lines[start].strip()]
-    for j in range(start + 1, len(lines)):
-        if _normalize_heading(lines[j]) in known_headings:
-            break
-        out.append(lines[j].rstrip())
-
-    section = "\n".join(out).strip()
     # Best-effort: return whatever we captured, even if sparse.
     # Downstream code can decide whether to use it.
-    return section
+    return index_sections(text or "").section_text(section_name)
 
 
 def extract_profile_section(text: str, section_name: str) -> str:
@@ -114,8 +82,43 @@ def build_profile_pack(master_profile: str, max_chars: int | None = 60000) -> st
     return base + "\n\n---\nPINNED FROM MASTER PROFILE:\n" + pinned
 
 
+# Bump when build_profile_pack (or the section index) changes, so stored packs are rebuilt.
+PROFILE_PACK_VERSION = 1
+
+PROFILE_PACK_SECTIONS = RESUME_HEADINGS
+
+
+def profile_pack_key(max_chars: Optional[int]) -> str:
+    """Identifies a pack configuration (builder version + truncation budget)."""
+    budget = "full" if max_chars is None else str(int(max_chars))
+    return f"v{PROFILE_PACK_VERSION}:{budget}"
+
+
+def text_fingerprint(text: str) -> str:
+    # Stripped, like the master profile a run resolves, so stored packs match pasted text with trailing newlines.
+    return hashlib.sha256((text or "").strip().encode("utf-8")).hexdigest()
+
+
+def build_profile_pack_entry(master_profile: str, max_chars: Optional[int]) -> Dict[str, object]:
+    """A storable profile pack: the pack text plus its per-section index."""
+    pack = build_profile_pack(master_profile, max_chars=max_chars)
+    return {
+        "key": profile_pack_key(max_chars),
+        "source_sha256": text_fingerprint(master_profile),
+        "text": pack,
+        "sections": {name: _extract_section(pack, name) for name in PROFILE_PACK_SECTIONS},
+    }
+
+
+_TOKEN_RE = re.compile(r"[A-Za-z][A-Za-z0-9+.#/-]{1,}")
+
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall((text or "").lower())
+
+
 def extract_keywords(text: str, max_keywords: int = 40) -> List[str]:
-    tokens = re.findall(r"[A-Za-z][A-Za-z0-9+.#/-]{1,}", (text or "").lower())
+    tokens = _tokenize(text)
     tokens = [t for t in tokens if t not in _STOPWORDS and len(t) >= 2]
     counts = Counter(tokens)
     # Prefer longer technical-ish tokens
@@ -129,6 +132,163 @@ def extract_keywords(text: str, max_keywords: int = 40) -> List[str]:
     return out
 
 
+def estimate_tokens(text: str) -> int:
+    """Rough prompt-token estimate (~4 chars per token for English prose)."""
+    return (len(text or "") + 3) // 4
+
+
+# Sections always sent in full (short, and every draft needs them). Of the untitled preamble only the
+# first chunk (name, contact) is pinned: with unrecognized headings the whole profile lands there.
+_PINNED_PROFILE_SECTIONS = frozenset({"summary", "education", "technical skills", "skills", "certifications"})
+
+_BM25_K1 = 1.5
+_BM25_B = 0.75
+
+
+class _Chunk:
+    __slots__ = ("order", "section", "heading", "text", "terms", "length")
+
+    def __init__(self, order: int, section: str, heading: str, text: str) -> None:
+        self.order = order
+        self.section = section
+        self.heading = heading
+        self.text = text
+        tokens = _tokenize(text)
+        self.terms = Counter(tokens)
+        self.length = len(tokens)
+
+
+@lru_cache(maxsize=16)
+def _profile_chunks(profile: str) -> Tuple[_Chunk, ...]:
+    """
+    Split a (normalized) profile into scoring units.
+
+    Sections come from the shared heading index; within a section, blank lines
+    and markdown sub-headings (e.g. one role or project each) start a new chunk.
+    Text before the first heading (name, contact details) is section "".
+    """
+    index = index_sections(profile, PROFILE_HEADINGS)
+    lines = index.lines
+    spans: List[Tuple[str, str, int, int]] = []
+    first = index.boundaries[0][0] if index.boundaries else len(lines)
+    spans.append(("", "", 0, first))
+    for n, (start, norm) in enumerate(index.boundaries):
+        end = index.boundaries[n + 1][0] if n + 1 < len(index.boundaries) else len(lines)
+        spans.append((norm, lines[start].strip(), start + 1, end))
+
+    chunks: List[_Chunk] = []
+    for section, heading, start, end in spans:
+        block: List[str] = []
+        for line in lines[start:end] + [""]:
+            stripped = line.strip()
+            if not stripped or (stripped.startswith("#") and block):
+                if block:
+                    chunks.append(_Chunk(len(chunks), section, heading, "\n".join(block)))
+                block = [stripped] if stripped else []
+                continue
+            block.append(line.rstrip())
+    return tuple(chunks)
+
+
+def _bm25_scores(chunks: Sequence[_Chunk], query: Sequence[str]) -> List[float]:
+    n = len(chunks)
+    if not n:
+        return []
+    avg_len = sum(c.length for c in chunks) / n or 1.0
+    terms = {t.lower() for t in query if t}
+    idf = {}
+    for term in terms:
+        df = sum(1 for c in chunks if term in c.terms)
+        if df:
+            idf[term] = math.log(1 + (n - df + 0.5) / (df + 0.5))
+    scores = []
+    for c in chunks:
+        norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * c.length / avg_len)
+        score = 0.0
+        for term, weight in idf.items():
+            tf = c.terms.get(term, 0)
+            if tf:
+                score += weight * tf * (_BM25_K1 + 1) / (tf + norm)
+        scores.append(score)
+    return scores
+
+
+def build_relevant_profile_pack(
+    master_profile: str,
+    jd_keywords: Sequence[str],
+    token_budget: int,
+    max_chars: Optional[int] = None,
+) -> Tuple[str, Dict[str, object]]:
+    """JD-aware profile pack: the most relevant chunks (BM25 vs JD keywords) under a token budget.
+
+    The first preamble chunk (name, contact) and the pinned sections (Summary,
+    Education, Skills, Certifications) are always included, and every other
+    section keeps at least its best chunk so drafts never lose a required
+    section; both may push the pack past the budget (stats["over_budget"]).
+    max_chars is a hard cap on top (compact_text), for when that forced
+    content alone is too large. Selected chunks keep profile order.
+    """
+    profile = normalize_text(master_profile)
+    chunks = _profile_chunks(profile)
+    stats: Dict[str, object] = {
+        "strategy": "bm25",
+        "token_budget": token_budget,
+        "chunks_total": len(chunks),
+        "source_tokens_est": estimate_tokens(profile),
+    }
+    if estimate_tokens(profile) <= token_budget:
+        stats.update(chunks_selected=len(chunks), pack_tokens_est=estimate_tokens(profile))
+        return profile, stats
+
+    scores = _bm25_scores(chunks, jd_keywords)
+    selected: Dict[int, _Chunk] = {}
+    headings = {c.heading for c in chunks if c.heading}
+    used = sum(estimate_tokens(h) + 1 for h in headings)
+
+    def take(chunk: _Chunk, force: bool = False) -> None:
+        nonlocal used
+        cost = estimate_tokens(chunk.text) + 1
+        if chunk.order in selected or (not force and used + cost > token_budget):
+            return
+        selected[chunk.order] = chunk
+        used += cost
+
+    if chunks and chunks[0].section == "":
+        take(chunks[0], force=True)
+    for chunk in chunks:
+        if chunk.section in _PINNED_PROFILE_SECTIONS:
+            take(chunk, force=True)
+    by_score = sorted(chunks, key=lambda c: (-scores[c.order], c.order))
+    covered = {c.section for c in selected.values()}
+    for chunk in by_score:
+        if chunk.section not in covered:
+            take(chunk, force=True)
+            covered.add(chunk.section)
+    for chunk in by_score:
+        take(chunk)
+
+    parts: List[str] = []
+    current = None
+    for chunk in sorted(selected.values(), key=lambda c: c.order):
+        if chunk.heading != current:
+            if chunk.heading:
+                parts.append(chunk.heading)
+            current = chunk.heading
+        parts.append(chunk.text)
+        parts.append("")
+    pack = "\n".join(parts).strip()
+    truncated = max_chars is not None and len(pack) > max_chars
+    if truncated:
+        pack = compact_text(pack, max_chars)
+    stats.update(
+        chunks_selected=len(selected),
+        pack_tokens_est=estimate_tokens(pack),
+        over_budget=used > token_budget,
+        truncated=truncated,
+    )
+    return pack, stats
+
+
 def build_jd_pack(job_description: str, max_chars: int = 3500) -> Dict[str, object]:
     jd_compact = compact_text(job_description, max_chars=max_chars)
     keywords = extract_keywords(jd_compact, max_keywords=40)
@@ -140,7 +300,10 @@ def build_jd_pack(job_description: str, max_chars: int = 3500) -> Dict[str, obje
 
 def basic_resume_heuristics(resume_markdown: str, jd_keywords: List[str]) -> Dict[str, object]:
     text = (resume_markdown or "").lower()
-    hits = [kw for kw in jd_keywords if kw.lower() in text]
+    # Compiled once per keyword list, so every draft scored against the same JD reuses it.
+    # Whole-word matches: "ai" no longer counts inside "maintain".
+    matched = keyword_matcher(jd_keywords).match(text)
+    hits = matched["hits"]
     hit_rate = (len(hits) / max(1, len(jd_keywords)))
 
     required_headings = [
@@ -151,13 +314,16 @@ def basic_resume_heuristics(resume_markdown: str, jd_keywords: List[str]) -> Dic
         "projects",
         "certifications",
     ]
-    headings_present = {h: (h in text) for h in required_headings}
+    # Heading lines come from the shared index; only headings not found there need a substring scan.
+    index = index_resume(resume_markdown)
+    headings_present = {h: (index.has_heading(h) or h in text) for h in required_headings}
     completeness = sum(1 for v in headings_present.values() if v) / len(required_headings)
 
     length_chars = len(resume_markdown or "")
 
     return {
         "keyword_hits": hits,
+        "keyword_counts": {kw: matched["counts"][kw] for kw in hits},
         "keyword_hit_rate": round(hit_rate, 3),
         "headings_present": headings_present,
         "section_completeness": round(completeness, 3),
@@ -6,13 +6,17 @@ can be reused across many resume runs.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
-from .config import PROFILES_DATA_DIR
+from .config import PROFILES_DATA_DIR, RESUME_PROFILE_PACK_MAX_CHARS
+from . import metrics
+from .packs import PROFILE_PACK_VERSION, build_profile_pack_entry, profile_pack_key, text_fingerprint
 
 
 def ensure_profiles_dir() -> None:
@@ -23,23 +27,44 @@ def get_profile_path(profile_id: str) -> str:
     return os.path.join(PROFILES_DATA_DIR, f"{profile_id}.json")
 
 
-def create_profile(profile_id: str, name: str, raw_text: str, compact_text: str) -> Dict[str, Any]:
+def _write_profile(record: Dict[str, Any]) -> None:
     ensure_profiles_dir()
+    path = get_profile_path(record["id"])
+    # Unique per process and thread: profile writes run concurrently in worker threads.
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(record, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+# Pack configurations built up front: the full profile and the default truncated run budget.
+_DEFAULT_PACK_BUDGETS = (None, RESUME_PROFILE_PACK_MAX_CHARS)
+
 
+def _build_packs(raw_text: str, budgets: Iterable[Optional[int]]) -> Dict[str, Dict[str, Any]]:
+    return {profile_pack_key(b): build_profile_pack_entry(raw_text, b) for b in budgets}
+
+
+@metrics.storage_seconds.labels("profiles", "write").time()
+def create_profile(profile_id: str, name: str, raw_text: str, compact_text: Optional[str] = None) -> Dict[str, Any]:
+    """Store a profile with its default packs; compact_text defaults to the run-budget pack."""
+    packs = _build_packs(raw_text, _DEFAULT_PACK_BUDGETS)
+    if compact_text is None:
+        compact_text = packs[profile_pack_key(RESUME_PROFILE_PACK_MAX_CHARS)]["text"]
     record: Dict[str, Any] = {
         "id": profile_id,
         "created_at": datetime.utcnow().isoformat(),
         "name": (name or "Master Profile").strip() or "Master Profile",
         "raw_text": raw_text,
         "compact_text": compact_text,
+        "packs": packs,
     }
 
-    with open(get_profile_path(profile_id), "w") as f:
-        json.dump(record, f, indent=2)
-
+    _write_profile(record)
     return record
 
 
+@metrics.storage_seconds.labels("profiles", "read").time()
 def get_profile(profile_id: str) -> Optional[Dict[str, Any]]:
     path = get_profile_path(profile_id)
     if not os.path.exists(path):
@@ -48,6 +73,66 @@ def get_profile(profile_id: str) -> Optional[Dict[str, Any]]:
         return json.load(f)
 
 
+# Per-profile locks so concurrent readers of a stale pack rebuild and persist it once.
+_pack_locks: Dict[str, threading.Lock] = {}
+_pack_locks_guard = threading.Lock()
+
+
+def _pack_lock(profile_id: str) -> threading.Lock:
+    with _pack_locks_guard:
+        lock = _pack_locks.get(profile_id)
+        if lock is None:
+            lock = _pack_locks[profile_id] = threading.Lock()
+        return lock
+
+
+def _current_pack(record: Dict[str, Any], key: str) -> Optional[Dict[str, Any]]:
+    raw_text = record.get("raw_text") or record.get("compact_text") or ""
+    entry = (record.get("packs") or {}).get(key)
+    if entry and entry.get("source_sha256") == text_fingerprint(raw_text):
+        return entry
+    return None
+
+
+@metrics.storage_seconds.labels("profiles", "read_pack").time()
+def get_profile_pack(profile_id: str, max_chars: Optional[int]) -> Optional[Dict[str, Any]]:
+    """
+    Stored profile pack for a pack configuration, built and persisted on first use.
+
+    Packs from an older PROFILE_PACK_VERSION (or built from different text) are
+    rebuilt lazily. Returns None if the profile does not exist.
+    """
+    key = profile_pack_key(max_chars)
+    record = get_profile(profile_id)
+    if record is None:
+        return None
+    entry = _current_pack(record, key)
+    if entry is not None:
+        return entry
+
+    with _pack_lock(profile_id):
+        # Another reader may have rebuilt it while we waited.
+        record = get_profile(profile_id)
+        if record is None:
+            return None
+        entry = _current_pack(record, key)
+        if entry is not None:
+            return entry
+        raw_text = record.get("raw_text") or record.get("compact_text") or ""
+        entry = build_profile_pack_entry(raw_text, max_chars)
+        version_prefix = f"v{PROFILE_PACK_VERSION}:"
+        record["packs"] = {k: v for k, v in (record.get("packs") or {}).items() if k.startswith(version_prefix)}
+        record["packs"][key] = entry
+        _write_profile(record)
+        return entry
+
+
+def public_profile(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Profile view for API responses (stored packs are an internal cache)."""
+    return {k: v for k, v in record.items() if k != "packs"}
+
+
+@metrics.storage_seconds.labels("profiles", "list").time()
 def list_profiles() -> List[Dict[str, Any]]:
     ensure_profiles_dir()
 
@@ -67,3 +152,21 @@ def list_profiles() -> List[Dict[str, Any]]:
 
     items.sort(key=lambda x: x.get("created_at", ""), reverse=True)
     return items
+
+
+# Async API: run the blocking file I/O above in a worker thread.
+
+async def acreate_profile(profile_id: str, name: str, raw_text: str, compact_text: Optional[str] = None) -> Dict[str, Any]:
+    return await asyncio.to_thread(create_profile, profile_id, name, raw_text, compact_text)
+
+
+async def aget_profile(profile_id: str) -> Optional[Dict[str, Any]]:
+    return await asyncio.to_thread(get_profile, profile_id)
+
+
+async def aget_profile_pack(profile_id: str, max_chars: Optional[int]) -> Optional[Dict[str, Any]]:
+    return await asyncio.to_thread(get_profile_pack, profile_id, max_chars)
+
+
+async def alist_profiles() -> List[Dict[str, Any]]:
+    return await asyncio.to_thread(list_profiles)
@@ -0,0 +1,148 @@
+"""Concurrency and rate limiting for upstream model calls.
+
+Every OpenRouter request takes a slot from a per-model and a global FIFO
+semaphore, plus a token from the matching token buckets, so bursts queue up
+in arrival order instead of turning into 429s.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple
+
+from .config import (
+    OPENROUTER_GLOBAL_CONCURRENCY,
+    OPENROUTER_GLOBAL_RPS,
+    OPENROUTER_MODEL_CONCURRENCY,
+    OPENROUTER_MODEL_LIMITS,
+    OPENROUTER_MODEL_RPS,
+    OPENROUTER_RATE_BURST,
+)
+
+
+class FairSemaphore:
+    """Semaphore that wakes waiters strictly in arrival order (no barging)."""
+
+    def __init__(self, value: int) -> None:
+        self._value = max(1, value)
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        if self._value > 0 and not self._waiters:
+            self._value -= 1
+            return
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # Slot was handed to us just as we were cancelled; pass it on.
+                self.release()
+            else:
+                try:
+                    self._waiters.remove(fut)
+                except ValueError:
+                    # release() already popped (and skipped) our cancelled future.
+                    pass
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                return
+        self._value += 1
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens/second, holding at most `capacity`."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        # asyncio.Lock hands over in FIFO order, so callers are served fairly.
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def _parse_model_limits(value: str) -> Dict[str, Tuple[int, Optional[float]]]:
+    """Parse "model=concurrency[/rps],..." overrides."""
+    limits: Dict[str, Tuple[int, Optional[float]]] = {}
+    for item in (value or "").split(","):
+        if "=" not in item:
+            continue
+        model, spec = item.rsplit("=", 1)
+        concurrency, _, rps = spec.partition("/")
+        try:
+            limits[model.strip()] = (int(concurrency), float(rps) if rps else None)
+        except ValueError:
+            print(f"Ignoring invalid OPENROUTER_MODEL_LIMITS entry: {item!r}")
+    return limits
+
+
+class ModelLimiter:
+    """Per-model and global limits, created lazily per model."""
+
+    def __init__(self) -> None:
+        self._overrides = _parse_model_limits(OPENROUTER_MODEL_LIMITS)
+        self._global_sem = FairSemaphore(OPENROUTER_GLOBAL_CONCURRENCY)
+        self._global_bucket = TokenBucket(OPENROUTER_GLOBAL_RPS, OPENROUTER_RATE_BURST)
+        self._model_sems: Dict[str, FairSemaphore] = {}
+        self._model_buckets: Dict[str, TokenBucket] = {}
+
+    def _for_model(self, model: str) -> Tuple[FairSemaphore, TokenBucket]:
+        if model not in self._model_sems:
+            concurrency, rps = self._overrides.get(model, (OPENROUTER_MODEL_CONCURRENCY, None))
+            self._model_sems[model] = FairSemaphore(concurrency)
+            self._model_buckets[model] = TokenBucket(
+                OPENROUTER_MODEL_RPS if rps is None else rps, OPENROUTER_RATE_BURST
+            )
+        return self._model_sems[model], self._model_buckets[model]
+
+    def queued(self, model: Optional[str] = None) -> int:
+        if model is None:
+            return self._global_sem.waiting() + sum(s.waiting() for s in self._model_sems.values())
+        sem = self._model_sems.get(model)
+        return sem.waiting() if sem is not None else 0
+
+    @asynccontextmanager
+    async def slot(self, model: str) -> AsyncIterator[None]:
+        """Hold a per-model and a global slot for the duration of one request."""
+        model_sem, model_bucket = self._for_model(model)
+        # Model limits first, so a saturated model does not sit on global slots.
+        await model_sem.acquire()
+        try:
+            await model_bucket.acquire()
+            await self._global_sem.acquire()
+            try:
+                await self._global_bucket.acquire()
+                yield
+            finally:
+                self._global_sem.release()
+        finally:
+            model_sem.release()
+
+
+limiter = ModelLimiter()
@@ -1,13 +1,21 @@
 """Resume-focused council flow."""
 
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, Tuple, Optional, Callable, Awaitable
+import os
 import re
-import base64
-from io import BytesIO
-from docx import Document
-from docx.shared import Pt
-
-from .openrouter import query_models_parallel, query_model
+from collections import OrderedDict
+from string import Template
+
+from .openrouter import query_models_parallel, query_models_quorum, query_model, query_model_hedged
+from .retry import RetryPolicy
+from .circuit import breakers
+from .llm_cache import begin_run_stats, get_cache
+from .usage import begin_run_usage, staged
+from . import tracing
+from .sections import RESUME_HEADINGS, index_resume
+from . import artifact_storage
+from . import docx_render
+from . import metrics
 from .config import (
     RESUME_DRAFT_MODELS,
     RESUME_RANKING_MODELS,
@@ -20,21 +28,109 @@ from .config import (
     RESUME_USE_PEER_RANKING,
     RESUME_PROFILE_PACK_MAX_CHARS,
     RESUME_SEND_FULL_PROFILE,
+    RESUME_PROFILE_PACK_STRATEGY,
+    RESUME_PROFILE_PACK_TOKEN_BUDGET,
     RESUME_STYLE_GUIDE,
     RESUME_STYLE_GUIDE_PATH,
+    RESUME_DRAFT_QUORUM,
+    RESUME_DRAFT_GRACE_SECONDS,
+    RESUME_DRAFT_DETACH_STRAGGLERS,
+    RESUME_DRAFT_RETRY_ATTEMPTS,
+    RESUME_DRAFT_RETRY_DEADLINE,
+    RESUME_JUDGE_RETRY_ATTEMPTS,
+    RESUME_JUDGE_RETRY_DEADLINE,
+    RESUME_POLISH_RETRY_ATTEMPTS,
+    RESUME_POLISH_RETRY_DEADLINE,
+    RESUME_HEDGE_ENABLED,
+    RESUME_HEDGE_PERCENTILE,
+    RESUME_HEDGE_MIN_SAMPLES,
+    RESUME_HEDGE_DEFAULT_DELAY,
+    RESUME_JUDGE_HEDGE_MODEL,
+    RESUME_POLISH_HEDGE_MODEL,
 )
 from .council import parse_ranking_from_text, calculate_aggregate_rankings
-from .packs import build_profile_pack, build_jd_pack, basic_resume_heuristics, extract_profile_section
+from .packs import build_profile_pack, build_relevant_profile_pack, build_jd_pack, basic_resume_heuristics, extract_profile_section, profile_pack_key, text_fingerprint
+
+
+# Progress hook for streaming clients: awaited with (event_name, data).
+EventCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+async def _emit(on_event: Optional[EventCallback], event: str, data: Dict[str, Any]) -> None:
+    if on_event is not None:
+        await on_event(event, data)
+
+
+# Per-stage retry budgets: drafts are redundant across models, the judge/polish calls are not.
+DRAFT_RETRY = RetryPolicy(max_attempts=RESUME_DRAFT_RETRY_ATTEMPTS, deadline=RESUME_DRAFT_RETRY_DEADLINE)
+JUDGE_RETRY = RetryPolicy(max_attempts=RESUME_JUDGE_RETRY_ATTEMPTS, deadline=RESUME_JUDGE_RETRY_DEADLINE)
+POLISH_RETRY = RetryPolicy(max_attempts=RESUME_POLISH_RETRY_ATTEMPTS, deadline=RESUME_POLISH_RETRY_DEADLINE)
+
+
+async def _query_single(
+    model: str,
+    messages: List[Dict[str, str]],
+    hedge_model: str,
+    timeout: float,
+    max_tokens: int,
+    temperature: float,
+    retry: RetryPolicy,
+    on_token: Optional[Callable[[str], Awaitable[None]]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Single-point model call (judge/polish), hedged when RESUME_HEDGE_ENABLED.
+
+    There is no other model to fall back on inside the stage, so an open breaker
+    only reroutes the call to the hedge model when one is configured; otherwise
+    the primary is still called (and, when half-open, serves as the probe).
+    """
+    if not breakers.allow(model) and hedge_model and hedge_model != model:
+        model, hedge_model = hedge_model, ""
+    if RESUME_HEDGE_ENABLED:
+        # Two racing streams cannot share one token feed, so hedged calls do not stream.
+        return await query_model_hedged(
+            model,
+            messages,
+            hedge_model=hedge_model or None,
+            percentile=RESUME_HEDGE_PERCENTILE,
+            min_samples=RESUME_HEDGE_MIN_SAMPLES,
+            default_delay=RESUME_HEDGE_DEFAULT_DELAY,
+            timeout=timeout,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            retry=retry,
+        )
+    response = await query_model(
+        model,
+        messages,
+        timeout=timeout,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        retry=retry,
+        stream=on_token is not None,
+        on_token=on_token,
+    )
+    return dict(response, model=model) if response is not None else None
+
+
+_REQUIRED_SECTIONS = list(RESUME_HEADINGS)
 
 
-_REQUIRED_SECTIONS = [
-    "Summary",
-    "Education",
-    "Technical Skills",
-    "Professional Experience",
-    "Projects",
-    "Certifications",
-]
+# Style block cache: (source key, block). Keyed by the guide file's mtime/size so edits are picked up.
+_style_block_cache: Tuple[Optional[Tuple[object, ...]], str] = (None, "")
+
+
+def _style_guide_source_key() -> Tuple[object, ...]:
+    if isinstance(RESUME_STYLE_GUIDE, str) and RESUME_STYLE_GUIDE.strip():
+        return ("inline",)
+    path = (RESUME_STYLE_GUIDE_PATH or "").strip()
+    if not path:
+        return ("none",)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return ("missing", path)
+    return ("file", path, st.st_mtime_ns, st.st_size)
 
 
 def _load_style_guide_text() -> str:
@@ -69,36 +165,23 @@ Truth/metrics guardrails:
 
 
 def _resume_style_block() -> str:
+    """Default guide plus the custom strategy doc; only re-read when the file changes."""
+    global _style_block_cache
+    key = _style_guide_source_key()
+    cached_key, block = _style_block_cache
+    if key == cached_key:
+        return block
     user_guide = _load_style_guide_text()
     if user_guide:
-        return _default_resume_style_guide() + "\n\n---\nCUSTOM STRATEGY DOC (authoritative):\n" + user_guide
-    return _default_resume_style_guide()
-
-
-def _normalize_heading(line: str) -> str:
-    s = (line or "").strip()
-    if s.startswith("#"):
-        s = s.lstrip("#").strip()
-    s = s.rstrip(":").rstrip("-").rstrip("–").rstrip("—").strip()
-    return s.lower()
+        block = _default_resume_style_guide() + "\n\n---\nCUSTOM STRATEGY DOC (authoritative):\n" + user_guide
+    else:
+        block = _default_resume_style_guide()
+    _style_block_cache = (key, block)
+    return block
 
 
 def _split_resume_sections(markdown_text: str) -> Dict[str, List[str]]:
-    lines = (markdown_text or "").replace("\r\n", "\n").replace("\r", "\n").split("\n")
-    sections: Dict[str, List[str]] = {}
-
-    current: Optional[str] = None
-    for line in lines:
-        norm = _normalize_heading(line)
-        matched = next((h for h in _REQUIRED_SECTIONS if norm == h.lower()), None)
-        if matched:
-            current = matched
-            sections.setdefault(current, [])
-            continue
-        if current is not None:
-            sections[current].append(line.rstrip())
-
-    return sections
+    return index_resume(markdown_text).split(_REQUIRED_SECTIONS)
 
 
 def _is_effectively_empty(lines: List[str]) -> bool:
@@ -130,6 +213,41 @@ def _coerce_bullets(lines: List[str], max_lines: int = 8) -> List[str]:
     return out
 
 
+def profile_pack_budget() -> Optional[int]:
+    """max_chars for the profile pack sent to models (None = full profile)."""
+    return None if RESUME_SEND_FULL_PROFILE else RESUME_PROFILE_PACK_MAX_CHARS
+
+
+def _pack_entry_matches(entry: Dict[str, Any], master_profile: str, budget: Optional[int]) -> bool:
+    """Whether a stored pack was built for this pack configuration and profile text."""
+    return (
+        entry.get("key") == profile_pack_key(budget)
+        and entry.get("source_sha256") == text_fingerprint(master_profile)
+        and isinstance(entry.get("text"), str)
+    )
+
+
+# Section index of recent profile packs, keyed by pack text; seeded from stored packs when available.
+_pack_sections: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+
+
+def _remember_pack_sections(profile_pack: str, sections: Dict[str, str]) -> None:
+    _pack_sections[profile_pack] = dict(sections)
+    _pack_sections.move_to_end(profile_pack)
+    while len(_pack_sections) > 8:
+        _pack_sections.popitem(last=False)
+
+
+def _pack_section(profile_pack: str, heading: str) -> str:
+    sections = _pack_sections.get(profile_pack)
+    if sections is None:
+        _remember_pack_sections(profile_pack, {})
+        sections = _pack_sections[profile_pack]
+    if heading not in sections:
+        sections[heading] = extract_profile_section(profile_pack, heading)
+    return sections[heading]
+
+
 def _ensure_required_outline(markdown_text: str, profile_pack: str) -> str:
     sections = _split_resume_sections(markdown_text)
 
@@ -143,7 +261,7 @@ def _ensure_required_outline(markdown_text: str, profile_pack: str) -> str:
         if not _is_effectively_empty(sections.get(heading, [])):
             continue
 
-        extracted = (extract_profile_section(profile_pack, heading) or "").strip()
+        extracted = (_pack_section(profile_pack, heading) or "").strip()
         if extracted:
             extracted_lines = extracted.splitlines()
             # drop the heading line itself
@@ -177,14 +295,16 @@ def _ensure_required_outline(markdown_text: str, profile_pack: str) -> str:
 
 
 def _missing_required_sections(markdown_text: str) -> bool:
+    index = index_resume(markdown_text)
+    unindexed = [h for h in _REQUIRED_SECTIONS if not index.has_heading(h)]
+    if not unindexed:
+        return False
     lower = (markdown_text or "").lower()
-    return any(h.lower() not in lower for h in _REQUIRED_SECTIONS)
+    return any(h.lower() not in lower for h in unindexed)
 
 
-def _resume_prompt(profile_pack: str, jd_pack: Dict[str, object], company_details: str) -> str:
-    keywords = ", ".join(jd_pack.get("keywords", []))
-    jd_compact = jd_pack.get("jd_compact", "")
-    return f"""{_resume_style_block()}
+# Prompt templates are parsed once at import; each build is a single substitute() pass.
+_RESUME_PROMPT = Template("""$style
 
 You are a resume writer. Produce a concise resume in strict markdown with these exact sections and order.
 
@@ -208,34 +328,31 @@ Formatting rules:
 - Keep content truthful to MASTER PROFILE.
 
 MASTER PROFILE (truth source):
-{profile_pack}
+$profile_pack
 
 JOB DESCRIPTION (target role):
-{jd_compact}
+$jd_compact
 
 ATS KEYWORDS (prioritize when truthful):
-{keywords}
+$keywords
 
 COMPANY DETAILS (tone/culture hints):
-{company_details}
-
-Return only the resume markdown, nothing else."""
+$company_details
 
+Return only the resume markdown, nothing else.""")
 
-def _peer_ranking_prompt(resume_blocks: List[Tuple[str, str]], jd_pack: Dict[str, object], profile_pack: str) -> str:
-    merged = "\n\n".join([f"{label}:\n{resume}" for label, resume in resume_blocks])
-    return f"""{_resume_style_block()}
+_PEER_RANKING_PROMPT = Template("""$style
 
 You are ranking tailored resumes for a job.
 
 TRUTH SOURCE (Profile Facts Pack):
-{profile_pack}
+$profile_pack
 
 JOB REQUIREMENTS PACK:
-{jd_pack}
+$jd_pack
 
 Resumes (anonymized):
-{merged}
+$merged
 
 Evaluate each resume on:
 - Keyword coverage vs JD
@@ -243,7 +360,81 @@ Evaluate each resume on:
 - Truthfulness to the profile pack (no invented claims)
 - Formatting/clarity
 
-Provide brief feedback per resume. Then give FINAL RANKING as numbered list using only the labels (e.g., "1. Response A")."""
+Provide brief feedback per resume. Then give FINAL RANKING as numbered list using only the labels (e.g., "1. Response A").""")
+
+_STRICT_RANKING_SUFFIX = "\n\nIMPORTANT: End with a section exactly:\nFINAL RANKING:\n1. Response A\n2. Response B\n..."
+
+_JUDGE_PROMPT = Template("""$style
+
+You are judging anonymized resume drafts for a specific job.
+
+TRUTH SOURCE (Profile Facts Pack):
+$profile_pack
+
+JOB REQUIREMENTS PACK:
+$jd_pack
+
+Cheap heuristics (computed by code):
+$heuristics
+
+Resumes:
+$merged
+
+Task:
+1) Score each resume 0-100 on: keyword_coverage, role_relevance, truthfulness, formatting.
+2) Output STRICT JSON with this schema:
+{
+  "scores": [{"label":"Response A","keyword_coverage":0,"role_relevance":0,"truthfulness":0,"formatting":0,"overall":0,"notes":"..."}],
+  "winner": "Response A",
+  "final_ranking": ["Response A","Response B"],
+  "unsupported_claims": ["..."]
+}
+3) After the JSON, include a FINAL RANKING section formatted exactly:
+FINAL RANKING:
+1. Response A
+2. Response B
+""")
+
+_POLISH_PROMPT = Template("""$style
+
+Polish this resume for the job while staying 100% truthful to the profile pack.
+
+PROFILE FACTS PACK:
+$profile_pack
+
+JOB REQUIREMENTS PACK:
+$jd_pack
+
+COMPANY DETAILS:
+$company_details
+
+DRAFT RESUME (markdown):
+$best_resume
+
+Rules:
+- Keep the same required sections: Summary, Education, Technical Skills, Professional Experience, Projects, Certifications
+- Bullet points only under experience/projects.
+- Bold project names.
+- Do NOT invent facts.
+
+Return only the improved resume markdown.""")
+
+
+def _resume_prompt(profile_pack: str, jd_pack: Dict[str, object], company_details: str) -> str:
+    return _RESUME_PROMPT.substitute(
+        style=_resume_style_block(),
+        profile_pack=profile_pack,
+        jd_compact=jd_pack.get("jd_compact", ""),
+        keywords=", ".join(jd_pack.get("keywords", [])),
+        company_details=company_details,
+    )
+
+
+def _peer_ranking_prompt(resume_blocks: List[Tuple[str, str]], jd_pack: Dict[str, object], profile_pack: str) -> str:
+    merged = "\n\n".join([f"{label}:\n{resume}" for label, resume in resume_blocks])
+    return _PEER_RANKING_PROMPT.substitute(
+        style=_resume_style_block(), profile_pack=profile_pack, jd_pack=jd_pack, merged=merged
+    )
 
 
 def _normalize_parsed_ranking(parsed: List[str], label_to_model: Dict[str, str]) -> List[str]:
@@ -277,36 +468,9 @@ def _judge_prompt(
     heuristics: Dict[str, Dict[str, object]],
 ) -> str:
     merged = "\n\n".join([f"{label}:\n{resume}" for label, resume in resume_blocks])
-    return f"""{_resume_style_block()}
-
-You are judging anonymized resume drafts for a specific job.
-
-TRUTH SOURCE (Profile Facts Pack):
-{profile_pack}
-
-JOB REQUIREMENTS PACK:
-{jd_pack}
-
-Cheap heuristics (computed by code):
-{heuristics}
-
-Resumes:
-{merged}
-
-Task:
-1) Score each resume 0-100 on: keyword_coverage, role_relevance, truthfulness, formatting.
-2) Output STRICT JSON with this schema:
-{{
-  "scores": [{{"label":"Response A","keyword_coverage":0,"role_relevance":0,"truthfulness":0,"formatting":0,"overall":0,"notes":"..."}}],
-  "winner": "Response A",
-  "final_ranking": ["Response A","Response B"],
-  "unsupported_claims": ["..."]
-}}
-3) After the JSON, include a FINAL RANKING section formatted exactly:
-FINAL RANKING:
-1. Response A
-2. Response B
-"""
+    return _JUDGE_PROMPT.substitute(
+        style=_resume_style_block(), profile_pack=profile_pack, jd_pack=jd_pack, heuristics=heuristics, merged=merged
+    )
 
 
 def _chairman_prompt(user_query: str, stage1_results: List[Dict[str, Any]], stage2_results: List[Dict[str, Any]]) -> str:
@@ -333,57 +497,115 @@ Produce a final, polished resume in markdown that:
 Return the resume markdown only."""
 
 
-async def stage1_generate_resumes(profile_pack: str, jd_pack: Dict[str, object], company_details: str) -> List[Dict[str, Any]]:
+def _prepare_draft(model: str, response: Optional[Dict[str, Any]], profile_pack: str) -> Optional[Dict[str, Any]]:
+    content = ((response or {}).get("content", "") or "").strip()
+    if not content:
+        return None
+    # Normalize to the required outline so downstream ranking + DOCX is stable.
+    content = _ensure_required_outline(content, profile_pack)
+    return {
+        "model": model,
+        # Keep API consistent with existing UI components (Stage1/Stage3 expect 'response')
+        "response": content
+    }
+
+
+@staged("stage1")
+@tracing.traced("stage1_generate_resumes")
+async def stage1_generate_resumes(
+    profile_pack: str,
+    jd_pack: Dict[str, object],
+    company_details: str,
+    on_event: Optional[EventCallback] = None,
+    on_draft: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
     messages = [{"role": "user", "content": _resume_prompt(profile_pack, jd_pack, company_details)}]
-    responses = await query_models_parallel(
-        RESUME_DRAFT_MODELS,
+    drafts: Dict[str, Dict[str, Any]] = {}
+
+    async def _on_start(model: str) -> None:
+        await _emit(on_event, "draft_started", {"model": model})
+
+    async def _on_token(model: str, delta: str) -> None:
+        await _emit(on_event, "token", {"stage": "stage1", "model": model, "delta": delta})
+
+    async def _on_complete(model: str, response: Optional[Dict[str, Any]]) -> None:
+        # Normalize each draft as soon as it lands rather than after the slowest model.
+        draft = _prepare_draft(model, response, profile_pack)
+        if draft is not None:
+            drafts[model] = draft
+            if on_draft is not None:
+                await on_draft(draft)
+        await _emit(on_event, "draft_done", {"model": model, "ok": draft is not None})
+
+    # Skip models whose breaker is open instead of waiting out their timeout.
+    draft_models, skipped = breakers.filter_models(RESUME_DRAFT_MODELS)
+
+    _, cut_off = await query_models_quorum(
+        draft_models,
         messages,
+        quorum=RESUME_DRAFT_QUORUM,
+        grace_seconds=RESUME_DRAFT_GRACE_SECONDS,
+        detach_stragglers=RESUME_DRAFT_DETACH_STRAGGLERS,
         timeout=90.0,
         max_tokens=RESUME_DRAFT_MAX_TOKENS,
         temperature=0.5,
+        retry=DRAFT_RETRY,
+        on_start=_on_start if on_event is not None else None,
+        on_token=_on_token if on_event is not None else None,
+        on_complete=_on_complete,
     )
-    results = []
-    for model, response in responses.items():
-        if response is None:
-            continue
-        content = (response.get("content", "") or "").strip()
-        if not content:
-            continue
+    results = [drafts[m] for m in draft_models if m in drafts and m not in cut_off]
 
-        # Normalize to the required outline so downstream ranking + DOCX is stable.
-        content = _ensure_required_outline(content, profile_pack)
-        results.append({
-            "model": model,
-            # Keep API consistent with existing UI components (Stage1/Stage3 expect 'response')
-            "response": content
-        })
-    return results
+    stage1_metadata = {
+        "draft_models_skipped_by_breaker": skipped,
+        "draft_quorum": RESUME_DRAFT_QUORUM,
+        "draft_models_cut_off": cut_off,
+        "draft_stragglers_detached": bool(cut_off) and RESUME_DRAFT_DETACH_STRAGGLERS,
+    }
+    return results, stage1_metadata
 
 
-async def stage2_judge_resumes(profile_pack: str, jd_pack: Dict[str, object], stage1_results: List[Dict[str, Any]]):
+def _label_drafts(stage1_results: List[Dict[str, Any]]) -> Tuple[Dict[str, str], List[Tuple[str, str]]]:
     labels = [chr(65 + i) for i in range(len(stage1_results))]
     label_to_model = {f"Response {label}": res["model"] for label, res in zip(labels, stage1_results)}
     resume_blocks = [(f"Response {label}", res["response"]) for label, res in zip(labels, stage1_results)]
+    return label_to_model, resume_blocks
+
+
+@staged("stage2")
+@tracing.traced("stage2_judge_resumes")
+async def stage2_judge_resumes(
+    profile_pack: str,
+    jd_pack: Dict[str, object],
+    stage1_results: List[Dict[str, Any]],
+    draft_heuristics: Optional[Dict[str, Dict[str, object]]] = None,
+):
+    label_to_model, resume_blocks = _label_drafts(stage1_results)
 
+    # Reuse heuristics already computed as each draft arrived where available.
+    draft_heuristics = draft_heuristics or {}
     heuristics = {
-        label: basic_resume_heuristics(resume, jd_pack.get("keywords", []))
+        label: draft_heuristics.get(label_to_model[label])
+        or basic_resume_heuristics(resume, jd_pack.get("keywords", []))
         for (label, resume) in resume_blocks
     }
 
     messages = [{"role": "user", "content": _judge_prompt(resume_blocks, profile_pack, jd_pack, heuristics)}]
-    response = await query_model(
+    response = await _query_single(
         RESUME_JUDGE_MODEL,
         messages,
+        RESUME_JUDGE_HEDGE_MODEL,
         timeout=60.0,
         max_tokens=RESUME_JUDGE_MAX_TOKENS,
         temperature=0.2,
+        retry=JUDGE_RETRY,
     )
 
     full_text = (response or {}).get("content", "")
     parsed = _normalize_parsed_ranking(parse_ranking_from_text(full_text), label_to_model)
     rankings = [
         {
-            "model": RESUME_JUDGE_MODEL,
+            "model": (response or {}).get("model") or RESUME_JUDGE_MODEL,
             "ranking": full_text,
             "parsed_ranking": parsed,
         }
@@ -405,20 +627,26 @@ async def stage2_judge_resumes(profile_pack: str, jd_pack: Dict[str, object], st
     return rankings, metadata
 
 
-async def stage2_peer_rank_resumes(profile_pack: str, jd_pack: Dict[str, object], stage1_results: List[Dict[str, Any]]):
-    labels = [chr(65 + i) for i in range(len(stage1_results))]
-    label_to_model = {f"Response {label}": res["model"] for label, res in zip(labels, stage1_results)}
-    resume_blocks = [(f"Response {label}", res["response"]) for label, res in zip(labels, stage1_results)]
+@staged("stage2")
+@tracing.traced("stage2_peer_rank_resumes")
+async def stage2_peer_rank_resumes(
+    profile_pack: str,
+    jd_pack: Dict[str, object],
+    stage1_results: List[Dict[str, Any]],
+):
+    label_to_model, resume_blocks = _label_drafts(stage1_results)
 
     # Require strict FINAL RANKING format so parsing works.
-    strict_prompt = _peer_ranking_prompt(resume_blocks, jd_pack, profile_pack) + "\n\nIMPORTANT: End with a section exactly:\nFINAL RANKING:\n1. Response A\n2. Response B\n..."
+    strict_prompt = _peer_ranking_prompt(resume_blocks, jd_pack, profile_pack) + _STRICT_RANKING_SUFFIX
     messages = [{"role": "user", "content": strict_prompt}]
+    ranking_models, skipped = breakers.filter_models(RESUME_RANKING_MODELS)
     responses = await query_models_parallel(
-        RESUME_RANKING_MODELS,
+        ranking_models,
         messages,
         timeout=90.0,
         max_tokens=RESUME_JUDGE_MAX_TOKENS,
         temperature=0.2,
+        retry=JUDGE_RETRY,
     )
 
     rankings = []
@@ -436,34 +664,22 @@ async def stage2_peer_rank_resumes(profile_pack: str, jd_pack: Dict[str, object]
         })
 
     aggregate = calculate_aggregate_rankings(rankings, label_to_model)
-    metadata = {"label_to_model": label_to_model, "aggregate_rankings": aggregate}
+    metadata = {
+        "label_to_model": label_to_model,
+        "aggregate_rankings": aggregate,
+        "ranking_models_skipped_by_breaker": skipped,
+    }
     return rankings, metadata
 
 
 def _polish_prompt(profile_pack: str, jd_pack: Dict[str, object], company_details: str, best_resume: str) -> str:
-    return f"""{_resume_style_block()}
-
-Polish this resume for the job while staying 100% truthful to the profile pack.
-
-PROFILE FACTS PACK:
-{profile_pack}
-
-JOB REQUIREMENTS PACK:
-{jd_pack}
-
-COMPANY DETAILS:
-{company_details}
-
-DRAFT RESUME (markdown):
-{best_resume}
-
-Rules:
-- Keep the same required sections: Summary, Education, Technical Skills, Professional Experience, Projects, Certifications
-- Bullet points only under experience/projects.
-- Bold project names.
-- Do NOT invent facts.
-
-Return only the improved resume markdown."""
+    return _POLISH_PROMPT.substitute(
+        style=_resume_style_block(),
+        profile_pack=profile_pack,
+        jd_pack=jd_pack,
+        company_details=company_details,
+        best_resume=best_resume,
+    )
 
 
 def _pick_best_label(stage2_results: List[Dict[str, Any]]) -> Optional[str]:
@@ -475,7 +691,17 @@ def _pick_best_label(stage2_results: List[Dict[str, Any]]) -> Optional[str]:
     return None
 
 
-async def stage3_finalize(profile_pack: str, jd_pack: Dict[str, object], company_details: str, stage1_results: List[Dict[str, Any]], stage2_results: List[Dict[str, Any]], metadata: Dict[str, Any]):
+@staged("stage3")
+@tracing.traced("stage3_finalize")
+async def stage3_finalize(
+    profile_pack: str,
+    jd_pack: Dict[str, object],
+    company_details: str,
+    stage1_results: List[Dict[str, Any]],
+    stage2_results: List[Dict[str, Any]],
+    metadata: Dict[str, Any],
+    on_event: Optional[EventCallback] = None,
+):
     label_to_model = (metadata or {}).get("label_to_model") or {}
     best_model = _best_model_from_metadata(metadata)
     best_label = None
@@ -509,108 +735,143 @@ async def stage3_finalize(profile_pack: str, jd_pack: Dict[str, object], company
     if (not raw_missing) and (not raw_looks_truncated) and score_proxy >= RESUME_POLISH_THRESHOLD:
         return {"model": best_model, "response": best_resume, "notes": "Selected best draft (no premium polish)."}
 
+    async def _on_token(delta: str) -> None:
+        await _emit(on_event, "token", {"stage": "stage3", "model": RESUME_POLISH_MODEL, "delta": delta})
+
     messages = [{"role": "user", "content": _polish_prompt(profile_pack, jd_pack, company_details, best_resume)}]
-    response = await query_model(
+    await _emit(on_event, "polish_started", {"model": RESUME_POLISH_MODEL})
+    response = await _query_single(
         RESUME_POLISH_MODEL,
         messages,
+        RESUME_POLISH_HEDGE_MODEL,
         timeout=90.0,
         max_tokens=RESUME_POLISH_MAX_TOKENS,
         temperature=0.4,
+        retry=POLISH_RETRY,
+        on_token=_on_token if on_event is not None else None,
     )
     polished = ((response or {}).get("content", "") or "").strip()
     if response is None or not polished:
         return {"model": best_model, "response": best_resume, "notes": "Premium polish failed; returning best draft."}
     polished = _ensure_required_outline(polished, profile_pack)
-    return {"model": RESUME_POLISH_MODEL, "response": polished, "notes": "Premium polish applied."}
+    notes = "Premium polish applied (hedged backup won)." if response.get("hedged") else "Premium polish applied."
+    return {"model": response.get("model") or RESUME_POLISH_MODEL, "response": polished, "notes": notes}
 
 
-def _markdown_to_docx_bytes(markdown_text: str) -> str:
-    doc = Document()
-
-    # Set base font to Times New Roman 10
-    style = doc.styles["Normal"]
-    font = style.font
-    font.name = "Times New Roman"
-    font.size = Pt(10)
-
-    heading_style = doc.styles["Heading 2"]
-    heading_font = heading_style.font
-    heading_font.name = "Times New Roman"
-    heading_font.size = Pt(10)
-    heading_font.bold = True
-
-    for line in markdown_text.splitlines():
-        stripped = line.strip()
-        if not stripped:
-            doc.add_paragraph("")
-            continue
-
-        # Heading detection (e.g., "Summary" or "Summary:")
-        if stripped.endswith(":") or stripped in {
-            "Summary", "Education", "Technical Skills", "Professional Experience", "Projects", "Certifications"
-        }:
-            doc.add_paragraph(stripped.rstrip(":"), style=heading_style)
-            continue
-
-        # Bullet lines
-        if stripped.startswith("- "):
-            content = stripped[2:]
-            para = doc.add_paragraph(style="List Bullet")
-            # If bolded project name pattern **Name** rest
-            if content.startswith("**") and "**" in content[2:]:
-                closing = content.find("**", 2)
-                name = content[2:closing]
-                rest = content[closing+2:].lstrip()
-                run_name = para.add_run(name)
-                run_name.bold = True
-                if rest:
-                    para.add_run(f" - {rest}")
-            else:
-                para.add_run(content)
-            continue
-
-        # Default paragraph
-        doc.add_paragraph(stripped)
+async def _run_draft_and_rank_stages(
+    profile_pack: str,
+    jd_pack: Dict[str, object],
+    company_details: str,
+    effective_peer_ranking: bool,
+    on_event: Optional[EventCallback],
+):
+    """
+    Stage 1 then Stage 2. Per-draft work (outline normalization, and the judge's
+    heuristics) runs as each draft lands, overlapping the slower models, so only
+    the ranking call itself is left after the last draft.
+    """
+    keywords = jd_pack.get("keywords", [])
+    draft_heuristics: Dict[str, Dict[str, object]] = {}
+
+    async def _on_draft(draft: Dict[str, Any]) -> None:
+        draft_heuristics[draft["model"]] = basic_resume_heuristics(draft["response"], keywords)
+
+    stage1_results, stage1_metadata = await stage1_generate_resumes(
+        profile_pack,
+        jd_pack,
+        company_details,
+        on_event=on_event,
+        on_draft=None if effective_peer_ranking else _on_draft,
+    )
+    await _emit(on_event, "stage1_done", {"stage1": stage1_results, **stage1_metadata})
+    if not stage1_results:
+        return stage1_results, stage1_metadata, [], {}
 
-    buf = BytesIO()
-    doc.save(buf)
-    return base64.b64encode(buf.getvalue()).decode("utf-8")
+    await _emit(on_event, "stage_started", {"stage": "stage2", "peer_ranking": effective_peer_ranking})
+    if effective_peer_ranking:
+        stage2_results, metadata = await stage2_peer_rank_resumes(profile_pack, jd_pack, stage1_results)
+    else:
+        stage2_results, metadata = await stage2_judge_resumes(
+            profile_pack, jd_pack, stage1_results, draft_heuristics=draft_heuristics
+        )
+    return stage1_results, stage1_metadata, stage2_results, metadata
 
 
+@metrics.council_runs_in_flight.track_inprogress()
+@metrics.council_run_seconds.time()
+@tracing.traced("resume_council_run", root=True)
 async def run_resume_council(
     master_profile: str,
     job_description: str,
     company_details: str,
     use_peer_ranking: Optional[bool] = None,
+    on_event: Optional[EventCallback] = None,
+    profile_pack_entry: Optional[Dict[str, Any]] = None,
 ) -> Tuple[List, List, Dict, Dict, Dict]:
-    profile_pack = build_profile_pack(
-        master_profile,
-        max_chars=None if RESUME_SEND_FULL_PROFILE else RESUME_PROFILE_PACK_MAX_CHARS,
-    )
+    """
+    Run the resume council for one job description.
+
+    profile_pack_entry is an optional pre-built pack (see
+    profile_storage.get_profile_pack); it is used only if it matches the
+    current pack configuration and master_profile text.
+    """
+    cache_stats = begin_run_stats()
+    run_usage = begin_run_usage()
     jd_pack = build_jd_pack(job_description)
+    budget = profile_pack_budget()
+    entry = profile_pack_entry or {}
+    pack_selection: Dict[str, object] = {"strategy": "truncate"}
+    precomputed = RESUME_PROFILE_PACK_STRATEGY != "bm25" and _pack_entry_matches(entry, master_profile, budget)
+    if RESUME_PROFILE_PACK_STRATEGY == "bm25":
+        profile_pack, pack_selection = build_relevant_profile_pack(
+            master_profile, jd_pack.get("keywords", []), RESUME_PROFILE_PACK_TOKEN_BUDGET, max_chars=budget
+        )
+    elif precomputed:
+        profile_pack = entry["text"]
+        _remember_pack_sections(profile_pack, entry.get("sections") or {})
+    else:
+        profile_pack = build_profile_pack(master_profile, max_chars=budget)
+    effective_peer_ranking = RESUME_USE_PEER_RANKING if use_peer_ranking is None else bool(use_peer_ranking)
 
-    stage1_results = await stage1_generate_resumes(profile_pack, jd_pack, company_details)
+    await _emit(on_event, "stage_started", {"stage": "stage1", "models": list(RESUME_DRAFT_MODELS)})
+    stage1_results, stage1_metadata, stage2_results, metadata = await _run_draft_and_rank_stages(
+        profile_pack, jd_pack, company_details, effective_peer_ranking, on_event
+    )
     if not stage1_results:
-        return [], [], {"model": "error", "response": "No models responded."}, {}, {"base64": "", "filename": "resume.docx"}
+        return [], [], {"model": "error", "response": "No models responded."}, {}, {"sha256": None, "filename": "resume.docx"}
+    await _emit(on_event, "ranking_done", {"stage2": stage2_results, "metadata": metadata})
 
-    effective_peer_ranking = RESUME_USE_PEER_RANKING if use_peer_ranking is None else bool(use_peer_ranking)
-
-    if effective_peer_ranking:
-        stage2_results, metadata = await stage2_peer_rank_resumes(profile_pack, jd_pack, stage1_results)
-    else:
-        stage2_results, metadata = await stage2_judge_resumes(profile_pack, jd_pack, stage1_results)
-    stage3_result = await stage3_finalize(profile_pack, jd_pack, company_details, stage1_results, stage2_results, metadata)
+    await _emit(on_event, "stage_started", {"stage": "stage3"})
+    stage3_result = await stage3_finalize(
+        profile_pack, jd_pack, company_details, stage1_results, stage2_results, metadata, on_event=on_event
+    )
+    await _emit(on_event, "final_done", {"stage3": stage3_result})
 
     metadata["profile_pack_chars"] = len(profile_pack)
     metadata["profile_pack_full"] = bool(RESUME_SEND_FULL_PROFILE)
+    metadata["profile_pack_precomputed"] = precomputed
+    metadata["profile_pack_selection"] = pack_selection
     metadata["jd_pack"] = jd_pack
     metadata["peer_ranking_used"] = effective_peer_ranking
     metadata["draft_models_requested"] = list(RESUME_DRAFT_MODELS)
     metadata["draft_models_returned"] = [r.get("model") for r in (stage1_results or [])]
     returned_set = {m for m in metadata["draft_models_returned"] if isinstance(m, str)}
     metadata["draft_models_missing"] = [m for m in RESUME_DRAFT_MODELS if m not in returned_set]
-
-    docx_base64 = _markdown_to_docx_bytes(stage3_result.get("response", ""))
-    docx_info = {"base64": docx_base64, "filename": "tailored_resume.docx"}
+    metadata.update(stage1_metadata)
+    metadata["response_cache"] = dict(cache_stats, enabled=get_cache() is not None)
+    metadata["usage"] = run_usage.summary()
+    metadata["trace_id"] = tracing.current_trace_id()
+
+    # Stored as a content-addressed file; the run record only keeps the reference.
+    with tracing.span("docx_render") as span:
+        stored = await docx_render.render_and_store(stage3_result.get("response", ""))
+        span.set(cached=stored["cached"], size=stored["size"])
+    metadata["docx_render_cached"] = stored["cached"]
+    docx_info = {
+        "sha256": stored["sha256"],
+        "size": stored["size"],
+        "filename": "tailored_resume.docx",
+        "content_type": artifact_storage.DOCX_CONTENT_TYPE,
+    }
 
     return stage1_results, stage2_results, stage3_result, metadata, docx_info
@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
+import sqlite3
+from contextlib import closing
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from .config import RESUME_DATA_DIR
+from . import metrics
 
 
 def ensure_resume_dir() -> None:
@@ -20,6 +24,86 @@ def get_resume_path(resume_id: str) -> str:
     return os.path.join(RESUME_DATA_DIR, f"{resume_id}.json")
 
 
+def get_index_path() -> str:
+    return os.path.join(RESUME_DATA_DIR, "index.sqlite3")
+
+
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resume_runs (
+    id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    title TEXT NOT NULL,
+    has_stage1 INTEGER NOT NULL,
+    has_stage2 INTEGER NOT NULL,
+    has_stage3 INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resume_runs_created_at ON resume_runs (created_at);
+"""
+
+
+def _summary_from_record(data: Dict[str, Any]) -> Dict[str, Any]:
+    result = data.get("result", {})
+    return {
+        "id": data.get("id"),
+        "created_at": data.get("created_at"),
+        "title": data.get("title", "Resume Run"),
+        "has_stage1": bool(result.get("stage1")),
+        "has_stage2": bool(result.get("stage2")),
+        "has_stage3": bool(result.get("stage3")),
+    }
+
+
+def _upsert_index(conn: sqlite3.Connection, item: Dict[str, Any]) -> None:
+    conn.execute(
+        "INSERT OR REPLACE INTO resume_runs (id, created_at, title, has_stage1, has_stage2, has_stage3) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            item["id"],
+            item.get("created_at") or "",
+            item.get("title") or "Resume Run",
+            int(item["has_stage1"]),
+            int(item["has_stage2"]),
+            int(item["has_stage3"]),
+        ),
+    )
+
+
+def _open_index() -> sqlite3.Connection:
+    """Open the listing index, backfilling it from JSON records on first use."""
+    ensure_resume_dir()
+    path = get_index_path()
+    is_new = not os.path.exists(path)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_INDEX_SCHEMA)
+    if is_new:
+        _backfill_index(conn)
+    return conn
+
+
+def _backfill_index(conn: sqlite3.Connection) -> None:
+    with conn:
+        for filename in os.listdir(RESUME_DATA_DIR):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(RESUME_DATA_DIR, filename), "r") as f:
+                    item = _summary_from_record(json.load(f))
+            except Exception as e:
+                print(f"Skipping unreadable resume record {filename}: {e}")
+                continue
+            if item["id"]:
+                _upsert_index(conn, item)
+
+
+def rebuild_resume_index() -> None:
+    """Drop and rebuild the listing index from the JSON records on disk."""
+    with closing(_open_index()) as conn:
+        with conn:
+            conn.execute("DELETE FROM resume_runs")
+        _backfill_index(conn)
+
+
 def _safe_title_from_jd(job_description: str) -> str:
     text = (job_description or "").strip().splitlines()[0:3]
     joined = " ".join([t.strip() for t in text if t.strip()])
@@ -31,6 +115,7 @@ def _safe_title_from_jd(job_description: str) -> str:
     return joined
 
 
+@metrics.storage_seconds.labels("resumes", "write").time()
 def create_resume_run(
     resume_id: str,
     job_description: str,
@@ -58,9 +143,14 @@ def create_resume_run(
     with open(get_resume_path(resume_id), "w") as f:
         json.dump(record, f, indent=2)
 
+    with closing(_open_index()) as conn:
+        with conn:
+            _upsert_index(conn, _summary_from_record(record))
+
     return record
 
 
+@metrics.storage_seconds.labels("resumes", "read").time()
 def get_resume_run(resume_id: str) -> Optional[Dict[str, Any]]:
     path = get_resume_path(resume_id)
     if not os.path.exists(path):
@@ -69,30 +159,64 @@ def get_resume_run(resume_id: str) -> Optional[Dict[str, Any]]:
         return json.load(f)
 
 
-def list_resume_runs() -> List[Dict[str, Any]]:
-    ensure_resume_dir()
-    items: List[Dict[str, Any]] = []
-
-    for filename in os.listdir(RESUME_DATA_DIR):
-        if not filename.endswith(".json"):
-            continue
-        path = os.path.join(RESUME_DATA_DIR, filename)
-        with open(path, "r") as f:
-            data = json.load(f)
-            result = data.get("result", {})
-            stage1 = result.get("stage1")
-            stage2 = result.get("stage2")
-            stage3 = result.get("stage3")
-            items.append(
-                {
-                    "id": data.get("id"),
-                    "created_at": data.get("created_at"),
-                    "title": data.get("title", "Resume Run"),
-                    "has_stage1": bool(stage1),
-                    "has_stage2": bool(stage2),
-                    "has_stage3": bool(stage3),
-                }
-            )
-
-    items.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-    return items
+@metrics.storage_seconds.labels("resumes", "list").time()
+def list_resume_runs(limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+    """List run summaries newest first, served from the index rather than the JSON records."""
+    with closing(_open_index()) as conn:
+        rows = conn.execute(
+            "SELECT id, created_at, title, has_stage1, has_stage2, has_stage3 FROM resume_runs "
+            "ORDER BY created_at DESC LIMIT ? OFFSET ?",
+            (-1 if limit is None else limit, max(0, offset)),
+        ).fetchall()
+
+    return [
+        {
+            "id": row["id"],
+            "created_at": row["created_at"],
+            "title": row["title"],
+            "has_stage1": bool(row["has_stage1"]),
+            "has_stage2": bool(row["has_stage2"]),
+            "has_stage3": bool(row["has_stage3"]),
+        }
+        for row in rows
+    ]
+
+
+@metrics.storage_seconds.labels("resumes", "count").time()
+def count_resume_runs() -> int:
+    with closing(_open_index()) as conn:
+        return conn.execute("SELECT COUNT(*) FROM resume_runs").fetchone()[0]
+
+
+# Async API: the same operations with their blocking file/SQLite I/O run in a
+# worker thread, so request handlers never stall the event loop.
+
+async def acreate_resume_run(
+    resume_id: str,
+    job_description: str,
+    master_profile: str,
+    company_details: str,
+    use_peer_ranking: Optional[bool],
+    result_payload: Dict[str, Any],
+) -> Dict[str, Any]:
+    return await asyncio.to_thread(
+        create_resume_run,
+        resume_id,
+        job_description,
+        master_profile,
+        company_details,
+        use_peer_ranking,
+        result_payload,
+    )
+
+
+async def aget_resume_run(resume_id: str) -> Optional[Dict[str, Any]]:
+    return await asyncio.to_thread(get_resume_run, resume_id)
+
+
+async def alist_resume_runs(limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+    return await asyncio.to_thread(list_resume_runs, limit, offset)
+
+
+async def acount_resume_runs() -> int:
+    return await asyncio.to_thread(count_resume_runs)
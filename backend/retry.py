@@ -0,0 +1,114 @@
+"""Retry policies for upstream model calls.
+
+A policy decides which failures are worth another attempt (per HTTP status,
+timeouts, connection errors), how long to back off (exponential with full
+jitter, or the server's Retry-After up to max_retry_after), and caps the whole
+thing with an overall deadline budget so a stage never waits longer than it can afford.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, Mapping, Optional
+
+import httpx
+
+from .config import (
+    OPENROUTER_RETRY_BASE_DELAY,
+    OPENROUTER_RETRY_MAX_ATTEMPTS,
+    OPENROUTER_RETRY_MAX_DELAY,
+    OPENROUTER_RETRY_MAX_RETRY_AFTER,
+    OPENROUTER_RETRY_STATUSES,
+)
+
+
+class StreamError(Exception):
+    """Provider error delivered inside an SSE stream rather than as an HTTP status."""
+
+    def __init__(self, error: object) -> None:
+        super().__init__(f"stream error: {error}")
+        code = error.get("code") if isinstance(error, dict) else None
+        self.status_code = code if isinstance(code, int) else None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = OPENROUTER_RETRY_MAX_ATTEMPTS
+    base_delay: float = OPENROUTER_RETRY_BASE_DELAY
+    max_delay: float = OPENROUTER_RETRY_MAX_DELAY
+    # Retry-After longer than this means "not soon": give up rather than sleep.
+    max_retry_after: float = OPENROUTER_RETRY_MAX_RETRY_AFTER
+    # Overall budget across all attempts and backoffs (seconds); None = the call's own timeout,
+    # so retries fill a call's time slot instead of multiplying it.
+    deadline: Optional[float] = None
+    retry_statuses: FrozenSet[int] = field(default_factory=lambda: frozenset(OPENROUTER_RETRY_STATUSES))
+    retry_on_timeout: bool = True
+    retry_on_connection_error: bool = True
+
+    def budget(self, timeout: float) -> float:
+        """Overall seconds all attempts of a call with this per-attempt timeout may take."""
+        return timeout if self.deadline is None else self.deadline
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given (1-based) failed attempt."""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def should_retry(self, error: BaseException) -> bool:
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in self.retry_statuses
+        if isinstance(error, StreamError):
+            return error.status_code is None or error.status_code in self.retry_statuses
+        if isinstance(error, (httpx.TimeoutException, asyncio.TimeoutError)):
+            return self.retry_on_timeout
+        if isinstance(error, httpx.TransportError):
+            return self.retry_on_connection_error
+        return False
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+DEFAULT_RETRY = RetryPolicy()
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date)."""
+    value = (headers.get("retry-after") or "").strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def retry_delay(
+    policy: RetryPolicy, attempt: int, error: BaseException, remaining: Optional[float] = None
+) -> Optional[float]:
+    """
+    Delay before the next attempt, honouring Retry-After when the server sends one.
+
+    Returns None when the wait the server asks for exceeds policy.max_retry_after
+    or the remaining deadline budget: the caller should give up, not sleep.
+    """
+    delay = policy.backoff(attempt)
+    response = getattr(error, "response", None)
+    if response is not None:
+        retry_after = retry_after_seconds(response.headers)
+        if retry_after is not None:
+            if retry_after > policy.max_retry_after:
+                return None
+            delay = max(delay, retry_after)
+    if remaining is not None and delay >= remaining:
+        return None
+    return delay
@@ -0,0 +1,120 @@
+"""Single-pass heading index for master profiles and resume markdown.
+
+Profiles and drafts are scanned once: every line's normalized heading form is
+recorded, along with the positions of the section boundaries. Section
+extraction, resume splitting and heading checks then read the index instead
+of rescanning the text per section.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+
+RESUME_HEADINGS = (
+    "Summary",
+    "Education",
+    "Technical Skills",
+    "Professional Experience",
+    "Projects",
+    "Certifications",
+)
+
+# Headings that end a section when extracting from a master profile.
+PROFILE_HEADINGS = frozenset(
+    {
+        "summary",
+        "education",
+        "technical skills",
+        "skills",
+        "professional experience",
+        "experience",
+        "projects",
+        "certifications",
+    }
+)
+
+
+def normalize_heading(line: str) -> str:
+    s = (line or "").strip()
+    # Strip markdown heading markers.
+    if s.startswith("#"):
+        s = s.lstrip("#").strip()
+    # Strip common trailing punctuation.
+    s = s.rstrip(":").rstrip("-").rstrip("–").rstrip("—").strip()
+    return s.lower()
+
+
+class SectionIndex:
+    """
+    Heading positions of one text.
+
+    lines: the text's lines (str.splitlines()).
+    first_line: normalized line -> index of its first occurrence.
+    boundaries: [(line index, normalized heading)] for every boundary heading, in order.
+    """
+
+    __slots__ = ("lines", "first_line", "boundaries", "_boundary_lines")
+
+    def __init__(self, text: str, boundary_headings: FrozenSet[str]) -> None:
+        self.lines: List[str] = (text or "").splitlines()
+        self.first_line: Dict[str, int] = {}
+        self.boundaries: List[Tuple[int, str]] = []
+        for i, line in enumerate(self.lines):
+            norm = normalize_heading(line)
+            if norm not in self.first_line:
+                self.first_line[norm] = i
+            if norm in boundary_headings:
+                self.boundaries.append((i, norm))
+        self._boundary_lines = [i for i, _ in self.boundaries]
+
+    def has_heading(self, heading: str) -> bool:
+        return heading.strip().lower() in self.first_line
+
+    def span(self, heading: str) -> Optional[Tuple[int, int]]:
+        """(start, end) line span of the first section titled `heading`, heading line included."""
+        start = self.first_line.get(heading.strip().lower())
+        if start is None:
+            return None
+        pos = bisect_right(self._boundary_lines, start)
+        end = self._boundary_lines[pos] if pos < len(self._boundary_lines) else len(self.lines)
+        return start, end
+
+    def section_text(self, heading: str) -> str:
+        """Section body with its heading line, best-effort (empty if not found)."""
+        span = self.span(heading)
+        if span is None:
+            return ""
+        start, end = span
+        out = [self.lines[start].strip()]
+        out.extend(line.rstrip() for line in self.lines[start + 1 : end])
+        return "\n".join(out).strip()
+
+    def split(self, canonical: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        Group lines under each boundary heading (repeated headings append).
+
+        Keys use the spelling from `canonical`; lines before the first heading are dropped.
+        """
+        names = {name.lower(): name for name in canonical}
+        sections: Dict[str, List[str]] = {}
+        for n, (start, norm) in enumerate(self.boundaries):
+            end = self.boundaries[n + 1][0] if n + 1 < len(self.boundaries) else len(self.lines)
+            name = names.get(norm, norm)
+            sections.setdefault(name, []).extend(line.rstrip() for line in self.lines[start + 1 : end])
+        return sections
+
+
+@lru_cache(maxsize=64)
+def index_sections(text: str, boundary_headings: FrozenSet[str] = PROFILE_HEADINGS) -> SectionIndex:
+    """Shared (cached) index of `text`; treat the result as read-only."""
+    return SectionIndex(text, boundary_headings)
+
+
+RESUME_BOUNDARIES = frozenset(h.lower() for h in RESUME_HEADINGS)
+
+
+def index_resume(markdown_text: str) -> SectionIndex:
+    return index_sections(markdown_text or "", RESUME_BOUNDARIES)
@@ -0,0 +1,63 @@
+"""Single-flight coalescing for identical concurrent async calls.
+
+Callers that ask for the same key while a call is in flight await the same
+upstream task instead of starting a duplicate. The upstream task is only
+cancelled once every waiter has gone away.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class _Call:
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Per-key deduplication of in-flight coroutines."""
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, _Call] = {}
+        self.stats = {"leaders": 0, "shared": 0}
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run fn() once per key among concurrent callers.
+
+        Returns:
+            (result, shared) where shared is True if this caller joined an
+            existing in-flight call rather than starting it.
+        """
+        call = self._calls.get(key)
+        shared = call is not None
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _t, k=key, c=call: self._forget(k, c))
+            self.stats["leaders"] += 1
+        else:
+            self.stats["shared"] += 1
+
+        call.waiters += 1
+        try:
+            # shield: one waiter being cancelled must not cancel the shared task.
+            return await asyncio.shield(call.task), shared
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                # Last interested caller left; stop the upstream request.
+                self._forget(key, call)
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _forget(self, key: str, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
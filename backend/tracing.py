@@ -0,0 +1,305 @@
+"""Lightweight span tracing for the council pipeline (run -> stage -> model call -> attempt).
+
+Spans nest through a ContextVar, so tasks started inside a span (parallel model
+calls, detached drafts) become its children. A trace starts at a root span
+(span(..., root=True)); spans opened outside any trace are no-ops. Finished
+traces are kept in memory for the viewer endpoints and appended as one JSON
+line per span to TRACES_DATA_DIR/traces-YYYYMMDD.jsonl, so no external
+collector is needed. Files past TRACE_RETENTION_DAYS (or beyond TRACES_MAX_MB,
+oldest first) are pruned by the writer thread, at most once per day or per
+tenth of the size budget written.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .config import TRACE_MEMORY_ITEMS, TRACE_RETENTION_DAYS, TRACES_DATA_DIR, TRACES_MAX_MB, TRACING_ENABLED
+
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("trace_span", default=None)
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start", "end", "attributes", "status", "_t0")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]) -> None:
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.time()
+        self.end: Optional[float] = None
+        self.attributes = dict(attributes)
+        self.status = "ok"
+        self._t0 = time.perf_counter()
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def set_status(self, status: str) -> None:
+        self.status = status
+
+    def finish(self) -> None:
+        # Wall-clock start, monotonic duration.
+        self.end = self.start + (time.perf_counter() - self._t0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "end": self.end,
+            "duration_seconds": None if self.end is None else round(self.end - self.start, 6),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    trace_id = None
+    span_id = None
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def set_status(self, status: str) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class TraceStore:
+    """Open traces (spans collected until the root ends) plus the most recent finished traces."""
+
+    def __init__(self, data_dir: str, memory_items: int, retention_days: int, max_bytes: int) -> None:
+        self.data_dir = data_dir
+        self.memory_items = max(1, memory_items)
+        self.retention_days = max(1, retention_days)
+        self.max_bytes = max_bytes
+        self._pruned_day: Optional[str] = None
+        self._written_since_prune = 0
+        self._open: Dict[str, List[Dict[str, Any]]] = {}
+        self._finished: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        # One writer thread keeps appends ordered and off the event loop.
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trace-export")
+
+    def add(self, span: Span) -> None:
+        record = span.to_dict()
+        if span.trace_id in self._open:
+            self._open[span.trace_id].append(record)
+        else:
+            # Straggler finishing after its root (e.g. a detached draft): export on its own.
+            finished = self._finished.get(span.trace_id)
+            if finished is not None:
+                finished.append(record)
+            self._export([record])
+        if span.parent_id is None:
+            spans = self._open.pop(span.trace_id, [record])
+            self._finished[span.trace_id] = spans
+            while len(self._finished) > self.memory_items:
+                self._finished.popitem(last=False)
+            self._export(spans)
+
+    def begin(self, trace_id: str) -> None:
+        self._open[trace_id] = []
+
+    def _export(self, records: List[Dict[str, Any]]) -> None:
+        lines = "".join(json.dumps(r, default=str) + "\n" for r in records)
+        self._writer.submit(self._append, lines)
+
+    def _path(self, day: str) -> str:
+        return os.path.join(self.data_dir, f"traces-{day}.jsonl")
+
+    def _files(self) -> List[str]:
+        """Retained trace file names, newest first."""
+        try:
+            names = os.listdir(self.data_dir)
+        except FileNotFoundError:
+            return []
+        oldest = (datetime.utcnow() - timedelta(days=self.retention_days - 1)).strftime("%Y%m%d")
+        return sorted(
+            (n for n in names if n.startswith("traces-") and n.endswith(".jsonl") and n[7:15] >= oldest),
+            reverse=True,
+        )
+
+    def _prune(self) -> None:
+        """Delete files past the retention window, then the oldest ones until under max_bytes (today's is kept)."""
+        keep = set(self._files())
+        try:
+            names = [n for n in os.listdir(self.data_dir) if n.startswith("traces-") and n.endswith(".jsonl")]
+        except FileNotFoundError:
+            return
+        for name in names:
+            if name not in keep:
+                os.remove(os.path.join(self.data_dir, name))
+        files = sorted(keep, reverse=True)
+        total = sum(os.path.getsize(os.path.join(self.data_dir, n)) for n in files)
+        while total > self.max_bytes and len(files) > 1:
+            name = files.pop()
+            total -= os.path.getsize(os.path.join(self.data_dir, name))
+            os.remove(os.path.join(self.data_dir, name))
+
+    def _append(self, lines: str) -> None:
+        try:
+            day = datetime.utcnow().strftime("%Y%m%d")
+            Path(self.data_dir).mkdir(parents=True, exist_ok=True)
+            if day != self._pruned_day or self._written_since_prune > self.max_bytes // 10:
+                self._pruned_day = day
+                self._written_since_prune = 0
+                try:
+                    self._prune()
+                except OSError as e:
+                    print(f"Trace pruning failed: {e}")
+            self._written_since_prune += len(lines)
+            with open(self._path(day), "a") as f:
+                f.write(lines)
+        except Exception as e:
+            print(f"Trace export failed: {e}")
+
+    def recent(self) -> List[Dict[str, Any]]:
+        """Summaries of in-memory finished traces, newest first."""
+        out = []
+        for trace_id, spans in reversed(self._finished.items()):
+            root = next((s for s in spans if s["parent_id"] is None), None)
+            if root is None:
+                continue
+            out.append({
+                "trace_id": trace_id,
+                "name": root["name"],
+                "start": root["start"],
+                "duration_seconds": root["duration_seconds"],
+                "status": root["status"],
+                "spans": len(spans),
+                "errors": sum(1 for s in spans if s["status"] != "ok"),
+            })
+        return out
+
+    def get(self, trace_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Spans of a trace, from memory or else from the retained JSONL files (newest first)."""
+        spans = self._finished.get(trace_id) or self._open.get(trace_id)
+        if spans:
+            return list(spans)
+        found: List[Dict[str, Any]] = []
+        for name in self._files():
+            try:
+                with open(os.path.join(self.data_dir, name), "r") as f:
+                    for line in f:
+                        if trace_id in line:
+                            record = json.loads(line)
+                            if record.get("trace_id") == trace_id:
+                                found.append(record)
+            except FileNotFoundError:
+                continue  # pruned meanwhile
+            if found:
+                return found
+        return None
+
+    def flush(self) -> None:
+        """Wait until every exported span has been written (called on app shutdown)."""
+        self._writer.submit(lambda: None).result()
+
+
+store = TraceStore(TRACES_DATA_DIR, TRACE_MEMORY_ITEMS, TRACE_RETENTION_DAYS, int(TRACES_MAX_MB * 1024 * 1024))
+
+
+@contextmanager
+def span(name: str, root: bool = False, **attributes: Any) -> Iterator[Any]:
+    """
+    Open a span as a child of the current one.
+
+    root=True starts a new trace; without a current span and without root the
+    span is a no-op, so library calls outside a traced run cost nothing.
+    Exceptions mark the span "error" ("cancelled" for cancellation) and propagate.
+    """
+    parent = _current_span.get()
+    if not TRACING_ENABLED or (parent is None and not root):
+        yield _NOOP
+        return
+    if parent is None or root:
+        trace_id = uuid.uuid4().hex
+        current = Span(name, trace_id, None, attributes)
+        store.begin(trace_id)
+    else:
+        current = Span(name, parent.trace_id, parent.span_id, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except asyncio.CancelledError:
+        current.status = "cancelled"
+        raise
+    except BaseException as e:
+        current.status = "error"
+        current.set(error=f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        _current_span.reset(token)
+        current.finish()
+        store.add(current)
+
+
+def traced(name: str, root: bool = False) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Run the decorated coroutine inside span(name)."""
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name, root=root):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def current_trace_id() -> Optional[str]:
+    current = _current_span.get()
+    return current.trace_id if current is not None else None
+
+
+def critical_path(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Spans the run was actually waiting on, in time order.
+
+    Walks back from the root's end: the child that finished last is critical,
+    then whichever sibling finished last before that child started, and so on;
+    each critical child is expanded the same way. Overlapping work that finished
+    earlier (e.g. faster parallel drafts) is off the path.
+    """
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for s in spans:
+        if s.get("end") is not None:
+            children.setdefault(s.get("parent_id"), []).append(s)
+
+    def walk(current: Dict[str, Any]) -> List[Dict[str, Any]]:
+        path: List[Dict[str, Any]] = []
+        cursor = current["end"]
+        for child in sorted(children.get(current["span_id"], []), key=lambda k: k["end"], reverse=True):
+            if child["end"] <= cursor + 1e-6:
+                path = walk(child) + path
+                cursor = child["start"]
+        entry = {
+            "span_id": current["span_id"],
+            "name": current["name"],
+            "duration_seconds": current.get("duration_seconds"),
+            "attributes": current.get("attributes") or {},
+        }
+        return [entry] + path
+
+    roots = children.get(None) or []
+    return walk(roots[0]) if roots else []
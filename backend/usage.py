@@ -0,0 +1,198 @@
+"""Per-call timing, token usage and cost accounting for council runs.
+
+query_model records one entry per call into the collector installed by
+begin_run_usage(); entries are tagged with the stage set by @staged. The
+summary (per stage, per model, totals) goes into run metadata.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from .config import OPENROUTER_MODEL_PRICES
+
+
+_current_stage: contextvars.ContextVar[str] = contextvars.ContextVar("usage_stage", default="unstaged")
+_run_usage: contextvars.ContextVar[Optional["RunUsage"]] = contextvars.ContextVar("usage_run", default=None)
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+
+def _parse_model_prices(value: str) -> Dict[str, Tuple[float, float]]:
+    """Parse "model=prompt/completion,..." prices in USD per million tokens."""
+    prices: Dict[str, Tuple[float, float]] = {}
+    for item in (value or "").split(","):
+        if "=" not in item:
+            continue
+        model, spec = item.rsplit("=", 1)
+        prompt, _, completion = spec.partition("/")
+        try:
+            prices[model.strip()] = (float(prompt), float(completion or prompt))
+        except ValueError:
+            print(f"Ignoring invalid OPENROUTER_MODEL_PRICES entry: {item!r}")
+    return prices
+
+
+_prices = _parse_model_prices(OPENROUTER_MODEL_PRICES)
+
+
+def call_cost(model: str, usage: Optional[Dict[str, Any]]) -> Tuple[Optional[float], Optional[str]]:
+    """
+    Cost of one call in USD and where it came from.
+
+    OpenRouter reports `usage.cost` when usage accounting is requested; otherwise
+    the cost is derived from OPENROUTER_MODEL_PRICES, or unknown (None, None).
+    """
+    if not usage:
+        return None, None
+    if isinstance(usage.get("cost"), (int, float)):
+        return float(usage["cost"]), "openrouter"
+    price = _prices.get(model)
+    if price is None:
+        return None, None
+    prompt_tokens = int(usage.get("prompt_tokens") or 0)
+    completion_tokens = int(usage.get("completion_tokens") or 0)
+    return (prompt_tokens * price[0] + completion_tokens * price[1]) / 1_000_000, "price_table"
+
+
+def current_stage() -> str:
+    return _current_stage.get()
+
+
+def staged(name: str) -> Callable[[F], F]:
+    """Tag every model call made by the decorated coroutine (and tasks it starts) with a stage."""
+
+    def decorator(fn: F) -> F:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            token = _current_stage.set(name)
+            started = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                _current_stage.reset(token)
+                run = _run_usage.get()
+                if run is not None:
+                    run.stage_seconds[name] = run.stage_seconds.get(name, 0.0) + time.perf_counter() - started
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def _empty_totals() -> Dict[str, Any]:
+    return {
+        "calls": 0,
+        "upstream_calls": 0,
+        "failed": 0,
+        "attempts": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "cost_usd": 0.0,
+        "cost_complete": True,
+        "latency_seconds_max": 0.0,
+    }
+
+
+def _add(totals: Dict[str, Any], call: Dict[str, Any]) -> None:
+    totals["calls"] += 1
+    totals["attempts"] += call["attempts"]
+    totals["latency_seconds_max"] = max(totals["latency_seconds_max"], call["latency_seconds"])
+    if call["status"] != "ok":
+        totals["failed"] += 1
+    if call["cached"] or call["coalesced"]:
+        # Served without a new upstream request: no tokens billed for this call.
+        return
+    totals["upstream_calls"] += 1
+    totals["prompt_tokens"] += call["prompt_tokens"] or 0
+    totals["completion_tokens"] += call["completion_tokens"] or 0
+    if call["cost_usd"] is not None:
+        totals["cost_usd"] += call["cost_usd"]
+    elif call["status"] == "ok":
+        totals["cost_complete"] = False
+
+
+class RunUsage:
+    """Call records for one run; offsets are seconds since the run started."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.calls: List[Dict[str, Any]] = []
+        # Time spent inside each @staged function (summed when a stage runs more than once).
+        self.stage_seconds: Dict[str, float] = {}
+
+    def record(
+        self,
+        model: str,
+        started: float,
+        status: str,
+        response: Optional[Dict[str, Any]] = None,
+        attempts: int = 0,
+        first_token_at: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        ended = time.perf_counter()
+        response = response or {}
+        cached = bool(response.get("cached"))
+        coalesced = bool(response.get("coalesced"))
+        usage = response.get("usage") or {}
+        cost, cost_source = (None, None) if cached or coalesced else call_cost(model, usage)
+        call = {
+            "stage": current_stage(),
+            "model": model,
+            "status": status,
+            "cached": cached,
+            "coalesced": coalesced,
+            "attempts": attempts,
+            "start_offset_seconds": round(started - self.started, 4),
+            "latency_seconds": round(ended - started, 4),
+            "ttft_seconds": None if first_token_at is None else round(first_token_at - started, 4),
+            "prompt_tokens": usage.get("prompt_tokens"),
+            "completion_tokens": usage.get("completion_tokens"),
+            "cost_usd": cost,
+            "cost_source": cost_source,
+        }
+        self.calls.append(call)
+        return call
+
+    def summary(self) -> Dict[str, Any]:
+        totals = _empty_totals()
+        stages: Dict[str, Dict[str, Any]] = {}
+        for name in self.stage_seconds:
+            stages[name] = dict(_empty_totals(), first_start=None, last_end=0.0, models={})
+        for call in self.calls:
+            _add(totals, call)
+            stage = stages.get(call["stage"])
+            if stage is None:
+                stage = stages[call["stage"]] = dict(_empty_totals(), first_start=None, last_end=0.0, models={})
+            _add(stage, call)
+            end = call["start_offset_seconds"] + call["latency_seconds"]
+            if stage["first_start"] is None or call["start_offset_seconds"] < stage["first_start"]:
+                stage["first_start"] = call["start_offset_seconds"]
+            stage["last_end"] = max(stage["last_end"], end)
+            model = stage["models"].get(call["model"])
+            if model is None:
+                model = stage["models"][call["model"]] = dict(_empty_totals(), ttft_seconds_max=None)
+            _add(model, call)
+            if call["ttft_seconds"] is not None:
+                model["ttft_seconds_max"] = max(model["ttft_seconds_max"] or 0.0, call["ttft_seconds"])
+        for name, stage in stages.items():
+            # Calls: first call starting to last call finishing; duration: time inside the stage function.
+            first_start = stage.pop("first_start")
+            last_end = stage.pop("last_end")
+            stage["calls_wall_seconds"] = round(last_end - first_start, 4) if first_start is not None else 0.0
+            stage["duration_seconds"] = round(self.stage_seconds[name], 4) if name in self.stage_seconds else None
+        return {"totals": totals, "stages": stages, "calls": list(self.calls)}
+
+
+def begin_run_usage() -> RunUsage:
+    """Start recording model calls for the current run (and its child tasks)."""
+    run = RunUsage()
+    _run_usage.set(run)
+    return run
+
+
+def current_run() -> Optional[RunUsage]:
+    return _run_usage.get()
@@ -0,0 +1,78 @@
+"""Synthetic inputs shared by the benchmarks (profiles, JDs, model outputs)."""
+
+from __future__ import annotations
+
+import random
+from typing import Dict, List
+
+
+def synthetic_profile(target_chars: int) -> str:
+    """A master-profile-shaped document of roughly target_chars characters."""
+    blocks: List[str] = []
+    role = 0
+    while sum(len(b) for b in blocks) < target_chars:
+        role += 1
+        blocks.append(
+            f"Professional Experience\n"
+            f"## Role {role} - Data Engineer, Example Ltd (2018-2020)\n"
+            + "\n".join(
+                f"- Built pipeline {role}.{i} in Python, SQL and Airflow for regulatory reporting teams"
+                for i in range(12)
+            )
+        )
+    return "\n\n".join(
+        [
+            "Summary\nAI engineer with a background in data platforms and legal tech.",
+            "Education\n- MSc Data Science, University of Example",
+            "Technical Skills\n- Python, SQL, PyTorch, FastAPI, Airflow, AWS",
+            *blocks,
+            "Projects\n- **Resume Council** | Python, FastAPI | Multi-model resume tailoring",
+            "Certifications\n- AWS Certified Machine Learning - Specialty",
+        ]
+    )
+
+
+_JD_SENTENCES = [
+    "You will design and ship NLP pipelines for regulatory and legal documents.",
+    "Strong Python, SQL and cloud (AWS or GCP) experience is required.",
+    "Experience with PyTorch, transformers, spaCy or similar frameworks is expected.",
+    "You will own MLOps: CI/CD, model monitoring, evaluation and data quality checks.",
+    "Familiarity with retrieval-augmented generation and vector databases is a plus.",
+    "You will work with lawyers, compliance officers and product managers.",
+    "We value clear written communication and pragmatic delivery.",
+]
+
+
+def long_job_description(target_chars: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    parts = ["Senior AI Engineer (Legal Tech)\n"]
+    while sum(len(p) for p in parts) < target_chars:
+        parts.append(rng.choice(_JD_SENTENCES))
+    return " ".join(parts)
+
+
+def well_formed_resume() -> str:
+    return "\n\n".join(
+        [
+            "Summary\nAI engineer delivering NLP systems for regulated industries.",
+            "Education\n- MSc Data Science, University of Example",
+            "Technical Skills\n- Python, SQL, PyTorch, spaCy, AWS, Airflow",
+            "Professional Experience\n" + "\n".join(f"- Built pipeline {i} in Python and SQL" for i in range(12)),
+            "Projects\n- **Resume Council** | Python, FastAPI | Multi-model resume tailoring",
+            "Certifications\n- AWS Certified Machine Learning - Specialty",
+        ]
+    )
+
+
+def malformed_outputs() -> Dict[str, str]:
+    """Model outputs that exercise the repair paths in _ensure_required_outline."""
+    good = well_formed_resume()
+    return {
+        "well_formed": good,
+        "missing_sections": "Summary\nAI engineer.\n\nProfessional Experience\n- Built things",
+        "markdown_headings": good.replace("Summary", "## Summary:").replace("Projects", "### Projects -"),
+        "truncated": good[: len(good) // 2] + "\n- **",
+        "chatty_preamble": "Sure! Here is the tailored resume you asked for:\n\n" + good + "\n\nLet me know if you need changes.",
+        "empty_sections": "Summary\n\nEducation\nN/A\n\nTechnical Skills\n\nProfessional Experience\n\nProjects\n\nCertifications\n",
+        "crlf": good.replace("\n", "\r\n"),
+    }
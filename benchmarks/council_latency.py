@@ -0,0 +1,278 @@
+"""End-to-end latency benchmark for the council pipelines against a fake OpenRouter.
+
+Starts benchmarks.fake_openrouter in a subprocess (or uses --url), points the
+backend at it, and drives run_resume_council and/or run_full_council at each
+concurrency level. Reports p50/p95/p99 wall time per stage and throughput.
+
+    python -m benchmarks.council_latency --pipeline resume --concurrency 1,4,16 --runs 24
+    python -m benchmarks.council_latency --profile models.json --json results.json
+
+The response cache and request coalescing are disabled unless --keep-env is
+given, so every run really goes to the (fake) upstream. Backend data
+(artifacts, cache) goes to a temporary directory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextvars
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+_JOB_DESCRIPTION = """Senior AI Engineer (Legal Tech)
+We are hiring an engineer to build NLP pipelines for regulatory and legal documents.
+Requirements: Python, SQL, PyTorch, transformers, spaCy, FastAPI, AWS, Airflow, MLOps.
+Nice to have: retrieval-augmented generation, evaluation frameworks, stakeholder communication."""
+
+_COMPANY_DETAILS = "Series B legal-tech start-up in London; pragmatic, delivery-focused engineering culture."
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile (0-100)."""
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def _start_fake_server(port: int, profile: Optional[str], seed: Optional[int]) -> subprocess.Popen:
+    cmd = [sys.executable, "-m", "benchmarks.fake_openrouter", "--port", str(port)]
+    if profile:
+        cmd += ["--profile", profile]
+    if seed is not None:
+        cmd += ["--seed", str(seed)]
+    return subprocess.Popen(cmd)
+
+
+def _wait_for_server(port: int, timeout: float = 15.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"fake OpenRouter did not start on port {port}")
+
+
+def _configure_env(url: str, data_dir: str, keep_env: bool) -> None:
+    # Must happen before backend.config is imported.
+    os.environ["OPENROUTER_API_URL"] = url
+    os.environ.setdefault("OPENROUTER_API_KEY", "fake-benchmark-key")
+    os.environ.setdefault("ARTIFACTS_DATA_DIR", os.path.join(data_dir, "artifacts"))
+    os.environ.setdefault("RESPONSE_CACHE_DIR", os.path.join(data_dir, "llm_cache"))
+    os.environ.setdefault("TRACES_DATA_DIR", os.path.join(data_dir, "traces"))
+    if not keep_env:
+        os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+        os.environ["OPENROUTER_COALESCE_REQUESTS"] = "false"
+
+
+def _sample_profile() -> str:
+    from benchmarks.corpora import synthetic_profile
+
+    return "Jane Doe | London | jane@example.com\n\n" + synthetic_profile(20_000)
+
+
+RunTimings = Dict[str, float]
+
+
+async def _timed_resume_run(master_profile: str) -> RunTimings:
+    from backend.resume import run_resume_council
+
+    marks: Dict[str, float] = {}
+
+    async def on_event(event: str, data: Dict[str, Any]) -> None:
+        key = f"{event}:{data.get('stage')}" if event == "stage_started" else event
+        marks.setdefault(key, time.perf_counter())
+
+    started = time.perf_counter()
+    await run_resume_council(master_profile, _JOB_DESCRIPTION, _COMPANY_DETAILS, on_event=on_event)
+    ended = time.perf_counter()
+
+    timings = {"total": ended - started}
+    if "stage1_done" in marks:
+        timings["stage1"] = marks["stage1_done"] - started
+    if "ranking_done" in marks and "stage1_done" in marks:
+        timings["stage2"] = marks["ranking_done"] - marks["stage1_done"]
+    if "final_done" in marks and "stage_started:stage3" in marks:
+        timings["stage3"] = marks["final_done"] - marks["stage_started:stage3"]
+    if "final_done" in marks:
+        timings["docx+metadata"] = ended - marks["final_done"]
+    return timings
+
+
+_council_marks: contextvars.ContextVar[Optional[RunTimings]] = contextvars.ContextVar("council_marks", default=None)
+
+
+def _instrument_council() -> None:
+    """Wrap the council stage functions so each run records its own stage durations."""
+    from backend import council
+
+    def wrap(name: str, label: str) -> None:
+        original = getattr(council, name)
+        if getattr(original, "_benchmark_wrapped", False):
+            return
+
+        async def timed(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return await original(*args, **kwargs)
+            finally:
+                marks = _council_marks.get()
+                if marks is not None:
+                    marks[label] = time.perf_counter() - started
+
+        timed._benchmark_wrapped = True  # type: ignore[attr-defined]
+        setattr(council, name, timed)
+
+    wrap("stage1_collect_responses", "stage1")
+    wrap("stage2_collect_rankings", "stage2")
+    wrap("stage3_synthesize_final", "stage3")
+
+
+async def _timed_council_run(query: str) -> RunTimings:
+    from backend.council import run_full_council
+
+    marks: RunTimings = {}
+    _council_marks.set(marks)
+    started = time.perf_counter()
+    await run_full_council(query)
+    marks["total"] = time.perf_counter() - started
+    return marks
+
+
+async def _run_level(run_once: Callable[[], Awaitable[RunTimings]], concurrency: int, runs: int) -> Dict[str, Any]:
+    gate = asyncio.Semaphore(concurrency)
+    results: List[RunTimings] = []
+    failures = 0
+
+    async def one() -> None:
+        nonlocal failures
+        async with gate:
+            try:
+                # gather() runs each of these in its own task/context, so stage marks stay per run.
+                results.append(await run_once())
+            except Exception as e:
+                failures += 1
+                print(f"run failed: {e}", file=sys.stderr)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(runs)))
+    wall = time.perf_counter() - started
+
+    stages: Dict[str, Dict[str, float]] = {}
+    for stage in sorted({k for r in results for k in r}, key=lambda s: (s == "total", s)):
+        samples = [r[stage] for r in results if stage in r]
+        stages[stage] = {
+            "p50": percentile(samples, 50),
+            "p95": percentile(samples, 95),
+            "p99": percentile(samples, 99),
+            "mean": sum(samples) / len(samples),
+            "count": len(samples),
+        }
+    return {
+        "concurrency": concurrency,
+        "runs": runs,
+        "failures": failures,
+        "wall_seconds": wall,
+        "throughput_runs_per_min": (len(results) / wall * 60) if wall else 0.0,
+        "stages": stages,
+    }
+
+
+def _print_level(pipeline: str, level: Dict[str, Any]) -> None:
+    print(
+        f"\n{pipeline} | concurrency {level['concurrency']} | {level['runs']} runs "
+        f"({level['failures']} failed) | {level['throughput_runs_per_min']:.1f} runs/min"
+    )
+    print(f"  {'stage':<16} {'p50':>8} {'p95':>8} {'p99':>8} {'mean':>8}  (seconds)")
+    for stage, row in level["stages"].items():
+        print(f"  {stage:<16} {row['p50']:>8.2f} {row['p95']:>8.2f} {row['p99']:>8.2f} {row['mean']:>8.2f}")
+
+
+async def _benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    from backend import openrouter, tracing
+
+    levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    pipelines = ["resume", "council"] if args.pipeline == "both" else [args.pipeline]
+    master_profile = _sample_profile()
+    if "council" in pipelines:
+        _instrument_council()
+
+    report: Dict[str, Any] = {"pipelines": {}}
+    await openrouter.start_client()
+    try:
+        for pipeline in pipelines:
+            if pipeline == "resume":
+                run_once = lambda: _timed_resume_run(master_profile)
+            else:
+                run_once = lambda: _timed_council_run("Compare RAG and fine-tuning for legal document QA.")
+            if args.warmup:
+                await _run_level(run_once, 1, args.warmup)
+            results = []
+            for concurrency in levels:
+                level = await _run_level(run_once, concurrency, max(args.runs, concurrency))
+                _print_level(pipeline, level)
+                results.append(level)
+            report["pipelines"][pipeline] = results
+    finally:
+        await openrouter.close_client()
+        # Finish trace exports before the scratch directory is removed.
+        await asyncio.to_thread(tracing.store.flush)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Council end-to-end latency benchmark (fake OpenRouter)")
+    parser.add_argument("--pipeline", choices=["resume", "council", "both"], default="both")
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated concurrency levels")
+    parser.add_argument("--runs", type=int, default=16, help="runs per concurrency level")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs before measuring")
+    parser.add_argument("--profile", help="fake OpenRouter model profile JSON (see benchmarks.fake_openrouter)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--url", help="use an already running OpenRouter-compatible endpoint")
+    parser.add_argument("--keep-env", action="store_true", help="leave response cache / coalescing settings as configured")
+    parser.add_argument("--json", dest="json_path", help="write the report to this file")
+    args = parser.parse_args()
+
+    server = None
+    with tempfile.TemporaryDirectory(prefix="council-bench-") as data_dir:
+        url = args.url
+        if not url:
+            port = _free_port()
+            server = _start_fake_server(port, args.profile, args.seed)
+            _wait_for_server(port)
+            url = f"http://127.0.0.1:{port}/api/v1/chat/completions"
+        _configure_env(url, data_dir, args.keep_env)
+        try:
+            report = asyncio.run(_benchmark(args))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=10)
+
+    report["settings"] = {k: v for k, v in vars(args).items() if k != "json_path"}
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nreport written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
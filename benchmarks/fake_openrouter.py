@@ -0,0 +1,225 @@
+"""Local OpenRouter stand-in for benchmarking the council without real API calls.
+
+Serves POST /api/v1/chat/completions in OpenRouter's shape (JSON or SSE
+streaming, `usage` token counts). Each model gets a latency distribution,
+a streaming speed and an error rate. Replies are shaped like the prompt being
+answered (resume drafts, judge JSON, FINAL RANKING lists, titles), so the
+pipeline parses them as it would real output.
+
+    python -m benchmarks.fake_openrouter --port 8765 [--profile models.json]
+
+A profile is JSON keyed by model id ("*" = default for unlisted models):
+
+    {"*": {"ttft_median": 1.5, "ttft_sigma": 0.4, "tokens_per_second": 80,
+           "completion_tokens": 600, "error_rate": 0.02, "stream_error_rate": 0.01,
+           "error_status": 503},
+     "x-ai/grok-4": {"ttft_median": 4.0, "ttft_sigma": 0.8}}
+
+Times are seconds; the time to first token is log-normal around ttft_median.
+Point the backend at it with OPENROUTER_API_URL=http://127.0.0.1:8765/api/v1/chat/completions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+DEFAULT_MODEL_PROFILE: Dict[str, float] = {
+    "ttft_median": 1.5,
+    "ttft_sigma": 0.4,
+    "tokens_per_second": 80.0,
+    "completion_tokens": 600,
+    "error_rate": 0.0,
+    "stream_error_rate": 0.0,
+    "error_status": 503,
+}
+
+_RESUME_SECTIONS = ["Summary", "Education", "Technical Skills", "Professional Experience", "Projects", "Certifications"]
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, (len(text or "") + 3) // 4)
+
+
+class ModelProfiles:
+    def __init__(self, profiles: Optional[Dict[str, Dict[str, float]]] = None, seed: Optional[int] = None) -> None:
+        self._profiles = profiles or {}
+        self.rng = random.Random(seed)
+
+    def get(self, model: str) -> Dict[str, float]:
+        merged = dict(DEFAULT_MODEL_PROFILE)
+        merged.update(self._profiles.get("*") or {})
+        merged.update(self._profiles.get(model) or {})
+        return merged
+
+    def ttft(self, profile: Dict[str, float]) -> float:
+        return self.rng.lognormvariate(0.0, float(profile["ttft_sigma"])) * float(profile["ttft_median"])
+
+    def roll(self, rate: float) -> bool:
+        return self.rng.random() < float(rate)
+
+
+def _prompt_text(messages: List[Dict[str, Any]]) -> str:
+    return "\n".join(str(m.get("content") or "") for m in messages or [])
+
+
+def _labels(prompt: str) -> List[str]:
+    """Labels of the anonymized responses in the prompt ("Response A:" block headers)."""
+    seen: List[str] = []
+    for label in re.findall(r"^(Response [A-Z]+):\s*$", prompt, flags=re.MULTILINE):
+        if label not in seen:
+            seen.append(label)
+    return seen
+
+
+def _ranking_block(labels: List[str], rng: random.Random) -> str:
+    order = list(labels)
+    rng.shuffle(order)
+    return "FINAL RANKING:\n" + "\n".join(f"{i}. {label}" for i, label in enumerate(order, start=1))
+
+
+def _filler(words: int, rng: random.Random) -> str:
+    vocab = ["python", "sql", "pipelines", "delivered", "regulatory", "models", "stakeholders", "automated", "reporting", "data"]
+    return " ".join(rng.choice(vocab) for _ in range(max(1, words)))
+
+
+def fake_reply(prompt: str, completion_tokens: int, rng: random.Random) -> str:
+    """A reply of roughly completion_tokens tokens, shaped for the prompt type."""
+    words = max(20, int(completion_tokens * 0.75))
+    labels = _labels(prompt)
+    if "STRICT JSON" in prompt and labels:
+        scores = [
+            {"label": label, "keyword_coverage": rng.randint(50, 95), "role_relevance": rng.randint(50, 95),
+             "truthfulness": rng.randint(60, 100), "formatting": rng.randint(60, 100),
+             "overall": rng.randint(55, 95), "notes": _filler(12, rng)}
+            for label in labels
+        ]
+        ranking = sorted(labels, key=lambda l: -next(s["overall"] for s in scores if s["label"] == l))
+        body = {"scores": scores, "winner": ranking[0], "final_ranking": ranking, "unsupported_claims": []}
+        return json.dumps(body, indent=2) + "\n\nFINAL RANKING:\n" + "\n".join(
+            f"{i}. {label}" for i, label in enumerate(ranking, start=1)
+        )
+    if "FINAL RANKING" in prompt and labels:
+        feedback = "\n".join(f"{label}: {_filler(words // max(1, len(labels)) // 2, rng)}" for label in labels)
+        return feedback + "\n\n" + _ranking_block(labels, rng)
+    if "Title:" in prompt:
+        return "Benchmark Conversation Title"
+    if "resume" in prompt.lower():
+        per_section = max(3, words // len(_RESUME_SECTIONS))
+        parts = []
+        for heading in _RESUME_SECTIONS:
+            bullets = [f"- {_filler(12, rng)}" for _ in range(max(1, per_section // 12))]
+            if heading == "Projects":
+                bullets = [f"- **Project {i}** | Python | {_filler(10, rng)}" for i in range(1, 4)]
+            parts.append(heading + "\n" + "\n".join(bullets))
+        return "\n\n".join(parts)
+    return _filler(words, rng)
+
+
+def create_app(profiles: ModelProfiles) -> FastAPI:
+    app = FastAPI(title="Fake OpenRouter")
+    stats: Dict[str, int] = {"requests": 0, "errors": 0, "streams": 0}
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    @app.post("/api/v1/chat/completions")
+    async def chat_completions(request: Request):
+        payload = await request.json()
+        model = str(payload.get("model") or "unknown")
+        profile = profiles.get(model)
+        prompt = _prompt_text(payload.get("messages") or [])
+        stats["requests"] += 1
+
+        ttft = profiles.ttft(profile)
+        if profiles.roll(profile["error_rate"]):
+            stats["errors"] += 1
+            await asyncio.sleep(min(ttft, 0.5))
+            status = int(profile["error_status"])
+            return JSONResponse({"error": {"code": status, "message": "fake upstream error"}}, status_code=status)
+
+        max_tokens = payload.get("max_tokens")
+        completion_target = int(profile["completion_tokens"])
+        if isinstance(max_tokens, int) and max_tokens > 0:
+            completion_target = min(completion_target, max_tokens)
+        content = fake_reply(prompt, completion_target, profiles.rng)
+        usage = {
+            "prompt_tokens": estimate_tokens(prompt),
+            "completion_tokens": estimate_tokens(content),
+            "total_tokens": estimate_tokens(prompt) + estimate_tokens(content),
+        }
+        generation = usage["completion_tokens"] / max(1.0, float(profile["tokens_per_second"]))
+        completion_id = f"gen-{uuid.uuid4().hex[:12]}"
+
+        if not payload.get("stream"):
+            await asyncio.sleep(ttft + generation)
+            return {
+                "id": completion_id,
+                "model": model,
+                "created": int(time.time()),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": usage,
+            }
+
+        stats["streams"] += 1
+        fail_midway = profiles.roll(profile["stream_error_rate"])
+
+        async def events():
+            yield ": OPENROUTER PROCESSING\n\n"
+            await asyncio.sleep(ttft)
+            pieces = re.findall(r"\S+\s*", content) or [content]
+            # ~4 words per chunk, paced to tokens_per_second
+            step = 4
+            delay = generation / max(1, len(pieces) / step)
+            for i in range(0, len(pieces), step):
+                if fail_midway and i >= len(pieces) // 2:
+                    stats["errors"] += 1
+                    error = {"error": {"code": int(profile["error_status"]), "message": "fake stream error"}}
+                    yield f"data: {json.dumps(error)}\n\n"
+                    return
+                chunk = {"id": completion_id, "model": model, "choices": [{"index": 0, "delta": {"content": "".join(pieces[i:i + step])}}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+                await asyncio.sleep(delay)
+            final = {"id": completion_id, "model": model, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}], "usage": usage}
+            yield f"data: {json.dumps(final)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def load_profiles(path: Optional[str]) -> Dict[str, Dict[str, float]]:
+    if not path:
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Local OpenRouter stand-in for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--profile", help="JSON file with per-model latency/error settings")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    app = create_app(ModelProfiles(load_profiles(args.profile), seed=args.seed))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Micro-benchmarks for the CPU-bound text processing on the resume request path.
+
+Covers profile packs, JD packs, keyword heuristics, outline repair and DOCX
+rendering over small/medium/huge profiles, long JDs and malformed model
+outputs. Results are compared against a stored baseline on the best-of-N
+time (far less noisy than the median on shared machines); any case slower
+than baseline * (1 + tolerance) is reported and the process exits non-zero.
+
+    python -m benchmarks.hotpaths                    # compare with the baseline
+    python -m benchmarks.hotpaths --save-baseline    # record a new baseline
+    python -m benchmarks.hotpaths --filter outline --tolerance 0.3
+
+Baselines are machine-specific: record one on the machine (or CI runner)
+that will run the comparison.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+from backend import docx_render, packs, resume, sections
+from backend.keywords import KeywordMatcher
+from benchmarks.corpora import long_job_description, malformed_outputs, synthetic_profile, well_formed_resume
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "hotpaths.json")
+
+
+def _clear_caches() -> None:
+    """Per-text caches (section index, profile chunks, the pack -> sections map
+    _ensure_required_outline reads) would otherwise turn repeat calls into lookups.
+
+    Keyword matchers are per JD and stay compiled across a run's drafts, so
+    they are kept; keyword_matcher/compile measures building one.
+    """
+    sections.index_sections.cache_clear()
+    packs._profile_chunks.cache_clear()
+    resume._pack_sections.clear()
+
+
+def _cold(fn: Callable[[], object]) -> Callable[[], object]:
+    def run() -> object:
+        _clear_caches()
+        return fn()
+
+    return run
+
+
+def build_cases() -> List[Tuple[str, Callable[[], object]]]:
+    profiles = {
+        "small": synthetic_profile(5_000),
+        "medium": synthetic_profile(60_000),
+        "huge": synthetic_profile(300_000),
+    }
+    jd = long_job_description(20_000)
+    jd_pack = packs.build_jd_pack(jd)
+    keywords = jd_pack["keywords"]
+    outputs = malformed_outputs()
+    pack = packs.build_profile_pack(profiles["medium"])
+
+    cases: List[Tuple[str, Callable[[], object]]] = []
+    for size, profile in profiles.items():
+        cases.append((f"build_profile_pack/{size}/60k", _cold(lambda p=profile: packs.build_profile_pack(p, 60_000))))
+        cases.append((f"build_profile_pack/{size}/full", _cold(lambda p=profile: packs.build_profile_pack(p, None))))
+        cases.append(
+            (
+                f"build_relevant_profile_pack/{size}",
+                _cold(lambda p=profile: packs.build_relevant_profile_pack(p, keywords, 6000)),
+            )
+        )
+    cases.append(("keyword_matcher/compile", lambda: KeywordMatcher(keywords).hits("")))
+    cases.append(("extract_keywords/jd20k", lambda: packs.extract_keywords(jd, 40)))
+    cases.append(("build_jd_pack/jd20k", lambda: packs.build_jd_pack(jd)))
+    for name, text in outputs.items():
+        cases.append((f"basic_resume_heuristics/{name}", _cold(lambda t=text: packs.basic_resume_heuristics(t, keywords))))
+        cases.append((f"ensure_required_outline/{name}", _cold(lambda t=text: resume._ensure_required_outline(t, pack))))
+    cases.append(("render_docx/resume", lambda: docx_render.render_docx(well_formed_resume())))
+    return cases
+
+
+def measure(fn: Callable[[], object], repeat: int, min_sample_seconds: float = 0.05) -> Dict[str, float]:
+    """Per-call time in ms: calls are batched so each sample lasts at least min_sample_seconds."""
+    fn()  # warm-up (imports, lazy templates)
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_sample_seconds or number >= 1_000_000:
+            break
+        number *= 2
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - started) / number)
+    return {
+        "median_ms": statistics.median(samples) * 1000,
+        "min_ms": min(samples) * 1000,
+        "calls_per_sample": number,
+    }
+
+
+def _machine() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for packs/resume hot paths")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown vs baseline (0.5 = +50%%)")
+    parser.add_argument(
+        "--noise-floor-ms", type=float, default=0.05, help="ignore slowdowns smaller than this in absolute terms"
+    )
+    args = parser.parse_args()
+
+    baseline: Dict[str, Dict[str, float]] = {}
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f).get("results", {})
+
+    results: Dict[str, Dict[str, float]] = {}
+    regressions: List[str] = []
+    print(f"{'case':<48} {'median ms':>10} {'min ms':>10} {'base min':>10} {'ratio':>7}")
+    for name, fn in build_cases():
+        if args.filter and args.filter not in name:
+            continue
+        row = measure(fn, args.repeat)
+        results[name] = row
+        base = (baseline.get(name) or {}).get("min_ms")
+        ratio = row["min_ms"] / base if base else None
+        flag = ""
+        if ratio is not None and ratio > 1 + args.tolerance and row["min_ms"] - base > args.noise_floor_ms:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        base_text = f"{base:10.3f}" if base else f"{'-':>10}"
+        ratio_text = f"{ratio:7.2f}" if ratio is not None else f"{'-':>7}"
+        print(f"{name:<48} {row['median_ms']:10.3f} {row['min_ms']:10.3f} {base_text} {ratio_text}{flag}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        existing: Dict[str, Dict[str, float]] = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r") as f:
+                existing = json.load(f).get("results", {})
+        existing.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump({"machine": _machine(), "results": existing}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nbaseline written to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print("\nno baseline found; run with --save-baseline to record one")
+        return 0
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than baseline by more than {args.tolerance:.0%}:")
+        for name in regressions:
+            print(f"  {name}")
+        return 1
+    print("\nno regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
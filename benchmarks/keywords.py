@@ -0,0 +1,54 @@
+"""Benchmark JD keyword scoring against resume drafts.
+
+Compares the per-keyword substring loop basic_resume_heuristics used before
+with the compiled KeywordMatcher (hits() and match() with counts/positions)
+as the keyword list grows. Usage:
+
+    python -m benchmarks.keywords [--chars 6000] [--repeat 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, List
+
+from backend.keywords import KeywordMatcher
+from benchmarks.corpora import synthetic_profile
+
+
+def _keywords(count: int) -> List[str]:
+    base = ["python", "sql", "airflow", "aws", "pytorch", "fastapi", "data", "pipeline", "regulatory", "legal"]
+    return [base[i % len(base)] + ("" if i < len(base) else str(i)) for i in range(count)]
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chars", type=int, default=6000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    text = synthetic_profile(args.chars)
+    print(f"text: {len(text):,} chars")
+    print(f"{'keywords':>8} {'substring loop':>15} {'hits()':>10} {'match()':>10}  (ms)")
+    for count in (20, 40, 100, 200, 400, 800):
+        keywords = _keywords(count)
+        matcher = KeywordMatcher(keywords)
+        lowered = text.lower()
+        loop = _time(lambda: [kw for kw in keywords if kw.lower() in lowered], args.repeat)
+        hits = _time(lambda: matcher.hits(text), args.repeat)
+        full = _time(lambda: matcher.match(text), args.repeat)
+        print(f"{count:>8} {loop * 1000:>15.3f} {hits * 1000:>10.3f} {full * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
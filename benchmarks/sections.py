@@ -0,0 +1,84 @@
+"""Benchmark the single-pass section index on large master profiles.
+
+Compares the shared index (one scan, cached per text) against rescanning the
+profile once per requested section, which is what section extraction did
+before. Usage:
+
+    python -m benchmarks.sections [--chars 150000] [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable
+
+from backend.packs import basic_resume_heuristics, extract_profile_section
+from backend.sections import PROFILE_HEADINGS, RESUME_HEADINGS, index_sections, normalize_heading
+from benchmarks.corpora import synthetic_profile
+
+
+def _rescan_extract(text: str, section_name: str) -> str:
+    """Reference: the per-section rescan used before the shared index."""
+    lines = text.splitlines()
+    target = section_name.strip().lower()
+    start = next((i for i, line in enumerate(lines) if normalize_heading(line) == target), None)
+    if start is None:
+        return ""
+    out = [lines[start].strip()]
+    for line in lines[start + 1 :]:
+        if normalize_heading(line) in PROFILE_HEADINGS:
+            break
+        out.append(line.rstrip())
+    return "\n".join(out).strip()
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chars", type=int, default=150_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    profile = synthetic_profile(args.chars)
+    print(f"profile: {len(profile):,} chars, {profile.count(chr(10)) + 1:,} lines")
+
+    def rescan_all() -> None:
+        for name in RESUME_HEADINGS:
+            _rescan_extract(profile, name)
+
+    def index_cold() -> None:
+        index_sections.cache_clear()
+        for name in RESUME_HEADINGS:
+            extract_profile_section(profile, name)
+
+    def index_warm() -> None:
+        for name in RESUME_HEADINGS:
+            extract_profile_section(profile, name)
+
+    def heuristics() -> None:
+        basic_resume_heuristics(profile, ["python", "sql", "airflow", "aws"])
+
+    for name in RESUME_HEADINGS:
+        assert extract_profile_section(profile, name) == _rescan_extract(profile, name)
+
+    rows = [
+        ("rescan per section (before)", _time(rescan_all, args.repeat)),
+        ("single-pass index, cold", _time(index_cold, args.repeat)),
+        ("single-pass index, cached", _time(index_warm, args.repeat)),
+        ("basic_resume_heuristics", _time(heuristics, args.repeat)),
+    ]
+    for label, seconds in rows:
+        print(f"{label:<30} {seconds * 1000:9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
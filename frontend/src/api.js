@@ -74,6 +74,67 @@ export const api = {
     return response.json();
   },
 
+  /**
+   * Run resume tailoring council flow, streaming progress events.
+   * onEvent(eventName, data) is called for each SSE event; resolves with the saved record.
+   */
+  async runResumeStream({ jobDescription, masterProfile, companyDetails, profileId, usePeerRanking }, onEvent) {
+    const response = await fetch(`${API_BASE}/api/resume/run/stream`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        ...getAuthHeaders(),
+      },
+      body: JSON.stringify({
+        job_description: jobDescription,
+        master_profile: masterProfile,
+        profile_id: profileId,
+        company_details: companyDetails,
+        use_peer_ranking: typeof usePeerRanking === 'boolean' ? usePeerRanking : null,
+      }),
+    });
+
+    if (!response.ok) {
+      const text = await response.text();
+      throw new Error(text || 'Failed to run resume flow');
+    }
+    if (!response.body) {
+      throw new Error('Streaming responses are not supported');
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let record = null;
+
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      let sep;
+      while ((sep = buffer.indexOf('\n\n')) !== -1) {
+        const raw = buffer.slice(0, sep);
+        buffer = buffer.slice(sep + 2);
+        let eventName = 'message';
+        let dataText = '';
+        for (const line of raw.split('\n')) {
+          if (line.startsWith('event:')) eventName = line.slice(6).trim();
+          else if (line.startsWith('data:')) dataText += line.slice(5).trim();
+        }
+        if (!dataText) continue;
+        const data = JSON.parse(dataText);
+        if (eventName === 'error') {
+          throw new Error(data.detail || 'Resume run failed');
+        }
+        if (eventName === 'complete') record = data;
+        if (onEvent) onEvent(eventName, data);
+      }
+    }
+
+    return record;
+  },
+
   async listResumeRuns() {
     const response = await fetch(`${API_BASE}/api/resumes`, {
       headers: withAuth(),
@@ -94,6 +155,16 @@ export const api = {
     return response.json();
   },
 
+  async downloadResumeDocx(resumeId) {
+    const response = await fetch(`${API_BASE}/api/resumes/${resumeId}/docx`, {
+      headers: withAuth(),
+    });
+    if (!response.ok) {
+      throw new Error('Failed to download DOCX');
+    }
+    return response.blob();
+  },
+
   async listProfiles() {
     const response = await fetch(`${API_BASE}/api/profiles`, {
       headers: withAuth(),
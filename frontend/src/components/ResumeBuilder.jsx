@@ -5,6 +5,31 @@ import Stage3 from './Stage3';
 import { api } from '../api';
 import './ResumeBuilder.css';
 
+const describeProgress = (event, data) => {
+  switch (event) {
+    case 'stage_started':
+      if (data.stage === 'stage1') return 'Drafting resumes…';
+      if (data.stage === 'stage2') return 'Ranking drafts…';
+      return 'Polishing the final resume…';
+    case 'draft_started':
+    case 'token':
+      return data.stage === 'stage3' ? 'Polishing the final resume…' : `Drafting with ${data.model}…`;
+    case 'draft_done':
+      return `${data.model} ${data.ok ? 'finished its draft' : 'failed to draft'}.`;
+    case 'stage1_done':
+      return 'Drafts ready, ranking…';
+    case 'ranking_done':
+      return 'Rankings in, polishing…';
+    case 'polish_started':
+      return 'Polishing the final resume…';
+    case 'final_done':
+    case 'complete':
+      return 'Saving…';
+    default:
+      return '';
+  }
+};
+
 export default function ResumeBuilder() {
   const [history, setHistory] = useState([]);
   const [selectedResumeId, setSelectedResumeId] = useState(null);
@@ -17,6 +42,7 @@ export default function ResumeBuilder() {
   const [isLoading, setIsLoading] = useState(false);
   const [result, setResult] = useState(null);
   const [error, setError] = useState('');
+  const [progress, setProgress] = useState('');
 
   const loadHistory = async () => {
     try {
@@ -50,14 +76,32 @@ export default function ResumeBuilder() {
       return;
     }
     setIsLoading(true);
+    setProgress('');
+    const payload = {
+      jobDescription,
+      masterProfile: selectedProfileId ? '' : masterProfile,
+      companyDetails,
+      profileId: selectedProfileId || null,
+      usePeerRanking,
+    };
     try {
-      const data = await api.runResume({
-        jobDescription,
-        masterProfile: selectedProfileId ? '' : masterProfile,
-        companyDetails,
-        profileId: selectedProfileId || null,
-        usePeerRanking,
-      });
+      let data = null;
+      let streamed = false;
+      try {
+        data = await api.runResumeStream(payload, (event, eventData) => {
+          streamed = true;
+          setProgress(describeProgress(event, eventData));
+        });
+      } catch (err) {
+        // Stream endpoint unreachable (old backend, buffering proxy): fall back
+        // to the blocking run, but never re-run once the council has started.
+        if (streamed) throw err;
+        console.error(err);
+        data = await api.runResume(payload);
+      }
+      if (!data) {
+        throw new Error('Resume run ended before completing.');
+      }
       // Backend now returns a persisted record: {id, created_at, title, inputs, result}
       setSelectedResumeId(data.id);
       setResult(data.result);
@@ -66,6 +110,7 @@ export default function ResumeBuilder() {
       setError(err.message || 'Failed to generate resume.');
     } finally {
       setIsLoading(false);
+      setProgress('');
     }
   };
 
@@ -122,17 +167,29 @@ export default function ResumeBuilder() {
     }
   };
 
-  const handleDownload = () => {
-    if (!result?.docx?.base64) return;
-    const byteCharacters = atob(result.docx.base64);
-    const byteNumbers = new Array(byteCharacters.length);
-    for (let i = 0; i < byteCharacters.length; i += 1) {
-      byteNumbers[i] = byteCharacters.charCodeAt(i);
+  const handleDownload = async () => {
+    let blob;
+    if (result?.docx?.sha256 && selectedResumeId) {
+      try {
+        blob = await api.downloadResumeDocx(selectedResumeId);
+      } catch (err) {
+        setError(err.message || 'Failed to download DOCX.');
+        return;
+      }
+    } else if (result?.docx?.base64) {
+      // Older runs stored the DOCX inline.
+      const byteCharacters = atob(result.docx.base64);
+      const byteNumbers = new Array(byteCharacters.length);
+      for (let i = 0; i < byteCharacters.length; i += 1) {
+        byteNumbers[i] = byteCharacters.charCodeAt(i);
+      }
+      const byteArray = new Uint8Array(byteNumbers);
+      blob = new Blob([byteArray], {
+        type: 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+      });
+    } else {
+      return;
     }
-    const byteArray = new Uint8Array(byteNumbers);
-    const blob = new Blob([byteArray], {
-      type: 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-    });
     const url = URL.createObjectURL(blob);
     const link = document.createElement('a');
     link.href = url;
@@ -264,13 +321,13 @@ export default function ResumeBuilder() {
           </div>
 
       {isLoading && (
-        <div className="loading-banner">Consulting the council…</div>
+        <div className="loading-banner">{progress || 'Consulting the council…'}</div>
       )}
 
       {result && (
         <div className="results">
           <div className="result-actions">
-            {result.docx?.base64 && (
+            {(result.docx?.sha256 || result.docx?.base64) && (
               <button className="download-button" onClick={handleDownload}>
                 Download DOCX
               </button>
@@ -0,0 +1,55 @@
+import contextvars
+
+from backend import circuit
+from backend.circuit import CLOSED, HALF_OPEN, OPEN, BreakerRegistry
+
+
+def _tripped_registry(monkeypatch, model):
+    registry = BreakerRegistry()
+    breaker = registry._get(model)
+    breaker._open(0.0)
+    monkeypatch.setattr(circuit, "CIRCUIT_OPEN_SECONDS", 0.0)
+    return registry, breaker
+
+
+def test_half_open_ignores_results_from_non_probe_calls(monkeypatch):
+    registry, breaker = _tripped_registry(monkeypatch, "m")
+
+    def probe_run():
+        assert registry.allow("m")
+        assert breaker.state == HALF_OPEN
+        # A call started before the breaker went half-open reports without the probe id.
+        registry.record_success("m", 0.1)
+        assert breaker.state == HALF_OPEN
+        registry.record_failure("m", 0.1, registry.claim_probe("m"))
+
+    contextvars.copy_context().run(probe_run)
+    assert breaker.state == OPEN
+
+
+def test_half_open_probe_success_closes(monkeypatch):
+    registry, breaker = _tripped_registry(monkeypatch, "m")
+
+    def probe_run():
+        assert registry.allow("m")
+        registry.record_success("m", 0.1, registry.claim_probe("m"))
+
+    contextvars.copy_context().run(probe_run)
+    assert breaker.state == CLOSED
+
+
+def test_probe_is_claimed_by_one_call_only(monkeypatch):
+    registry, breaker = _tripped_registry(monkeypatch, "m")
+
+    def probe_run():
+        assert registry.allow("m")
+        # Call tasks copy the run's context; the first one takes the probe.
+        first = contextvars.copy_context().run(registry.claim_probe, "m")
+        later = contextvars.copy_context().run(registry.claim_probe, "m")
+        assert first == breaker.probe_id
+        assert later is None
+        # Another run never sees this run's probe.
+        assert contextvars.Context().run(registry.claim_probe, "m") is None
+
+    contextvars.copy_context().run(probe_run)
+    assert breaker.state == HALF_OPEN
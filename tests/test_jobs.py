@@ -0,0 +1,58 @@
+import asyncio
+import json
+import os
+import time
+
+from backend import jobs
+
+
+def _write(path, job):
+    with open(path, "w") as f:
+        json.dump(job, f)
+
+
+def test_finished_job_drops_request_and_leaves_active_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(jobs, "JOBS_DATA_DIR", str(tmp_path))
+
+    async def runner(request, on_event):
+        return {"id": "resume-1"}
+
+    async def scenario():
+        queue = jobs.JobQueue(runner, workers=1)
+        await queue.start()
+        await queue.submit("job-1", {"master_profile": "x" * 1000})
+        await queue._queue.join()
+        await queue.stop()
+
+    asyncio.run(scenario())
+    assert jobs.list_jobs() == []
+    job = jobs.get_job("job-1")
+    assert job["status"] == jobs.SUCCEEDED
+    assert job["resume_id"] == "resume-1"
+    assert "request" not in job
+
+
+def test_start_only_recovers_active_jobs_and_prunes_old_finished(monkeypatch, tmp_path):
+    monkeypatch.setattr(jobs, "JOBS_DATA_DIR", str(tmp_path))
+    jobs.ensure_jobs_dir()
+    _write(jobs.get_job_path("running"), {"id": "running", "status": jobs.RUNNING, "request": {}})
+    _write(jobs.get_job_path("old", finished=True), {"id": "old", "status": jobs.SUCCEEDED})
+    _write(jobs.get_job_path("recent", finished=True), {"id": "recent", "status": jobs.FAILED})
+    stale = time.time() - (jobs.RESUME_JOB_RETENTION_DAYS + 1) * 86400
+    os.utime(jobs.get_job_path("old", finished=True), (stale, stale))
+
+    async def runner(request, on_event):
+        raise AssertionError("nothing should be re-run")
+
+    async def scenario():
+        queue = jobs.JobQueue(runner, workers=1)
+        await queue.start()
+        await queue.stop()
+
+    asyncio.run(scenario())
+    assert jobs.list_jobs() == []
+    interrupted = jobs.get_job("running")
+    assert interrupted["status"] == jobs.FAILED
+    assert "request" not in interrupted
+    assert jobs.get_job("old") is None
+    assert jobs.get_job("recent")["status"] == jobs.FAILED
@@ -0,0 +1,26 @@
+from backend.keywords import KeywordMatcher
+from backend.packs import basic_resume_heuristics
+
+
+def test_matches_respect_word_boundaries():
+    matcher = KeywordMatcher(["ai", "go", "data", "database", "ci", "ci/cd", "c++"])
+    result = matcher.match("We maintain good CI/CD, C++ and AI tooling. Go! Databases, data.")
+    assert result["hits"] == ["ai", "go", "data", "ci/cd", "c++"]
+    assert result["counts"]["ai"] == 1
+    assert result["counts"]["database"] == 0  # "databases" is a different word
+    assert result["counts"]["ci"] == 0  # the longer keyword wins at the same position
+
+
+def test_counts_positions_and_case_variants():
+    matcher = KeywordMatcher(["Python", "python", "sql"])
+    text = "python, SQL and Python again"
+    result = matcher.match(text)
+    assert result["counts"] == {"Python": 2, "python": 2, "sql": 1}
+    assert result["positions"]["sql"] == [8]
+    assert matcher.hits(text) == ["Python", "python", "sql"]
+
+
+def test_heuristics_use_whole_word_hits():
+    heur = basic_resume_heuristics("Maintained Python services; Python and SQL.", ["ai", "python", "sql"])
+    assert heur["keyword_hits"] == ["python", "sql"]
+    assert heur["keyword_counts"] == {"python": 2, "sql": 1}
@@ -0,0 +1,27 @@
+import asyncio
+import os
+
+from backend.llm_cache import ResponseCache
+
+
+def test_concurrent_writes_keep_disk_accounting_exact(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl_seconds=0, memory_items=8, disk_max_bytes=10**9)
+
+    async def scenario():
+        # Overlapping keys: rewrites of an existing entry must not double-count its size.
+        await asyncio.gather(*(cache.aput(f"{i % 16:064x}", {"content": "x" * 200}) for i in range(64)))
+
+    asyncio.run(scenario())
+    assert cache._disk_bytes == cache._scan_disk_bytes()
+    assert not [p for p in tmp_path.rglob("*.tmp")]
+
+
+def test_aput_swallows_disk_errors(tmp_path):
+    blocker = tmp_path / "cache"
+    blocker.write_text("not a directory")
+    cache = ResponseCache(str(blocker), ttl_seconds=0, memory_items=8, disk_max_bytes=10**9)
+
+    asyncio.run(cache.aput("ab" * 32, {"content": "hello"}))
+    # The memory tier still serves the entry.
+    assert cache.get("ab" * 32) == {"content": "hello"}
+    assert os.path.isfile(blocker)
@@ -0,0 +1,19 @@
+from fastapi.testclient import TestClient
+
+from backend import main
+
+
+def test_metrics_closed_without_token(monkeypatch):
+    monkeypatch.setattr(main, "METRICS_AUTH_TOKEN", "")
+    client = TestClient(main.app)
+    assert client.get("/metrics").status_code == 404
+
+
+def test_metrics_rejects_unauthenticated_scrape(monkeypatch):
+    monkeypatch.setattr(main, "METRICS_AUTH_TOKEN", "scrape-secret")
+    client = TestClient(main.app)
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    ok = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert ok.status_code == 200
+    assert "resume_council_runs_in_flight" in ok.text
@@ -0,0 +1,44 @@
+import asyncio
+
+from backend import openrouter
+
+
+def test_detached_stragglers_do_not_fire_hooks(monkeypatch):
+    release_slow = asyncio.Event()
+
+    async def fake_query_model(model, messages, **kwargs):
+        if model == "slow":
+            await release_slow.wait()
+            if kwargs.get("on_token") is not None:
+                await kwargs["on_token"]("late")
+        return {"content": f"{model} answer"}
+
+    monkeypatch.setattr(openrouter, "query_model", fake_query_model)
+    events = []
+
+    async def on_start(model):
+        events.append(("start", model))
+
+    async def on_token(model, delta):
+        events.append(("token", model))
+
+    async def on_complete(model, response):
+        events.append(("complete", model))
+
+    async def scenario():
+        responses, cut_off = await openrouter.query_models_quorum(
+            ["fast", "slow"], [], quorum=1, grace_seconds=0.0, detach_stragglers=True,
+            on_start=on_start, on_token=on_token, on_complete=on_complete,
+        )
+        assert cut_off == ["slow"]
+        assert responses["slow"] is None
+        seen = list(events)
+        release_slow.set()
+        # Let the detached task finish; it may warm the cache but must stay silent.
+        await asyncio.gather(*list(openrouter._background_tasks))
+        return seen
+
+    seen = asyncio.run(scenario())
+    assert events == seen
+    assert ("complete", "fast") in events
+    assert not any(kind in {"token", "complete"} and model == "slow" for kind, model in events)
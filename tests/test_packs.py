@@ -0,0 +1,52 @@
+from backend.packs import build_relevant_profile_pack
+
+
+def test_pinned_sections_survive_a_tight_budget():
+    profile = "\n".join(
+        [
+            "Jane Doe",
+            "",
+            "Summary",
+            "Engineer " * 60,
+            "",
+            "Professional Experience",
+            "- Built Python pipelines",
+            "",
+            "Education",
+            "BSc Computer Science, " * 30,
+            "",
+            "MSc Data Engineering, " * 30,
+            "",
+            "Skills",
+            "Python, SQL, Airflow, " * 30,
+        ]
+    )
+    pack, stats = build_relevant_profile_pack(profile, ["python"], token_budget=50)
+    assert "Engineer" in pack
+    assert "BSc Computer Science" in pack
+    # Second Education chunk: no keyword match, kept only because the section is pinned.
+    assert "MSc Data Engineering" in pack
+    assert "Airflow" in pack
+    assert stats["over_budget"] is True
+
+
+def test_unrecognized_headings_are_ranked_not_pinned():
+    # "WORK HISTORY" is not a known heading, so every chunk falls into the untitled preamble.
+    blocks = ["Jane Doe | London | jane@example.com", "WORK HISTORY"]
+    blocks += [f"- Role {i}: maintained legacy billing reports for finance team {i}" for i in range(2000)]
+    blocks.append("- Built Python and Airflow pipelines for regulatory reporting")
+    profile = "\n\n".join(blocks)
+    assert len(profile) > 100_000
+
+    pack, stats = build_relevant_profile_pack(profile, ["python", "airflow"], token_budget=500, max_chars=60_000)
+    assert pack.startswith("Jane Doe")
+    assert "Built Python and Airflow pipelines" in pack
+    assert len(pack) < 5_000
+    assert stats["over_budget"] is False
+
+
+def test_max_chars_caps_oversized_pinned_content():
+    profile = "Jane Doe\n\nSkills\n" + "\n\n".join("Python, SQL, Airflow, " * 20 for _ in range(200))
+    pack, stats = build_relevant_profile_pack(profile, ["python"], token_budget=100, max_chars=2_000)
+    assert len(pack) <= 2_000
+    assert stats["truncated"] is True
@@ -0,0 +1,13 @@
+from backend import profile_storage
+from backend.resume import _pack_entry_matches, profile_pack_budget
+
+
+def test_stored_pack_matches_profile_with_trailing_newline(tmp_path, monkeypatch):
+    monkeypatch.setattr(profile_storage, "PROFILES_DATA_DIR", str(tmp_path))
+    raw_text = "Jane Doe\n\nSummary\nData engineer.\n\nSkills\nPython, SQL\n"
+    profile_storage.create_profile("p1", "Jane", raw_text)
+
+    entry = profile_storage.get_profile_pack("p1", profile_pack_budget())
+    # main._resolve_master_profile hands the run the stripped text.
+    master_profile = profile_storage.get_profile("p1")["raw_text"].strip()
+    assert _pack_entry_matches(entry, master_profile, profile_pack_budget())
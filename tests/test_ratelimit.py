@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from backend.ratelimit import FairSemaphore
+
+
+def test_cancel_during_release_handoff_keeps_cancellation_and_slot_count():
+    async def scenario():
+        sem = FairSemaphore(1)
+        await sem.acquire()
+        waiter = asyncio.ensure_future(sem.acquire())
+        await asyncio.sleep(0)  # waiter is now queued
+        waiter.cancel()
+        # release() runs before the waiter resumes: it pops the cancelled future and frees the slot.
+        sem.release()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert sem.waiting() == 0
+        # Exactly one slot is free again.
+        await asyncio.wait_for(sem.acquire(), timeout=1)
+        second = asyncio.ensure_future(sem.acquire())
+        await asyncio.sleep(0)
+        assert not second.done()
+        second.cancel()
+
+    asyncio.run(scenario())
+
+
+def test_fifo_handoff():
+    async def scenario():
+        sem = FairSemaphore(1)
+        await sem.acquire()
+        order = []
+
+        async def worker(i):
+            await sem.acquire()
+            order.append(i)
+            sem.release()
+
+        tasks = [asyncio.ensure_future(worker(i)) for i in range(3)]
+        await asyncio.sleep(0)
+        sem.release()
+        await asyncio.gather(*tasks)
+        assert order == [0, 1, 2]
+
+    asyncio.run(scenario())
@@ -0,0 +1,55 @@
+import httpx
+
+from backend.retry import RetryPolicy, retry_delay
+
+
+def _status_error(retry_after: str) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://example.invalid")
+    response = httpx.Response(429, headers={"Retry-After": retry_after}, request=request)
+    return httpx.HTTPStatusError("rate limited", request=request, response=response)
+
+
+def test_retry_after_within_cap_is_honoured():
+    policy = RetryPolicy(base_delay=0.0, max_retry_after=30.0)
+    assert retry_delay(policy, 1, _status_error("5")) == 5.0
+
+
+def test_retry_after_over_cap_gives_up():
+    policy = RetryPolicy(base_delay=0.0, max_retry_after=30.0)
+    assert retry_delay(policy, 1, _status_error("3600")) is None
+
+
+def test_delay_past_remaining_deadline_gives_up():
+    policy = RetryPolicy(base_delay=0.0, max_retry_after=30.0)
+    assert retry_delay(policy, 1, _status_error("10"), remaining=4.0) is None
+    assert retry_delay(policy, 1, _status_error("2"), remaining=4.0) == 2.0
+
+
+def test_default_policy_retries_within_the_call_timeout(monkeypatch):
+    import asyncio
+
+    from backend import openrouter
+    from backend.retry import DEFAULT_RETRY
+
+    assert DEFAULT_RETRY.max_attempts > 1
+    attempt_timeouts = []
+
+    async def timing_out_send(headers, payload, timeout, stream, on_token):
+        attempt_timeouts.append(timeout)
+        await asyncio.sleep(timeout)
+        raise asyncio.TimeoutError()
+
+    monkeypatch.setattr(openrouter, "_send_request", timing_out_send)
+    monkeypatch.setattr(openrouter.breakers, "record_failure", lambda *args: None)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        result = await openrouter.query_model("m", [], timeout=0.2, use_cache=False, coalesce=False)
+        return result, loop.time() - started
+
+    result, elapsed = asyncio.run(scenario())
+    assert result is None
+    # A timed-out attempt has used the whole budget: no 3 x timeout wait.
+    assert len(attempt_timeouts) == 1
+    assert elapsed < 0.4
@@ -0,0 +1,29 @@
+import os
+from datetime import datetime, timedelta
+
+from backend.tracing import TraceStore
+
+
+def _day(offset: int) -> str:
+    return (datetime.utcnow() - timedelta(days=offset)).strftime("%Y%m%d")
+
+
+def test_append_prunes_expired_and_oversized_files(tmp_path):
+    store = TraceStore(str(tmp_path), memory_items=5, retention_days=3, max_bytes=250)
+    for offset, size in ((10, 50), (2, 200), (1, 100)):
+        (tmp_path / f"traces-{_day(offset)}.jsonl").write_text("x" * size)
+
+    store._append('{"trace_id": "t"}\n')
+    store.flush()
+
+    # Day 10 is past retention; day 2 is the oldest file once the 250-byte budget is exceeded.
+    assert sorted(os.listdir(tmp_path)) == [f"traces-{_day(1)}.jsonl", f"traces-{_day(0)}.jsonl"]
+
+
+def test_get_only_scans_retained_files(tmp_path):
+    store = TraceStore(str(tmp_path), memory_items=5, retention_days=2, max_bytes=10**9)
+    line = '{"trace_id": "abc", "span_id": "1"}\n'
+    (tmp_path / f"traces-{_day(5)}.jsonl").write_text(line)
+    assert store.get("abc") is None
+    (tmp_path / f"traces-{_day(1)}.jsonl").write_text(line)
+    assert store.get("abc") == [{"trace_id": "abc", "span_id": "1"}]